@@ -0,0 +1,130 @@
+import logging
+import uuid
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from .events import message_payload, room_group_name
+from .models import ChatMessage, ChatReadState, ChatRoom, ClientIdConflict
+
+logger = logging.getLogger(__name__)
+
+
+class ChatConsumer(AsyncJsonWebsocketConsumer):
+    """
+    채팅방 WebSocket (ws/chats/rooms/<room_id>/)
+
+    클라이언트 -> 서버
+        {"type": "message", "content": "...", "client_id": "..."}   메시지 전송
+                                                  (client_id가 같으면 다시 보내도 한 번만 저장, REST API와 공통)
+        {"type": "typing", "is_typing": true}    입력 중 상태
+        {"type": "read"}                          상대방 메시지 읽음 처리
+    서버 -> 클라이언트
+        {"type": "message", "message": {...}}    새 메시지 (REST API로 보낸 메시지 포함)
+                                                  이미 저장된 client_id로 다시 보내면 보낸 연결에만 저장된 메시지를 전송
+        {"type": "typing", "user_id": "...", "is_typing": true}
+        {"type": "read", "user_id": "...", "last_read_at": "..."}   user_id가 last_read_at까지 읽음
+        {"type": "error", "error": "..."}
+
+    연결이 있는 채팅방만 그룹에 등록되므로 대화가 없는 채팅방은 서버 자원을 쓰지 않음
+    """
+
+    async def connect(self):
+        user = self.scope.get('user')
+        self.room_id = self.scope['url_route']['kwargs']['room_id']
+
+        if user is None or not user.is_authenticated or not await self._is_participant(user):
+            await self.close(code=4403)
+            return
+
+        self.user = user
+        self.group_name = room_group_name(self.room_id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        if hasattr(self, 'group_name'):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        event_type = content.get('type')
+
+        if event_type == 'message':
+            text = str(content.get('content', '')).strip()
+            if not text:
+                await self.send_json({'type': 'error', 'error': 'content가 필요합니다.'})
+                return
+            try:
+                client_id = uuid.UUID(str(content['client_id'])) if content.get('client_id') else None
+            except ValueError:
+                await self.send_json({'type': 'error', 'error': 'client_id가 올바르지 않습니다.'})
+                return
+            try:
+                payload, created = await self._create_message(text, client_id)
+            except ClientIdConflict:
+                await self.send_json({
+                    'type': 'error',
+                    'error': 'client_id가 다른 채팅방의 메시지에 이미 사용되었습니다.',
+                    'client_id': str(client_id)
+                })
+                return
+            except Exception as e:
+                logger.error(f"WebSocket 메시지 저장 중 오류 발생: {e}")
+                await self.send_json({'type': 'error', 'error': '서버 오류가 발생했습니다.'})
+                return
+            if created:
+                await self.channel_layer.group_send(self.group_name, {'type': 'chat.message', 'message': payload})
+            else:
+                # 재전송된 메시지: 다른 참여자는 이미 받았으므로 보낸 연결에만 저장된 메시지를 알려줌
+                await self.send_json({'type': 'message', 'message': dict(payload, is_mine=True)})
+
+        elif event_type == 'typing':
+            await self.channel_layer.group_send(self.group_name, {
+                'type': 'chat.typing',
+                'user_id': str(self.user.id),
+                'is_typing': bool(content.get('is_typing', True))
+            })
+
+        elif event_type == 'read':
+            last_read_at = await self._mark_read()
+            if last_read_at:
+                await self.channel_layer.group_send(self.group_name, {
+                    'type': 'chat.read',
+                    'user_id': str(self.user.id),
+                    'last_read_at': last_read_at.isoformat()
+                })
+
+        else:
+            await self.send_json({'type': 'error', 'error': '알 수 없는 요청입니다.'})
+
+    # 그룹 이벤트 처리
+
+    async def chat_message(self, event):
+        message = dict(event['message'], is_mine=event['message']['sender_id'] == str(self.user.id))
+        await self.send_json({'type': 'message', 'message': message})
+
+    async def chat_typing(self, event):
+        if event['user_id'] != str(self.user.id):
+            await self.send_json({'type': 'typing', 'user_id': event['user_id'], 'is_typing': event['is_typing']})
+
+    async def chat_read(self, event):
+        if event['user_id'] != str(self.user.id):
+            await self.send_json({'type': 'read', 'user_id': event['user_id'], 'last_read_at': event['last_read_at']})
+
+    # 데이터베이스 작업
+
+    @database_sync_to_async
+    def _is_participant(self, user):
+        return ChatRoom.objects.filter(id=self.room_id, participants=user).exists()
+
+    @database_sync_to_async
+    def _create_message(self, text, client_id):
+        """ REST API와 같은 경로로 저장 (반환: (메시지 정보, 새로 저장했는지 여부)) """
+        message, created = ChatMessage.send(self.room_id, self.user, text, client_id)
+        return message_payload(message), created
+
+    @database_sync_to_async
+    def _mark_read(self):
+        """ 채팅방의 마지막 메시지까지 읽음 위치 이동 (바뀌었으면 읽음 시간 반환) """
+        last_message = ChatMessage.objects.filter(room_id=self.room_id).order_by('-created_at', '-id').first()
+        if last_message and ChatReadState.mark_read(self.room_id, self.user.id, last_message):
+            return last_message.created_at
+        return None
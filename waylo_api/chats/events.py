@@ -0,0 +1,47 @@
+import logging
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+logger = logging.getLogger(__name__)
+
+
+def room_group_name(room_id):
+    """ 채팅방 참여자들의 WebSocket 연결이 속한 그룹 이름 """
+    return f"chat_room_{room_id}"
+
+
+def message_payload(message):
+    """ 그룹으로 전송할 새 메시지 정보 (is_mine은 받는 연결에서 계산) """
+    return {
+        'id': str(message.id),
+        'sender_id': str(message.sender_id),
+        'client_id': str(message.client_id) if message.client_id else None,
+        'content': message.content,
+        'created_at': message.created_at.isoformat(),
+        'is_read': False
+    }
+
+
+def _group_send(room_id, event):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(room_group_name(room_id), event)
+    except Exception as e:
+        # 실시간 전송에 실패해도 메시지는 저장되어 있으므로 REST 조회로 받을 수 있음
+        logger.error(f"채팅 이벤트 전송 실패 ({room_id}): {e}")
+
+
+def broadcast_message(message):
+    """
+    REST API로 저장한 새 메시지를 채팅방에 연결된 참여자에게 전송
+    """
+    _group_send(message.room_id, {'type': 'chat.message', 'message': message_payload(message)})
+
+
+def broadcast_read(room_id, reader_id, last_read_at):
+    """
+    reader가 채팅방의 메시지를 last_read_at까지 읽었음을 다른 참여자에게 전송
+    """
+    _group_send(room_id, {'type': 'chat.read', 'user_id': str(reader_id), 'last_read_at': last_read_at.isoformat()})
@@ -0,0 +1,41 @@
+from urllib.parse import parse_qs
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+from rest_framework import exceptions
+from users.authentication import CustomTokenAuthentication
+
+
+@database_sync_to_async
+def authenticate_token(raw_key):
+    try:
+        user, _ = CustomTokenAuthentication().authenticate_credentials(raw_key)
+        return user
+    except exceptions.AuthenticationFailed:
+        return AnonymousUser()
+
+
+def _token_from_scope(scope):
+    """
+    Authorization: Token <key> 헤더 또는 ?token=<key> 쿼리 문자열에서 토큰 추출
+    (헤더를 설정할 수 없는 클라이언트를 위해 쿼리 문자열도 허용)
+    """
+    for name, value in scope.get('headers', []):
+        if name == b'authorization':
+            parts = value.decode('latin1').split()
+            if len(parts) == 2 and parts[0].lower() == CustomTokenAuthentication.keyword.lower():
+                return parts[1]
+
+    tokens = parse_qs(scope.get('query_string', b'').decode()).get('token')
+    return tokens[0] if tokens else None
+
+
+class TokenAuthMiddleware(BaseMiddleware):
+    """
+    WebSocket 연결의 토큰을 REST API와 같은 방식(CustomTokenAuthentication)으로 인증하여 scope['user']에 저장
+    """
+
+    async def __call__(self, scope, receive, send):
+        raw_key = _token_from_scope(scope)
+        scope['user'] = await authenticate_token(raw_key) if raw_key else AnonymousUser()
+        return await super().__call__(scope, receive, send)
@@ -0,0 +1,63 @@
+# Generated by Django 5.2 on 2026-10-17 19:41
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def create_read_states(apps, schema_editor):
+    """
+    참여자마다 상대방이 보낸 메시지 중 읽음 처리된 가장 최근 메시지를 읽음 위치로 저장
+    """
+    ChatRoom = apps.get_model('chats', 'ChatRoom')
+    ChatMessage = apps.get_model('chats', 'ChatMessage')
+    ChatReadState = apps.get_model('chats', 'ChatReadState')
+
+    last_read = ChatMessage.objects.filter(
+        room_id=OuterRef('chatroom_id'),
+        is_read=True
+    ).exclude(
+        sender_id=OuterRef('user_id')
+    ).order_by('-created_at', '-id')
+
+    participants = ChatRoom.participants.through.objects.annotate(
+        last_read_message_id=Subquery(last_read.values('id')[:1]),
+        last_read_at=Subquery(last_read.values('created_at')[:1])
+    ).filter(last_read_at__isnull=False).values_list('chatroom_id', 'user_id', 'last_read_message_id', 'last_read_at')
+
+    batch = []
+    for room_id, user_id, message_id, read_at in participants.iterator():
+        batch.append(ChatReadState(room_id=room_id, user_id=user_id, last_read_message_id=message_id, last_read_at=read_at))
+        if len(batch) >= 1000:
+            ChatReadState.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        ChatReadState.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def restore_is_read(apps, schema_editor):
+    """
+    읽음 위치 이전의 상대방 메시지를 읽음으로 표시
+    """
+    ChatMessage = apps.get_model('chats', 'ChatMessage')
+    ChatReadState = apps.get_model('chats', 'ChatReadState')
+
+    for state in ChatReadState.objects.all().iterator():
+        ChatMessage.objects.filter(
+            room_id=state.room_id,
+            created_at__lte=state.last_read_at
+        ).exclude(sender_id=state.user_id).update(is_read=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0003_chatreadstate'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_read_states, restore_is_read),
+        migrations.RemoveField(
+            model_name='chatmessage',
+            name='is_read',
+        ),
+    ]
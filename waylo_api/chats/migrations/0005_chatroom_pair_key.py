@@ -0,0 +1,64 @@
+# Generated by Django 5.2 on 2026-10-17 20:10
+
+from collections import defaultdict
+from django.db import migrations, models
+
+
+def pair_key_for(user_id, other_id):
+    return ':'.join(sorted([user_id.hex, other_id.hex]))
+
+
+def backfill_pair_keys(apps, schema_editor):
+    """
+    참여자가 두 명인 채팅방에 pair_key를 채우고, 같은 참여자 쌍의 중복 채팅방은
+    가장 먼저 만든 채팅방으로 메시지와 읽음 위치를 옮긴 뒤 삭제
+    """
+    ChatRoom = apps.get_model('chats', 'ChatRoom')
+    ChatMessage = apps.get_model('chats', 'ChatMessage')
+    ChatReadState = apps.get_model('chats', 'ChatReadState')
+
+    participants = defaultdict(list)
+    for room_id, user_id in ChatRoom.participants.through.objects.values_list('chatroom_id', 'user_id').iterator():
+        participants[room_id].append(user_id)
+
+    rooms_by_key = defaultdict(list)
+    for room in ChatRoom.objects.order_by('created_at', 'id').only('id', 'created_at', 'updated_at').iterator():
+        user_ids = participants.get(room.id, [])
+        if len(user_ids) == 2:
+            rooms_by_key[pair_key_for(*user_ids)].append(room)
+
+    for key, rooms in rooms_by_key.items():
+        keep, duplicates = rooms[0], rooms[1:]
+        for duplicate in duplicates:
+            ChatMessage.objects.filter(room_id=duplicate.id).update(room_id=keep.id)
+
+            for state in ChatReadState.objects.filter(room_id=duplicate.id):
+                existing = ChatReadState.objects.filter(room_id=keep.id, user_id=state.user_id).first()
+                if existing is None:
+                    state.room_id = keep.id
+                    state.save(update_fields=['room'])
+                elif existing.last_read_at < state.last_read_at:
+                    existing.last_read_at = state.last_read_at
+                    existing.last_read_message_id = state.last_read_message_id
+                    existing.save(update_fields=['last_read_at', 'last_read_message'])
+
+            keep.updated_at = max(keep.updated_at, duplicate.updated_at)
+            duplicate.delete()
+
+        ChatRoom.objects.filter(id=keep.id).update(pair_key=key, updated_at=keep.updated_at)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0004_migrate_is_read_to_read_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatroom',
+            name='pair_key',
+            field=models.CharField(blank=True, max_length=65, null=True),
+        ),
+        migrations.RunPython(backfill_pair_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-17 20:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    unique 인덱스는 데이터 이동(0005)과 다른 트랜잭션에서 생성
+    (PostgreSQL은 대기 중인 외래 키 트리거가 있는 테이블을 변경할 수 없음)
+    """
+
+    dependencies = [
+        ('chats', '0005_chatroom_pair_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='chatroom',
+            name='pair_key',
+            field=models.CharField(blank=True, max_length=65, null=True, unique=True),
+        ),
+    ]
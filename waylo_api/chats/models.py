@@ -1,29 +1,115 @@
-from django.db import models
+from django.db import connection, models, transaction
+from django.utils import timezone
 import uuid
 from users.models import User
 
 class ChatRoom(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)  # 채팅방 고유 ID
     participants = models.ManyToManyField(User, related_name='chat_rooms')  # 참여자들
+    pair_key = models.CharField(max_length=65, unique=True, null=True, blank=True)  # 1:1 채팅방의 참여자 쌍 (pair_key_for)
     created_at = models.DateTimeField(auto_now_add=True)  # 생성 시간
     updated_at = models.DateTimeField(auto_now=True)  # 마지막 업데이트 시간
 
     class Meta:
         db_table = 'chat_rooms'  # 테이블 이름 지정
 
+    @staticmethod
+    def pair_key_for(user_id, other_id):
+        """ 두 사용자의 1:1 채팅방 키 (순서와 무관하게 같은 값) """
+        return ':'.join(sorted([uuid.UUID(str(user_id)).hex, uuid.UUID(str(other_id)).hex]))
+
     def get_other_participant(self, user):
         """현재 사용자 기준으로 채팅방의 다른 참여자 가져오기"""
         return self.participants.exclude(id=user.id).first()
 
 
+class ClientIdConflict(Exception):
+    """ 같은 발신자의 client_id가 이미 다른 채팅방의 메시지에 사용됨 """
+
+
 class ChatMessage(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)  # 메시지 고유 ID
     room = models.ForeignKey(ChatRoom, on_delete=models.CASCADE, related_name='messages')  # 채팅방 연결
     sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sent_messages')  # 발신자
     content = models.TextField()  # 메시지 내용
-    created_at = models.DateTimeField(auto_now_add=True)  # 메시지 전송 시간
-    is_read = models.BooleanField(default=False)  # 읽음 여부
+    # 메시지 전송 시간 (일괄 전송 시 보낸 순서를 유지하도록 직접 지정할 수 있음)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    client_id = models.UUIDField(null=True, blank=True)  # 클라이언트가 생성한 메시지 ID (재전송 중복 방지)
 
     class Meta:
         db_table = 'chat_messages'  # 테이블 이름 지정
-        ordering = ['created_at']  # 오래된 메시지부터 정렬
\ No newline at end of file
+        ordering = ['created_at']  # 오래된 메시지부터 정렬
+        constraints = [
+            # 같은 발신자가 같은 client_id로 다시 보내면 새 메시지를 만들지 않음
+            models.UniqueConstraint(fields=['sender', 'client_id'], name='unique_chat_message_client_id')
+        ]
+        indexes = [
+            # 채팅방별 메시지 증분 동기화/이전 기록 페이지 조회용 (room, created_at, id) 범위 조회
+            models.Index(fields=['room', 'created_at', 'id'], name='chat_messages_room_created_idx'),
+        ]
+
+    @classmethod
+    def send(cls, room_id, sender, content, client_id=None):
+        """
+        채팅방에 메시지를 저장하고 채팅방 업데이트 시간을 갱신 (REST/WebSocket 전송 공통)
+        client_id가 있으면 같은 발신자가 같은 client_id로 다시 보내도 한 번만 저장하고 저장된 메시지를 반환
+        client_id가 다른 채팅방의 메시지에 이미 사용되었으면 ClientIdConflict
+
+        반환: (메시지, 새로 저장했는지 여부)
+        """
+        room_id = uuid.UUID(str(room_id))
+        with transaction.atomic():
+            if client_id:
+                message, created = cls.objects.get_or_create(
+                    sender=sender,
+                    client_id=client_id,
+                    defaults={'room_id': room_id, 'content': content}
+                )
+                if message.room_id != room_id:
+                    raise ClientIdConflict(client_id)
+            else:
+                message, created = cls.objects.create(room_id=room_id, sender=sender, content=content), True
+
+            if created:
+                ChatRoom.objects.filter(id=room_id).update(updated_at=message.created_at)
+        return message, created
+
+
+class ChatReadState(models.Model):
+    """
+    채팅방 참여자별 읽음 위치
+    메시지마다 읽음 여부를 저장하지 않고, 이 시간(last_read_at)까지의 메시지를 읽은 것으로 계산
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    room = models.ForeignKey(ChatRoom, on_delete=models.CASCADE, related_name='read_states')  # 채팅방
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='chat_read_states')  # 참여자
+    last_read_at = models.DateTimeField()  # 마지막으로 읽은 메시지의 전송 시간
+    last_read_message = models.ForeignKey(
+        ChatMessage, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )  # 마지막으로 읽은 메시지
+    updated_at = models.DateTimeField(auto_now=True)  # 마지막 갱신 시간
+
+    class Meta:
+        db_table = 'chat_read_states'  # 테이블 이름 지정
+        constraints = [
+            models.UniqueConstraint(fields=['room', 'user'], name='unique_chat_read_state')
+        ]
+
+    @classmethod
+    def mark_read(cls, room_id, user_id, message):
+        """
+        message까지 읽은 것으로 읽음 위치를 앞으로 이동 (한 행 upsert, 뒤로는 이동하지 않음)
+        반환: 읽음 위치가 바뀌었는지 여부
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO chat_read_states (id, room_id, user_id, last_read_at, last_read_message_id, updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (room_id, user_id)
+                DO UPDATE SET
+                    last_read_at = EXCLUDED.last_read_at,
+                    last_read_message_id = EXCLUDED.last_read_message_id,
+                    updated_at = EXCLUDED.updated_at
+                WHERE chat_read_states.last_read_at < EXCLUDED.last_read_at
+            """, [uuid.uuid4(), room_id, user_id, message.created_at, message.id, timezone.now()])
+            return cursor.rowcount > 0
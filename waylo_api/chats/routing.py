@@ -0,0 +1,6 @@
+from django.urls import path
+from . import consumers
+
+websocket_urlpatterns = [
+    path('ws/chats/rooms/<uuid:room_id>/', consumers.ChatConsumer.as_asgi()),  # 채팅방 실시간 메시지
+]
@@ -1,3 +1,96 @@
+from datetime import timedelta
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from users.models import User
+from .models import ChatMessage, ChatReadState, ChatRoom
 
-# Create your tests here.
+# "많은 채팅방" 경우의 채팅방 수
+MANY_ROOMS = 15
+# 채팅방마다 상대방이 보내는 메시지 수 (첫 메시지만 읽음)
+MESSAGES_PER_ROOM = 3
+
+
+class ChatRoomListQueryCountTests(TestCase):
+    """
+    채팅방 목록 API의 쿼리 수가 채팅방 수와 관계없이 일정한지 확인 (채팅방마다 상대방/마지막 메시지/읽지 않은 수를 따로 조회하지 않음)
+    채팅방 1개일 때와 MANY_ROOMS개일 때 같은 쿼리 수로 호출
+    """
+
+    def setUp(self):
+        self.viewer = User.objects.create_user(email='viewer@example.com', username='viewer', password='password')
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def add_rooms(self, count):
+        """ 상대방이 메시지를 보내고 조회하는 사용자가 첫 메시지까지만 읽은 1:1 채팅방 추가 """
+        start = ChatRoom.objects.count()
+        base_time = timezone.now()
+        for index in range(start, start + count):
+            friend = User.objects.create_user(email=f'friend{index}@example.com', username=f'friend{index}', password='password')
+            room = ChatRoom.objects.create(pair_key=ChatRoom.pair_key_for(self.viewer.id, friend.id))
+            room.participants.add(self.viewer, friend)
+
+            messages = [
+                ChatMessage.objects.create(
+                    room=room,
+                    sender=friend,
+                    content=f'message {number}',
+                    created_at=base_time + timedelta(seconds=number),
+                )
+                for number in range(MESSAGES_PER_ROOM)
+            ]
+            ChatReadState.mark_read(room.id, self.viewer.id, messages[0])
+
+    def test_room_list(self):
+        for total in (1, MANY_ROOMS):
+            self.add_rooms(total - ChatRoom.objects.count())
+
+            # 채팅방 목록 조회 (상대방/마지막 메시지/읽지 않은 수를 포함한 한 번의 쿼리)
+            with self.assertNumQueries(1):
+                response = self.client.get('/api/chats/rooms/')
+
+            self.assertEqual(response.status_code, 200)
+            rooms = response.data['rooms']
+            self.assertEqual(len(rooms), total)
+            self.assertTrue(all(room['last_message'] == f'message {MESSAGES_PER_ROOM - 1}' for room in rooms))
+            self.assertTrue(all(room['unread_count'] == MESSAGES_PER_ROOM - 1 for room in rooms))
+            self.assertTrue(all(room['friend_name'].startswith('friend') for room in rooms))
+
+
+class ChatMessageSyncTests(TestCase):
+    """
+    증분 동기화(after)는 기준 이후의 메시지만 반환하고,
+    overlap=1(재연결 직후 동기화)일 때만 기준 직전 MESSAGES_SYNC_OVERLAP 구간의 메시지를 다시 포함하는지 확인
+    """
+
+    def setUp(self):
+        self.viewer = User.objects.create_user(email='viewer@example.com', username='viewer', password='password')
+        friend = User.objects.create_user(email='friend@example.com', username='friend', password='password')
+        self.room = ChatRoom.objects.create(pair_key=ChatRoom.pair_key_for(self.viewer.id, friend.id))
+        self.room.participants.add(self.viewer, friend)
+
+        base_time = timezone.now()
+        self.messages = [
+            ChatMessage.objects.create(
+                room=self.room,
+                sender=friend,
+                content=f'message {number}',
+                created_at=base_time + timedelta(seconds=number),
+            )
+            for number in range(MESSAGES_PER_ROOM)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def sync(self, **params):
+        response = self.client.get(f'/api/chats/rooms/{self.room.id}/messages/', {'after': self.messages[1].id, **params})
+        self.assertEqual(response.status_code, 200)
+        return [message['content'] for message in response.data['messages']]
+
+    def test_after_returns_only_new_messages(self):
+        self.assertEqual(self.sync(), [f'message {MESSAGES_PER_ROOM - 1}'])
+
+    def test_after_with_overlap(self):
+        # 기준 메시지(message 1)는 클라이언트에 이미 있으므로 다시 포함하지 않음
+        self.assertEqual(self.sync(overlap=1), ['message 0', f'message {MESSAGES_PER_ROOM - 1}'])
@@ -1,16 +1,42 @@
 import logging
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
 from django.contrib.auth import get_user_model
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Q, Max, F, Count
+from django.db.models import Q, Max, F, Count, BooleanField, DateTimeField, Exists, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from users.authentication import CustomTokenAuthentication
-from .models import ChatRoom, ChatMessage
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .events import broadcast_message, broadcast_read
+from .models import ChatRoom, ChatMessage, ChatReadState, ClientIdConflict
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# 메시지 조회 기본/최대 개수
+MESSAGES_DEFAULT_LIMIT = 50
+MESSAGES_MAX_LIMIT = 200
+
+# 재연결 직후 증분 동기화(after + overlap=1) 시 기준 직전에 다시 조회하는 구간
+# created_at은 메시지를 만들 때 정해지고 커밋은 그 뒤이므로, 기준보다 이른 시간의 메시지가 늦게 커밋될 수 있음
+# (메시지 생성부터 커밋까지 걸리는 최대 시간보다 길게 설정, 다시 받은 메시지는 클라이언트가 ID로 중복 제거)
+# 일반 폴링은 이 구간을 다시 조회하지 않고 기준 이후의 메시지만 반환
+MESSAGES_SYNC_OVERLAP = timedelta(seconds=10)
+
+# 일괄 전송 최대 메시지 수
+BATCH_MAX_MESSAGES = 100
+
+# client_id를 다른 채팅방의 메시지에 다시 사용한 경우의 오류 메시지
+CLIENT_ID_CONFLICT_ERROR = "client_id가 다른 채팅방의 메시지에 이미 사용되었습니다."
+
+# 읽음 위치가 없는 참여자의 기준 시간 (모든 메시지를 읽지 않은 것으로 계산)
+NEVER_READ = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
 @api_view(['GET'])
 @authentication_classes([CustomTokenAuthentication])
 @permission_classes([IsAuthenticated])
@@ -19,35 +45,46 @@ def get_chat_rooms(request):
     사용자의 채팅방 목록을 조회하는 API
     """
     try:
-        # 사용자가 참여하고 있는 모든 채팅방을 조회
-        chat_rooms = ChatRoom.objects.filter(participants=request.user)
-        
-        # 각 채팅방의 정보를 가공
-        rooms_data = []
-        for room in chat_rooms:
-            # 상대방 정보 가져오기
-            other_participant = room.get_other_participant(request.user)
-            if not other_participant:
-                continue
-                
-            # 마지막 메시지 가져오기
-            last_message = room.messages.last()
-            
-            # 읽지 않은 메시지 수 계산
-            unread_count = room.messages.filter(
-                sender=other_participant,
-                is_read=False
-            ).count()
-            
-            rooms_data.append({
-                'id': str(room.id),
-                'friend_id': str(other_participant.id),
-                'friend_name': other_participant.username,
-                'friend_profile_image': other_participant.profile_image,
-                'last_message': last_message.content if last_message else None,
-                'last_message_time': last_message.created_at if last_message else None,
-                'unread_count': unread_count
-            })
+        # 사용자가 참여한 채팅방의 상대방 참여 행을 기준으로
+        # 상대방 정보, 마지막 메시지, 읽지 않은 메시지 수를 한 번의 쿼리로 조회 (최근 대화순)
+        latest_messages = ChatMessage.objects.filter(room_id=OuterRef('chatroom_id')).order_by('-created_at', '-id')
+        my_read_at = ChatReadState.objects.filter(
+            room_id=OuterRef('chatroom_id'),
+            user_id=request.user.id
+        ).values('last_read_at')[:1]
+        # 내 읽음 위치 이후의 상대방 메시지 수 ((room, created_at, id) 인덱스 범위 조회)
+        unread_counts = ChatMessage.objects.filter(
+            room_id=OuterRef('chatroom_id'),
+            sender_id=OuterRef('user_id'),
+            created_at__gt=OuterRef('my_last_read_at')
+        ).order_by().values('room_id').annotate(count=Count('id')).values('count')
+
+        rows = ChatRoom.participants.through.objects.filter(
+            chatroom__participants=request.user
+        ).exclude(
+            user_id=request.user.id
+        ).annotate(
+            my_last_read_at=Coalesce(Subquery(my_read_at), Value(NEVER_READ), output_field=DateTimeField())
+        ).annotate(
+            last_message=Subquery(latest_messages.values('content')[:1]),
+            last_message_time=Subquery(latest_messages.values('created_at')[:1]),
+            unread_count=Coalesce(Subquery(unread_counts), 0)
+        ).order_by(
+            '-chatroom__updated_at'
+        ).values(
+            'chatroom_id', 'user_id', 'user__username', 'user__profile_image',
+            'last_message', 'last_message_time', 'unread_count'
+        )
+
+        rooms_data = [{
+            'id': str(row['chatroom_id']),
+            'friend_id': str(row['user_id']),
+            'friend_name': row['user__username'],
+            'friend_profile_image': row['user__profile_image'],
+            'last_message': row['last_message'],
+            'last_message_time': row['last_message_time'],
+            'unread_count': row['unread_count']
+        } for row in rows]
             
         return Response({
             'rooms': rooms_data
@@ -70,21 +107,14 @@ def create_chat_room(request):
             
         friend = User.objects.get(id=friend_id)
         
-        # 이미 존재하는 채팅방 확인
-        existing_room = ChatRoom.objects.filter(
-            participants=request.user
-        ).filter(
-            participants=friend
-        ).first()
-        
-        if existing_room:
-            return Response({
-                'room_id': str(existing_room.id)
-            })
-            
-        # 새로운 채팅방 생성
-        chat_room = ChatRoom.objects.create()
-        chat_room.participants.add(request.user, friend)
+        # 참여자 쌍 키(unique 인덱스)로 기존 채팅방을 찾거나 생성
+        # (동시에 요청해도 unique 제약으로 채팅방은 하나만 생성됨)
+        with transaction.atomic():
+            chat_room, created = ChatRoom.objects.get_or_create(
+                pair_key=ChatRoom.pair_key_for(request.user.id, friend.id)
+            )
+            if created:
+                chat_room.participants.add(request.user, friend)
         
         return Response({
             'room_id': str(chat_room.id)
@@ -95,58 +125,204 @@ def create_chat_room(request):
         logger.error(f"채팅방 생성 중 오류 발생: {e}")
         return Response({"error": "서버 오류가 발생했습니다."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def parse_message_anchor(value):
+    """
+    after/before 파라미터(메시지 ID 또는 ISO 8601 시간)를 변환
+
+    반환: 시간이면 (created_at, None), 메시지 ID면 (None, 메시지 ID)
+    메시지 ID의 created_at은 채팅방 조회 쿼리에서 함께 가져옴
+    """
+    try:
+        return None, uuid.UUID(value)
+    except ValueError:
+        # 쿼리 문자열에서 '+'가 공백으로 바뀐 시간대 표기 복원
+        created_at = parse_datetime(value.replace(' ', '+'))
+        if created_at is None:
+            raise ValueError(value)
+        if timezone.is_naive(created_at):
+            created_at = timezone.make_aware(created_at, dt_timezone.utc)
+        return created_at, None
+
+
+def message_page(room_id, direction=None, anchor=None, limit=MESSAGES_DEFAULT_LIMIT, overlap=False):
+    """
+    (room, created_at, id) 인덱스 범위 조회로 메시지 한 페이지를 오래된 순으로 반환
+    anchor는 (created_at, 메시지 ID 또는 None) 기준
+    - direction='after': 기준 이후의 새 메시지 (증분 동기화, 오래된 순으로 limit개)
+      overlap이면 늦게 커밋된 메시지를 놓치지 않도록 기준 직전 MESSAGES_SYNC_OVERLAP 구간의 메시지도 같은 쿼리로 다시 포함
+    - direction='before': 기준 이전의 메시지 (이전 기록, 기준 직전 limit개)
+    - 기준이 없으면 최근 limit개
+
+    반환: (메시지 목록, 요청 방향으로 더 있는지 여부)
+    """
+    messages = ChatMessage.objects.filter(room_id=room_id)
+
+    if direction == 'after':
+        created_at, message_id = anchor
+        if message_id:
+            newer = Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=message_id)
+            older = Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=message_id)
+        else:
+            newer = Q(created_at__gt=created_at)
+            older = Q(created_at__lte=created_at)
+
+        if not overlap:
+            page = list(messages.filter(newer).order_by('created_at', 'id')[:limit + 1])
+            return page[:limit], len(page) > limit
+
+        page_query = messages.filter(newer).annotate(
+            is_new=Value(True, output_field=BooleanField())
+        ).order_by('created_at', 'id')[:limit + 1]
+        overlap_query = messages.filter(
+            older, created_at__gt=created_at - MESSAGES_SYNC_OVERLAP
+        ).annotate(
+            is_new=Value(False, output_field=BooleanField())
+        ).order_by('created_at', 'id')[:limit]
+
+        rows = list(page_query.union(overlap_query, all=True))
+        new_messages = [msg for msg in rows if msg.is_new]
+        page = sorted(rows, key=lambda msg: (msg.created_at, msg.id))
+        if len(new_messages) > limit:
+            page.remove(max(new_messages, key=lambda msg: (msg.created_at, msg.id)))
+        return page, len(new_messages) > limit
+
+    if direction == 'before':
+        created_at, message_id = anchor
+        if message_id:
+            messages = messages.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=message_id))
+        else:
+            messages = messages.filter(created_at__lt=created_at)
+
+    page = list(messages.order_by('-created_at', '-id')[:limit + 1])
+    has_more = len(page) > limit
+    return page[:limit][::-1], has_more
+
+
 @api_view(['GET', 'POST'])
 @authentication_classes([CustomTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def chat_messages(request, room_id):
     """
     채팅방의 메시지 목록을 조회하거나 새 메시지를 전송하는 API
+
+    GET 파라미터 (응답은 항상 오래된 순, has_more는 요청 방향으로 더 있는지 여부)
+    - after=<메시지 ID 또는 시간>: 이후의 새 메시지만 (폴링용 증분 동기화)
+    - overlap=1: after와 함께 사용, 기준 직전 MESSAGES_SYNC_OVERLAP 구간의 메시지도 다시 포함 (재연결 직후 동기화용)
+    - before=<메시지 ID 또는 시간>: 이전 기록 페이지
+    - 둘 다 없으면 최근 메시지
+    - limit: 최대 개수 (기본 50, 최대 200)
+    기준 메시지가 채팅방에 없으면 (삭제 등) 400과 함께 resync=true를 반환하므로 최근 메시지부터 다시 동기화
     """
     try:
-        chat_room = ChatRoom.objects.get(id=room_id)
-        if request.user not in chat_room.participants.all():
+        direction, anchor = None, None
+        if request.method == 'GET':
+            direction = next((key for key in ('after', 'before') if request.query_params.get(key)), None)
+            if direction:
+                try:
+                    anchor = parse_message_anchor(request.query_params[direction])
+                except ValueError:
+                    return Response({"error": "after/before 값이 올바르지 않습니다."}, status=status.HTTP_400_BAD_REQUEST)
+        anchor_id = anchor[1] if anchor else None
+
+        # 채팅방 조회와 참여 여부 확인을 한 번의 쿼리로 처리
+        # (내 읽음 위치와 상대방 읽음 위치, 기준 메시지의 전송 시간도 함께 조회)
+        read_states = ChatReadState.objects.filter(room_id=OuterRef('pk'))
+        chat_rooms = ChatRoom.objects.annotate(
+            is_participant=Exists(
+                ChatRoom.participants.through.objects.filter(chatroom_id=OuterRef('pk'), user_id=request.user.id)
+            ),
+            my_last_read_at=Subquery(read_states.filter(user_id=request.user.id).values('last_read_at')[:1]),
+            peer_last_read_at=Subquery(
+                read_states.exclude(user_id=request.user.id).order_by('-last_read_at').values('last_read_at')[:1]
+            )
+        )
+        if anchor_id:
+            chat_rooms = chat_rooms.annotate(anchor_created_at=Subquery(
+                ChatMessage.objects.filter(id=anchor_id, room_id=OuterRef('pk')).values('created_at')[:1]
+            ))
+        chat_room = chat_rooms.get(id=room_id)
+        if not chat_room.is_participant:
             return Response({"error": "접근 권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
 
         if request.method == 'GET':
-            # 상대방이 보낸 메시지를 읽음 처리
-            other_participant = chat_room.get_other_participant(request.user)
-            ChatMessage.objects.filter(
-                room=chat_room,
-                sender=other_participant,
-                is_read=False
-            ).update(is_read=True)
-            
-            # 메시지 목록 조회
-            messages = chat_room.messages.select_related('sender').order_by('created_at')
+            try:
+                limit = int(request.query_params.get('limit', MESSAGES_DEFAULT_LIMIT))
+            except ValueError:
+                limit = MESSAGES_DEFAULT_LIMIT
+            limit = max(1, min(limit, MESSAGES_MAX_LIMIT))
+
+            if anchor_id:
+                if chat_room.anchor_created_at is None:
+                    # 삭제되었거나 다른 채팅방의 메시지: 이 기준으로는 새 메시지를 받을 수 없으므로 다시 동기화 요청
+                    return Response(
+                        {"error": "기준 메시지를 찾을 수 없습니다.", "resync": True},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                anchor = (chat_room.anchor_created_at, anchor_id)
+
+            overlap = direction == 'after' and request.query_params.get('overlap') in ('1', 'true')
+            messages, has_more = message_page(chat_room.id, direction, anchor, limit, overlap)
+
+            # 읽지 않은 상대방 메시지를 받았으면 읽음 위치를 마지막 메시지로 이동 (한 행 upsert)
+            # (새 메시지가 없는 폴링은 메시지 조회 한 번으로 끝남)
+            my_read_at = chat_room.my_last_read_at
+            has_unread = any(
+                msg.sender_id != request.user.id and (my_read_at is None or msg.created_at > my_read_at)
+                for msg in messages
+            )
+            if has_unread and direction != 'before':
+                last_message = messages[-1]
+                if ChatReadState.mark_read(chat_room.id, request.user.id, last_message):
+                    my_read_at = last_message.created_at
+                    # 상대방에게 읽음 표시 전송
+                    broadcast_read(chat_room.id, request.user.id, my_read_at)
+
+            peer_read_at = chat_room.peer_last_read_at
+
+            def is_read(msg):
+                # 내 메시지는 상대방 읽음 위치, 상대방 메시지는 내 읽음 위치 기준
+                read_at = peer_read_at if msg.sender_id == request.user.id else my_read_at
+                return read_at is not None and msg.created_at <= read_at
+
             messages_data = [{
                 'id': str(msg.id),
                 'content': msg.content,
                 'created_at': msg.created_at.isoformat(),
-                'is_mine': msg.sender == request.user,
-                'is_read': msg.is_read
+                'is_mine': msg.sender_id == request.user.id,
+                'is_read': is_read(msg)
             } for msg in messages]
             
             return Response({
-                'messages': messages_data
+                'messages': messages_data,
+                'has_more': has_more,
+                # 이 시간까지의 내 메시지를 상대방이 읽음 (이전에 받은 메시지의 읽음 표시 갱신용)
+                'peer_last_read_at': peer_read_at.isoformat() if peer_read_at else None
             })
         else:  # POST
             content = request.data.get('content', '').strip()
             if not content:
                 return Response({"error": "content가 필요합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+            client_id = request.data.get('client_id')
+            try:
+                client_id = uuid.UUID(str(client_id)) if client_id else None
+            except ValueError:
+                return Response({"error": "client_id가 올바르지 않습니다."}, status=status.HTTP_400_BAD_REQUEST)
                 
-            # 메시지 생성
-            message = ChatMessage.objects.create(
-                room=chat_room,
-                sender=request.user,
-                content=content
-            )
+            # 메시지 생성 및 채팅방 업데이트 시간 갱신 (client_id가 있으면 같은 메시지를 다시 보내도 한 번만 저장)
+            try:
+                message, created = ChatMessage.send(chat_room.id, request.user, content, client_id)
+            except ClientIdConflict:
+                return Response({"error": CLIENT_ID_CONFLICT_ERROR}, status=status.HTTP_409_CONFLICT)
             
-            # 채팅방 업데이트 시간 갱신
-            chat_room.save()
+            if created:
+                # 채팅방에 연결된 참여자에게 실시간 전송
+                transaction.on_commit(lambda: broadcast_message(message))
             
             return Response({
                 'message': {
                     'id': str(message.id),
+                    'client_id': str(message.client_id) if message.client_id else None,
                     'content': message.content,
                     'created_at': message.created_at.isoformat(),
                     'is_mine': True,
@@ -158,4 +334,113 @@ def chat_messages(request, room_id):
         return Response({"error": "채팅방을 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
         logger.error(f"채팅 관련 작업 중 오류 발생: {e}")
+        return Response({"error": "서버 오류가 발생했습니다."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@authentication_classes([CustomTokenAuthentication])
+@permission_classes([IsAuthenticated])
+def send_messages_batch(request):
+    """
+    오프라인 중 쌓인 메시지를 한 번에 전송하는 API (여러 채팅방 가능)
+
+    요청: {"messages": [{"room_id": "...", "client_id": "...", "content": "..."}, ...]} (보낸 순서대로)
+    응답: {"results": [{"client_id", "status": "created" | "duplicate" | "error", "message" 또는 "error"}, ...]}
+    client_id가 이미 저장된 메시지는 새로 만들지 않고 저장된 메시지를 반환하므로 실패한 요청을 그대로 다시 보내도 됨
+    """
+    try:
+        items = request.data.get('messages')
+        if not isinstance(items, list) or not items:
+            return Response({"error": "messages가 필요합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > BATCH_MAX_MESSAGES:
+            return Response(
+                {"error": f"한 번에 최대 {BATCH_MAX_MESSAGES}개까지 보낼 수 있습니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # 요청 항목 검증 (잘못된 항목만 오류로 처리하고 나머지는 저장)
+        results = [None] * len(items)
+        valid = []
+        for position, item in enumerate(items):
+            item = item if isinstance(item, dict) else {}
+            try:
+                room_id = uuid.UUID(str(item.get('room_id')))
+                client_id = uuid.UUID(str(item.get('client_id')))
+            except ValueError:
+                results[position] = {'client_id': item.get('client_id'), 'status': 'error', 'error': 'room_id와 client_id가 필요합니다.'}
+                continue
+            content = str(item.get('content') or '').strip()
+            if not content:
+                results[position] = {'client_id': str(client_id), 'status': 'error', 'error': 'content가 필요합니다.'}
+                continue
+            valid.append((position, room_id, client_id, content))
+
+        # 참여 중인 채팅방 확인 (한 번의 쿼리)
+        room_ids = {room_id for _, room_id, _, _ in valid}
+        my_room_ids = set(
+            ChatRoom.participants.through.objects.filter(
+                chatroom_id__in=room_ids, user_id=request.user.id
+            ).values_list('chatroom_id', flat=True)
+        )
+
+        # 보낸 순서가 유지되도록 전송 시간을 1마이크로초씩 증가시켜 지정
+        sent_at = timezone.now()
+        pending = {}
+        for position, room_id, client_id, content in valid:
+            if room_id not in my_room_ids:
+                results[position] = {'client_id': str(client_id), 'status': 'error', 'error': '접근 권한이 없습니다.'}
+            elif client_id not in pending:
+                pending[client_id] = (position, ChatMessage(
+                    room_id=room_id,
+                    sender=request.user,
+                    client_id=client_id,
+                    content=content,
+                    created_at=sent_at + timedelta(microseconds=len(pending))
+                ))
+
+        if pending:
+            with transaction.atomic():
+                # 이미 저장된 client_id는 건너뛰고 한 번에 저장
+                ChatMessage.objects.bulk_create([message for _, message in pending.values()], ignore_conflicts=True)
+                saved = {
+                    message.client_id: message
+                    for message in ChatMessage.objects.filter(sender=request.user, client_id__in=list(pending))
+                }
+                created = [message for _, message in pending.values() if saved.get(message.client_id, message).id == message.id]
+
+                # 새 메시지가 있는 채팅방마다 업데이트 시간을 한 번만 갱신 (한 번의 UPDATE)
+                if created:
+                    ChatRoom.objects.filter(id__in={message.room_id for message in created}).update(
+                        updated_at=max(message.created_at for message in created)
+                    )
+
+            # 항목별 결과 (같은 요청 안에서 중복된 client_id는 저장된 메시지 기준으로 duplicate)
+            for position, room_id, client_id, _ in valid:
+                if results[position] is not None:
+                    continue
+                first_position, message = pending[client_id]
+                stored = saved.get(client_id, message)
+                if stored.room_id != room_id:
+                    # 이미 다른 채팅방의 메시지에 사용된 client_id
+                    results[position] = {'client_id': str(client_id), 'status': 'error', 'error': CLIENT_ID_CONFLICT_ERROR}
+                    continue
+                results[position] = {
+                    'client_id': str(client_id),
+                    'status': 'created' if position == first_position and stored.id == message.id else 'duplicate',
+                    'message': {
+                        'id': str(stored.id),
+                        'room_id': str(stored.room_id),
+                        'content': stored.content,
+                        'created_at': stored.created_at.isoformat(),
+                        'is_mine': True
+                    }
+                }
+
+            # 채팅방에 연결된 참여자에게 실시간 전송
+            for message in created:
+                transaction.on_commit(lambda message=message: broadcast_message(message))
+
+        return Response({'results': results})
+    except Exception as e:
+        logger.error(f"메시지 일괄 전송 중 오류 발생: {e}")
         return Response({"error": "서버 오류가 발생했습니다."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class FeedsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'feeds'
+
+    def ready(self):
+        import feeds.signals
+        from waylo_api.background import is_server_process
+
+        # 서버 프로세스에서만 이미지 처리 워커와 중단된 작업 복구 스레드 시작 (관리 명령 제외)
+        if is_server_process():
+            from feeds.tasks import start_background_workers
+            start_background_workers()
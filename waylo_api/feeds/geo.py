@@ -0,0 +1,136 @@
+import math
+
+try:
+    from geographiclib.geodesic import Geodesic
+except ImportError:  # 선택 의존성 (없으면 주변 피드 조회는 캐시를 거치지 않음)
+    Geodesic = None
+
+# Web Mercator 타일 위도 한계
+MAX_LATITUDE = 85.05112878
+
+# WGS84 타원체에서 가장 작은 곡률 반지름 (적도의 자오선 곡률 반지름, m)
+# 반경을 도 단위 범위로 바꿀 때 이 값을 쓰면 타원체 위 어느 방향으로도 범위가 좁아지지 않음
+MIN_CURVATURE_RADIUS_M = 6335439.327
+
+# PostGIS geography 거리 반올림 단위 (geography_measurement.c INVMINDIST)
+GEOGRAPHY_DISTANCE_PRECISION = 1.0e8
+
+# 지도 줌 레벨 범위
+MIN_ZOOM = 0
+MAX_ZOOM = 22
+
+
+class InvalidBoundingBox(ValueError):
+    """ 잘못된 bbox 파라미터 """
+
+
+def parse_bbox(value):
+    """
+    'minx,miny,maxx,maxy' (경도/위도) 문자열을 (min_lng, min_lat, max_lng, max_lat) 튜플로 변환
+    """
+    try:
+        min_lng, min_lat, max_lng, max_lat = [float(part) for part in value.split(',')]
+    except (AttributeError, ValueError):
+        raise InvalidBoundingBox(value)
+
+    if not (-180 <= min_lng <= 180 and -180 <= max_lng <= 180 and -90 <= min_lat <= 90 and -90 <= max_lat <= 90):
+        raise InvalidBoundingBox(value)
+    if min_lng >= max_lng or min_lat >= max_lat:
+        raise InvalidBoundingBox(value)
+
+    return min_lng, min_lat, max_lng, max_lat
+
+
+def parse_zoom(value):
+    """
+    줌 레벨 문자열을 MIN_ZOOM ~ MAX_ZOOM 범위의 정수로 변환
+    """
+    try:
+        zoom = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(value)
+    if not MIN_ZOOM <= zoom <= MAX_ZOOM:
+        raise ValueError(value)
+    return zoom
+
+
+def grid_size_for_zoom(zoom, cells_per_tile):
+    """
+    줌 레벨의 타일 하나를 cells_per_tile x cells_per_tile 격자로 나눈 셀 크기 (경도 기준, 도 단위)
+    """
+    return 360.0 / (2 ** zoom) / cells_per_tile
+
+
+def lnglat_to_tile(lng, lat, zoom):
+    """
+    경도/위도가 속한 slippy map 타일 (x, y) 번호
+    """
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    n = 2 ** zoom
+    x = int((lng + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_bounds(zoom, x, y):
+    """
+    slippy map 타일의 (min_lng, min_lat, max_lng, max_lat) 범위
+    """
+    n = 2 ** zoom
+
+    def tile_lat(tile_y):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * tile_y / n))))
+
+    return x / n * 360.0 - 180.0, tile_lat(y + 1), (x + 1) / n * 360.0 - 180.0, tile_lat(y)
+
+
+def tiles_covering(bbox, zoom):
+    """
+    bbox를 덮는 타일 번호 범위 (min_x, min_y, max_x, max_y)
+    """
+    min_lng, min_lat, max_lng, max_lat = bbox
+    min_x, min_y = lnglat_to_tile(min_lng, max_lat, zoom)
+    max_x, max_y = lnglat_to_tile(max_lng, min_lat, zoom)
+    return min_x, min_y, max_x, max_y
+
+
+def geography_distance_available():
+    return Geodesic is not None
+
+
+def _postgis_degrees(degrees):
+    """ PostGIS가 좌표를 라디안으로 저장했다가 측지선 계산 전에 도로 되돌리는 것과 같은 변환 """
+    return 180.0 * (math.pi * degrees / 180.0) / math.pi
+
+
+def geography_distance_m(lng1, lat1, lng2, lat2):
+    """
+    PostGIS geography ST_Distance(첫째 점, 둘째 점)와 같은 WGS84 타원체 측지선 거리 (m)
+    PostGIS와 같은 알고리즘(GeographicLib geod_inverse)으로 계산하고 같은 단위로 반올림
+    캐시된 후보 목록의 거리/반경/커서 값을 DB 조회(Distance)와 맞추는 데 사용
+    """
+    distance = Geodesic.WGS84.Inverse(
+        _postgis_degrees(lat1), _postgis_degrees(lng1),
+        _postgis_degrees(lat2), _postgis_degrees(lng2),
+        Geodesic.DISTANCE
+    )['s12']
+    return math.floor(distance * GEOGRAPHY_DISTANCE_PRECISION + 0.5) / GEOGRAPHY_DISTANCE_PRECISION
+
+
+def radius_bbox(lng, lat, radius_m):
+    """
+    중심 좌표와 반경(m)을 포함하는 (min_lng, min_lat, max_lng, max_lat) 범위 (극/날짜변경선에서 보정)
+    타원체 측지선 반경도 포함하도록 가장 작은 곡률 반지름으로 계산
+    """
+    delta_lat = math.degrees(radius_m / MIN_CURVATURE_RADIUS_M)
+    min_lat = max(-90.0, lat - delta_lat)
+    max_lat = min(90.0, lat + delta_lat)
+
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if cos_lat <= 0 or max_lat >= 90 or min_lat <= -90:
+        return -180.0, min_lat, 180.0, max_lat
+
+    delta_lng = math.degrees(radius_m / (MIN_CURVATURE_RADIUS_M * cos_lat))
+    if lng - delta_lng < -180 or lng + delta_lng > 180:
+        return -180.0, min_lat, 180.0, max_lat
+    return lng - delta_lng, min_lat, lng + delta_lng, max_lat
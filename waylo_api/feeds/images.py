@@ -0,0 +1,275 @@
+from PIL import Image, ImageOps, ExifTags, UnidentifiedImageError
+import io
+import os
+import posixpath
+from datetime import datetime
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+# 썸네일 크기
+THUMBNAIL_SIZE = (200, 200)
+
+# 해상도별 파생 이미지 기본 설정 (settings.FEED_IMAGE_WIDTHS / FEED_IMAGE_FORMATS로 변경 가능)
+DEFAULT_DERIVATIVE_WIDTHS = [200, 480, 1080]
+DEFAULT_DERIVATIVE_FORMATS = ['webp', 'avif']
+
+# 포맷별 저장 옵션
+DERIVATIVE_SAVE_OPTIONS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'avif': {'format': 'AVIF', 'quality': 55, 'speed': 8},
+}
+
+
+def media_url_to_name(url):
+    """
+    MEDIA_URL 기준 URL(/media/<user_id>/feeds/...)을 MEDIA_ROOT 기준 상대 경로로 변환
+    """
+    relative = url
+    if relative.startswith(settings.MEDIA_URL):
+        relative = relative[len(settings.MEDIA_URL):]
+    return relative.lstrip('/')
+
+
+def media_url_to_path(url):
+    """
+    MEDIA_URL 기준 URL(/media/<user_id>/feeds/...)을 MEDIA_ROOT 내 파일 경로로 변환
+    """
+    return os.path.join(settings.MEDIA_ROOT, *media_url_to_name(url).split('/'))
+
+
+def media_path_to_url(*parts):
+    """
+    MEDIA_ROOT 기준 상대 경로 조각들을 MEDIA_URL 기준 URL로 변환
+    """
+    return posixpath.join(settings.MEDIA_URL, *[str(part) for part in parts]).replace("\\", "/")
+
+
+def save_media_file(name, data):
+    """
+    MEDIA_ROOT 기준 상대 경로에 파일을 저장하고 실제 저장된 파일의 URL 반환
+    """
+    saved_name = default_storage.save(name, ContentFile(data))
+    return media_path_to_url(saved_name)
+
+
+def delete_media_files(urls):
+    """
+    MEDIA_URL 기준 URL 목록에 해당하는 파일 삭제 (없는 파일은 무시)
+    """
+    for url in urls:
+        if not url:
+            continue
+        path = media_url_to_path(url)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def verify_image(data):
+    """
+    업로드된 바이트가 읽을 수 있는 이미지인지 확인 (디코딩 없이 헤더와 구조만 검사)
+    이미지가 아니거나 손상되었으면 UnidentifiedImageError
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.verify()
+    except UnidentifiedImageError:
+        raise
+    except Exception as e:
+        raise UnidentifiedImageError(f"손상된 이미지 파일: {e}") from e
+
+
+# EXIF 데이터에서 촬영 날짜 추출 유틸리티 함수
+def extract_photo_date_from_exif(image_file):
+    """
+    EXIF 데이터에서 촬영 날짜 추출
+    """
+    try:
+        with Image.open(image_file) as img:
+            return read_photo_date(img)
+    except Exception:
+        pass
+
+    return None
+
+
+def read_photo_date(img):
+    """
+    이미 열린 이미지의 EXIF에서 촬영 날짜 추출
+    """
+    try:
+        exif_data = img._getexif() if hasattr(img, '_getexif') else None
+
+        if exif_data is not None:
+            for tag_id, value in exif_data.items():
+                tag_name = ExifTags.TAGS.get(tag_id, tag_id)
+
+                # 날짜 정보 추출
+                if tag_name == 'DateTimeOriginal' or tag_name == 'DateTime':
+                    try:
+                        date_str = value
+                        photo_date = datetime.strptime(date_str, '%Y:%m:%d %H:%M:%S')
+                        return photo_date
+                    except Exception:
+                        pass
+    except Exception:
+        pass
+
+    return None
+
+
+def prepare_image(img):
+    """
+    EXIF 방향 정보를 반영해 회전하고 RGB로 변환한 작업용 이미지 반환
+    이후 썸네일/파생 이미지 생성은 모두 이 이미지를 사용
+    """
+    img = ImageOps.exif_transpose(img)
+    if img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+    return img
+
+
+def create_square_thumbnail(img, size=THUMBNAIL_SIZE):
+    """
+    prepare_image로 준비된 이미지를 중앙 기준 정사각형으로 잘라 썸네일(JPEG 바이트) 생성
+    """
+    width, height = img.size
+
+    if width > height:
+        left = (width - height) // 2
+        top = 0
+        right = left + height
+        bottom = height
+    else:
+        top = (height - width) // 2
+        left = 0
+        bottom = top + width
+        right = width
+
+    img_cropped = img.crop((left, top, right, bottom))
+    img_resized = img_cropped.resize(size, Image.LANCZOS)
+
+    thumb_io = io.BytesIO()
+    img_resized.save(thumb_io, format='JPEG', quality=85)
+    return thumb_io.getvalue()
+
+
+def derivative_formats():
+    """
+    설정된 파생 이미지 포맷 중 현재 Pillow 빌드가 저장할 수 있는 포맷 목록
+    """
+    Image.init()
+    formats = getattr(settings, 'FEED_IMAGE_FORMATS', DEFAULT_DERIVATIVE_FORMATS)
+    return [
+        fmt for fmt in formats
+        if fmt in DERIVATIVE_SAVE_OPTIONS and DERIVATIVE_SAVE_OPTIONS[fmt]['format'] in Image.SAVE
+    ]
+
+
+def derivative_widths(source_width):
+    """
+    원본보다 큰 해상도는 만들지 않도록 설정된 너비 목록을 보정 (큰 것부터)
+    """
+    widths = sorted(set(getattr(settings, 'FEED_IMAGE_WIDTHS', DEFAULT_DERIVATIVE_WIDTHS)), reverse=True)
+    fitted = [width for width in widths if width < source_width]
+    if len(fitted) < len(widths):
+        fitted.insert(0, source_width)
+    return fitted
+
+
+def generate_derivatives(img):
+    """
+    prepare_image로 준비된 이미지 하나에서 해상도별(너비 기준) 파생 이미지 생성
+    큰 해상도부터 만들고 작은 해상도는 직전 결과에서 축소하여 디코딩/리샘플링 비용 절감
+
+    반환: [{'width', 'height', 'format', 'data'}, ...] (너비 오름차순)
+    """
+    formats = derivative_formats()
+    if not formats:
+        return []
+
+    derivatives = []
+    current = img
+    for width in derivative_widths(img.width):
+        if width != current.width:
+            height = max(1, round(current.height * width / current.width))
+            current = current.resize((width, height), Image.LANCZOS)
+
+        for fmt in formats:
+            buffer = io.BytesIO()
+            current.save(buffer, **DERIVATIVE_SAVE_OPTIONS[fmt])
+            derivatives.append({
+                'width': current.width,
+                'height': current.height,
+                'format': fmt,
+                'data': buffer.getvalue(),
+            })
+
+    derivatives.sort(key=lambda item: (item['width'], item['format']))
+    return derivatives
+
+
+def ingest_image(source, extract_photo_date=True, thumbnail=True, derivatives=True):
+    """
+    업로드 이미지를 한 번만 디코딩하여 필요한 결과물을 모두 생성
+    source: 바이트, 파일 객체 또는 파일 경로
+
+    썸네일/파생 이미지만 필요한 경우 JPEG는 필요한 최대 크기에 맞춰 축소 디코딩(draft)하여
+    전체 해상도 디코딩 비용을 줄임
+
+    반환: {
+        'photo_taken_at': EXIF 촬영 날짜 (extract_photo_date=True일 때),
+        'width', 'height': 방향 보정 후 원본 크기,
+        'image': 방향 보정/RGB 변환된 작업용 이미지 (축소 디코딩된 경우 원본보다 작을 수 있음),
+        'thumbnail': 정사각형 썸네일 JPEG 바이트 (thumbnail=True일 때),
+        'derivatives': generate_derivatives 결과 (derivatives=True일 때)
+    }
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    if derivatives:
+        max_size = max(getattr(settings, 'FEED_IMAGE_WIDTHS', DEFAULT_DERIVATIVE_WIDTHS) + list(THUMBNAIL_SIZE))
+    elif thumbnail:
+        max_size = max(THUMBNAIL_SIZE)
+    else:
+        max_size = None
+
+    with Image.open(source) as img:
+        photo_taken_at = read_photo_date(img) if extract_photo_date else None
+
+        # EXIF 방향이 90도 회전인 경우 가로/세로가 바뀜
+        width, height = img.size
+        if img.getexif().get(ExifTags.Base.Orientation, 1) in (5, 6, 7, 8):
+            width, height = height, width
+
+        if max_size:
+            img.draft('RGB', (max_size, max_size))
+
+        prepared = prepare_image(img)
+
+    return {
+        'photo_taken_at': photo_taken_at,
+        'width': width,
+        'height': height,
+        'image': prepared,
+        'thumbnail': create_square_thumbnail(prepared) if thumbnail else None,
+        'derivatives': generate_derivatives(prepared) if derivatives else [],
+    }
+
+
+def encode_jpeg(img, quality=90):
+    """
+    이미지를 JPEG 바이트로 인코딩
+    """
+    buffer = io.BytesIO()
+    img.save(buffer, format='JPEG', quality=quality)
+    return buffer.getvalue()
+
+
+def derivative_name(file_name, width, fmt):
+    """
+    원본 파일명 기준 파생 이미지 파일명 (예: 2025_photo.jpg -> 2025_photo_480w.webp)
+    """
+    stem = os.path.splitext(file_name)[0]
+    return f"{stem}_{width}w.{fmt}"
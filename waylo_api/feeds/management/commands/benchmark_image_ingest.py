@@ -0,0 +1,143 @@
+import io
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from PIL import Image, ImageOps, ExifTags
+from django.core.management.base import BaseCommand
+from feeds.images import THUMBNAIL_SIZE, ingest_image
+
+
+class CountingFile(io.FileIO):
+    """ 읽은 바이트 수를 집계하는 파일 객체 """
+
+    def __init__(self, path, counter):
+        super().__init__(path, 'rb')
+        self.counter = counter
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.counter['read'] += len(data)
+        return data
+
+    def readinto(self, buffer):
+        count = super().readinto(buffer)
+        self.counter['read'] += count or 0
+        return count
+
+
+def _write(path, data, counter):
+    with open(path, 'wb') as f:
+        f.write(data)
+    counter['written'] += len(data)
+
+
+def legacy_ingest(data, folder, counter):
+    """
+    기존 create_feed 처리 방식 재현
+    원본 저장 -> EXIF 추출을 위해 다시 열기 -> 썸네일 생성을 위해 다시 열고 디코딩
+    """
+    file_path = os.path.join(folder, 'original.jpg')
+    _write(file_path, data, counter)
+
+    with CountingFile(file_path, counter) as reopened_image:
+        img = Image.open(reopened_image)
+        exif_data = img._getexif()
+        if exif_data is not None:
+            for tag_id, value in exif_data.items():
+                if ExifTags.TAGS.get(tag_id, tag_id) in ('DateTimeOriginal', 'DateTime'):
+                    datetime.strptime(value, '%Y:%m:%d %H:%M:%S')
+                    break
+        img.close()
+
+    with CountingFile(file_path, counter) as reopened_image:
+        with Image.open(reopened_image) as img:
+            img = ImageOps.exif_transpose(img)
+            width, height = img.size
+            side = min(width, height)
+            left = (width - side) // 2
+            top = (height - side) // 2
+            img_resized = img.crop((left, top, left + side, top + side)).resize(THUMBNAIL_SIZE, Image.LANCZOS)
+            thumb_io = io.BytesIO()
+            img_resized.save(thumb_io, format='JPEG', quality=85)
+
+    _write(os.path.join(folder, 'thumb.jpg'), thumb_io.getvalue(), counter)
+
+
+def single_decode_ingest(data, folder, counter, derivatives=False):
+    """
+    ingest_image 기반 처리: 원본 저장 후 메모리의 업로드 바이트를 한 번만 디코딩
+    """
+    _write(os.path.join(folder, 'original.jpg'), data, counter)
+
+    ingested = ingest_image(data, derivatives=derivatives)
+    _write(os.path.join(folder, 'thumb.jpg'), ingested['thumbnail'], counter)
+    for index, derivative in enumerate(ingested['derivatives']):
+        _write(os.path.join(folder, f"variant_{index}.{derivative['format']}"), derivative['data'], counter)
+
+
+class Command(BaseCommand):
+    help = '기존 업로드 이미지 처리 방식과 단일 디코딩(ingest_image) 방식의 디스크 I/O와 CPU 시간을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--width', type=int, default=4032, help='테스트 이미지 너비')
+        parser.add_argument('--height', type=int, default=3024, help='테스트 이미지 높이')
+        parser.add_argument('--iterations', type=int, default=10, help='방식별 반복 횟수')
+
+    def _make_sample(self, width, height):
+        """ EXIF 촬영 날짜/방향 정보가 있는 카메라 사진 크기의 JPEG 생성 """
+        img = Image.effect_noise((width, height), 64).convert('RGB')
+        exif = img.getexif()
+        exif[ExifTags.Base.Orientation] = 6
+        exif[ExifTags.Base.DateTime] = '2025:03:19 10:21:49'
+        buffer = io.BytesIO()
+        img.save(buffer, format='JPEG', quality=90, exif=exif)
+        return buffer.getvalue()
+
+    def _run(self, label, func, data, iterations):
+        wall_times = []
+        cpu_times = []
+        counter = {'read': 0, 'written': 0}
+
+        for _ in range(iterations):
+            with tempfile.TemporaryDirectory() as folder:
+                wall_start = time.perf_counter()
+                cpu_start = time.process_time()
+                func(data, folder, counter)
+                cpu_times.append(time.process_time() - cpu_start)
+                wall_times.append(time.perf_counter() - wall_start)
+
+        result = {
+            'wall_ms': statistics.median(wall_times) * 1000,
+            'cpu_ms': statistics.median(cpu_times) * 1000,
+            'read_kb': counter['read'] / iterations / 1024,
+            'written_kb': counter['written'] / iterations / 1024,
+        }
+        self.stdout.write(
+            f"{label:<28} wall {result['wall_ms']:8.1f} ms  cpu {result['cpu_ms']:8.1f} ms  "
+            f"disk read {result['read_kb']:9.1f} KB  disk write {result['written_kb']:9.1f} KB"
+        )
+        return result
+
+    def handle(self, *args, **options):
+        data = self._make_sample(options['width'], options['height'])
+        iterations = options['iterations']
+        self.stdout.write(
+            f"샘플 이미지: {options['width']}x{options['height']} JPEG, {len(data) / 1024:.1f} KB, "
+            f"반복 {iterations}회 (중앙값)"
+        )
+
+        legacy = self._run('legacy (thumbnail)', legacy_ingest, data, iterations)
+        single = self._run('single-decode (thumbnail)', single_decode_ingest, data, iterations)
+        self._run(
+            'single-decode (full ladder)',
+            lambda d, folder, counter: single_decode_ingest(d, folder, counter, derivatives=True),
+            data, iterations
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"썸네일 기준 CPU {single['cpu_ms'] / legacy['cpu_ms'] * 100:.0f}%, "
+            f"디스크 I/O {(single['read_kb'] + single['written_kb']) / (legacy['read_kb'] + legacy['written_kb']) * 100:.0f}% "
+            f"(기존 방식 대비)"
+        ))
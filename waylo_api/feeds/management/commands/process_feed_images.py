@@ -0,0 +1,41 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from feeds.models import Feed
+from feeds.tasks import pending_jobs, process_feed_image, requeue_stale_jobs
+
+
+class Command(BaseCommand):
+    help = '처리되지 않은 피드 이미지(썸네일, EXIF 촬영 날짜)를 처리합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stale-minutes', type=int, default=10,
+            help='processing 상태로 이 시간(분) 이상 멈춘 작업은 다시 대기 상태로 되돌림'
+        )
+        parser.add_argument(
+            '--backfill-variants', action='store_true',
+            help='파생 이미지가 없는 기존 피드도 다시 처리 대상으로 등록'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=500,
+            help='한 번에 처리할 최대 피드 수'
+        )
+
+    def handle(self, *args, **options):
+        # 워커 종료 등으로 중단된 작업 복구 (서버 프로세스의 복구 스레드와 같은 기준)
+        requeued = requeue_stale_jobs(timezone.now() - timedelta(minutes=options['stale_minutes']))
+
+        if options['backfill_variants']:
+            Feed.objects.filter(
+                processing_status='ready', image_variants=[]
+            ).update(processing_status='pending')
+
+        processed = 0
+        for feed_id, extract_photo_date in pending_jobs(options['limit']):
+            if process_feed_image(feed_id, extract_photo_date=extract_photo_date):
+                processed += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'복구된 작업: {requeued}, 처리된 피드: {processed}'
+        ))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from users.models import User
+from feeds.models import HighFanoutAuthor
+from feeds.timeline import fanout_limit, rebuild_timeline
+
+
+class Command(BaseCommand):
+    help = '친구 피드 타임라인(fan-out-on-write)을 기존 친구 관계와 공개 피드로 다시 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', default=[], help='특정 사용자 ID만 다시 생성 (여러 번 지정 가능)')
+
+    def _refresh_high_fanout_authors(self):
+        """ 친구 수 기준으로 읽기 시점 병합 작성자 목록을 다시 계산 """
+        limit = fanout_limit()
+        hot_ids = list(
+            User.objects.annotate(
+                friend_count=Count('friend_edges')
+            ).filter(friend_count__gte=limit).values_list('id', flat=True)
+        )
+        HighFanoutAuthor.objects.exclude(user_id__in=hot_ids).delete()
+        HighFanoutAuthor.objects.bulk_create(
+            [HighFanoutAuthor(user_id=user_id) for user_id in hot_ids],
+            ignore_conflicts=True
+        )
+        return len(hot_ids)
+
+    def handle(self, *args, **options):
+        if options['user']:
+            user_ids = options['user']
+        else:
+            hot_count = self._refresh_high_fanout_authors()
+            self.stdout.write(f"읽기 시점 병합 작성자: {hot_count}명 (친구 {fanout_limit()}명 이상)")
+            user_ids = User.objects.filter(friend_edges__isnull=False).distinct().values_list('id', flat=True).iterator()
+
+        users = 0
+        entries = 0
+        for user_id in user_ids:
+            with transaction.atomic():
+                entries += rebuild_timeline(user_id)
+            users += 1
+
+        self.stdout.write(self.style.SUCCESS(f"타임라인 {users}명, 항목 {entries}개 생성 완료"))
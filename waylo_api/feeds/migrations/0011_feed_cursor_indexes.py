@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-17 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0010_remove_feed_low_res_url_remove_feed_medium_res_url'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feed',
+            index=models.Index(fields=['created_at', 'id'], name='feeds_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feed',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='feeds_user_created_id_idx'),
+        ),
+    ]
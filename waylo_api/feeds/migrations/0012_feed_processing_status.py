@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-17 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0011_feed_cursor_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feed',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=20),
+        ),
+    ]
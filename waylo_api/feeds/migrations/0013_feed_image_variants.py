@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-17 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0012_feed_processing_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feed',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
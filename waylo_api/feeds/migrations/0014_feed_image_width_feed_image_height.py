@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-17 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0013_feed_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feed',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='feed',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-17 12:05
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0014_feed_image_width_feed_image_height'),
+    ]
+
+    operations = [
+        # PointField 자동 생성 공간 인덱스(feeds_location_id)를 명시적인 GiST 인덱스로 교체
+        migrations.AlterField(
+            model_name='feed',
+            name='location',
+            field=django.contrib.gis.db.models.fields.PointField(geography=True, null=True, spatial_index=False, srid=4326),
+        ),
+        migrations.AddIndex(
+            model_name='feed',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['location'], name='feeds_location_gist'),
+        ),
+    ]
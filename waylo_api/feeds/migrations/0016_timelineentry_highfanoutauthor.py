@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-17 13:10
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0015_feed_location_gist_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HighFanoutAuthor',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'feed_high_fanout_authors',
+            },
+        ),
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField()),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('feed', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='feeds.feed')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'feed_timeline',
+                'indexes': [models.Index(fields=['owner', '-created_at', '-feed'], name='feed_timeline_owner_idx'), models.Index(fields=['owner', 'author'], name='feed_timeline_author_idx')],
+                'constraints': [models.UniqueConstraint(fields=('owner', 'feed'), name='unique_timeline_entry')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-17 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0016_timelineentry_highfanoutauthor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feed',
+            name='processing_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-17 19:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0017_feed_processing_started_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feed',
+            index=models.Index(condition=models.Q(('processing_status__in', ['pending', 'processing'])), fields=['created_at'], name='feeds_processing_queue_idx'),
+        ),
+    ]
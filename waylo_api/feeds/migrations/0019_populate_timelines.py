@@ -0,0 +1,59 @@
+# Generated by Django 5.2 on 2026-10-17 20:30
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count
+
+
+def populate_timelines(apps, schema_editor):
+    """
+    기존 친구 관계와 공개 피드로 친구 피드 타임라인을 생성
+    (친구 피드 목록이 타임라인 테이블만 조회하므로 마이그레이션 직후부터 기존 피드가 보이도록)
+    친구 수가 기준 이상인 작성자는 읽기 시점 병합 대상으로 등록하고 타임라인에 복사하지 않음
+    친구 목록은 friends 0006에서 생성된 FriendEdge를 사용
+    """
+    from feeds.timeline import BATCH_SIZE, DEFAULT_FANOUT_LIMIT
+
+    Feed = apps.get_model('feeds', 'Feed')
+    TimelineEntry = apps.get_model('feeds', 'TimelineEntry')
+    HighFanoutAuthor = apps.get_model('feeds', 'HighFanoutAuthor')
+    FriendEdge = apps.get_model('friends', 'FriendEdge')
+
+    limit = getattr(settings, 'FEED_TIMELINE_FANOUT_LIMIT', DEFAULT_FANOUT_LIMIT)
+    hot_ids = list(
+        FriendEdge.objects.values('user_id').annotate(friend_count=Count('id')).filter(
+            friend_count__gte=limit
+        ).values_list('user_id', flat=True)
+    )
+    HighFanoutAuthor.objects.bulk_create(
+        [HighFanoutAuthor(user_id=user_id) for user_id in hot_ids],
+        ignore_conflicts=True
+    )
+
+    # 작성자별 공개 피드를 그 작성자의 친구(타임라인 주인)마다 한 행씩
+    author_ids = FriendEdge.objects.exclude(user_id__in=hot_ids).values_list('user_id', flat=True).distinct()
+    batch = []
+    for author_id in author_ids.iterator():
+        owner_ids = list(FriendEdge.objects.filter(user_id=author_id).values_list('friend_id', flat=True))
+        feeds = Feed.objects.filter(user_id=author_id, visibility='public').values_list('id', 'created_at')
+        for feed_id, created_at in feeds.iterator():
+            for owner_id in owner_ids:
+                batch.append(TimelineEntry(owner_id=owner_id, feed_id=feed_id, author_id=author_id, created_at=created_at))
+                if len(batch) >= BATCH_SIZE:
+                    TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+                    batch = []
+    if batch:
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0018_feed_processing_queue_index'),
+        ('friends', '0006_populate_friend_edges'),
+    ]
+
+    operations = [
+        # 역방향은 아무 작업도 하지 않음 (다시 적용해도 이미 있는 항목은 무시)
+        migrations.RunPython(populate_timelines, migrations.RunPython.noop),
+    ]
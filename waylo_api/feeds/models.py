@@ -1,4 +1,5 @@
 from django.contrib.gis.db import models as gis_models
+from django.contrib.postgres.indexes import GistIndex
 from django.db import models
 from users.models import User
 import uuid
@@ -9,16 +10,26 @@ class Feed(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="feeds")  # 피드를 작성한 유저
     latitude = models.DecimalField(max_digits=9, decimal_places=6)  # 위도
     longitude = models.DecimalField(max_digits=9, decimal_places=6)  # 경도
-    location = gis_models.PointField(geography=True, null=True)  # 위치 정보 (GIS)
+    location = gis_models.PointField(geography=True, null=True, spatial_index=False)  # 위치 정보 (GIS, 인덱스는 Meta.indexes)
     country_code = models.CharField(max_length=10, blank=True, null=True)  # 국가 코드
     image_url = models.TextField()  # 이미지 URL
     thumbnail_url = models.TextField(blank=True, null=True)  # 썸네일 이미지 URL
+    image_variants = models.JSONField(default=list, blank=True)  # 해상도/포맷별 파생 이미지 목록
+    image_width = models.PositiveIntegerField(null=True, blank=True)  # 방향 보정 후 원본 너비
+    image_height = models.PositiveIntegerField(null=True, blank=True)  # 방향 보정 후 원본 높이
     description = models.TextField(blank=True, null=True)  # 설명
     visibility = models.CharField(max_length=20, choices=[
         ('public', 'Public'),
         ('private', 'Private'),
     ], default='public')  # 공개 여부
     photo_taken_at = models.DateTimeField(null=True, blank=True)  # 사진 촬영 시간
+    processing_status = models.CharField(max_length=20, choices=[
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ], default='ready')  # 이미지 후처리(썸네일, EXIF) 상태
+    processing_started_at = models.DateTimeField(null=True, blank=True)  # 이미지 처리 작업을 가져간 시간 (중단된 작업 복구 기준)
     extra_data = models.JSONField(default=dict)  # 추가 데이터
     created_at = models.DateTimeField(auto_now_add=True)  # 생성 시간
     likes_count = models.PositiveIntegerField(default=0)  # 좋아요 수
@@ -26,6 +37,19 @@ class Feed(models.Model):
 
     class Meta:
         db_table = 'feeds'  # 테이블 이름 지정
+        indexes = [
+            # 커서 페이지네이션용 (created_at, id) 정렬 인덱스
+            models.Index(fields=['created_at', 'id'], name='feeds_created_id_idx'),
+            models.Index(fields=['user', 'created_at', 'id'], name='feeds_user_created_id_idx'),
+            # 지도 bbox(&&) / 반경 검색용 공간 인덱스
+            GistIndex(fields=['location'], name='feeds_location_gist'),
+            # 이미지 처리 복구 스레드의 대기/중단 작업 조회용 부분 인덱스
+            models.Index(
+                fields=['created_at'],
+                name='feeds_processing_queue_idx',
+                condition=models.Q(processing_status__in=['pending', 'processing'])
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         """ 위도와 경도를 이용해 위치 정보 생성 """
@@ -90,3 +114,33 @@ class CommentLike(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['user', 'comment'], name='unique_comment_like')  # 중복 좋아요 방지
         ]
+
+
+# 친구 피드 타임라인 (fan-out-on-write)
+class TimelineEntry(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="timeline_entries")  # 타임라인 주인
+    feed = models.ForeignKey(Feed, on_delete=models.CASCADE, related_name="timeline_entries")  # 친구가 올린 피드
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")  # 피드 작성자 (친구 관계 해제 시 일괄 제거용)
+    created_at = models.DateTimeField()  # 피드 생성 시간 (정렬 기준)
+
+    class Meta:
+        db_table = 'feed_timeline'
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'feed'], name='unique_timeline_entry')
+        ]
+        indexes = [
+            # 타임라인 범위 조회용 (owner, created_at DESC, feed DESC)
+            models.Index(fields=['owner', '-created_at', '-feed'], name='feed_timeline_owner_idx'),
+            models.Index(fields=['owner', 'author'], name='feed_timeline_author_idx'),
+        ]
+
+
+# 친구가 많아 타임라인에 복사하지 않고 읽기 시점에 병합하는 작성자
+class HighFanoutAuthor(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="+")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'feed_high_fanout_authors'
+
@@ -0,0 +1,124 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from django.contrib.gis.measure import D
+from django.db.models import Q
+
+# 커서 모드 기본/최대 페이지 크기
+DEFAULT_CURSOR_LIMIT = 10
+MAX_CURSOR_LIMIT = 100
+
+
+class InvalidCursor(ValueError):
+    """ 잘못된 형식의 커서 """
+
+
+def encode_cursor(values):
+    """
+    커서 값 목록을 불투명한 URL-safe 문자열로 인코딩
+    """
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    encode_cursor로 만든 문자열을 값 목록으로 복원
+    """
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if not isinstance(values, list):
+        raise InvalidCursor(cursor)
+    return values
+
+
+def parse_cursor_limit(request):
+    """
+    커서 모드의 limit 파라미터를 1 ~ MAX_CURSOR_LIMIT 범위로 보정
+    """
+    try:
+        limit = int(request.query_params.get('limit', DEFAULT_CURSOR_LIMIT))
+    except ValueError:
+        limit = DEFAULT_CURSOR_LIMIT
+    return max(1, min(limit, MAX_CURSOR_LIMIT))
+
+
+def _split_page(items, limit, make_cursor):
+    """ limit + 1개를 조회한 결과에서 다음 페이지 커서 생성 """
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    return items, make_cursor(items[-1])
+
+
+def paginate_by_created_at(queryset, cursor, limit):
+    """
+    (created_at, id) 내림차순 keyset 페이지네이션
+    OFFSET 없이 마지막으로 본 행 이후만 조회
+    """
+    queryset = queryset.order_by('-created_at', '-id')
+
+    if cursor:
+        try:
+            created_at, last_id = decode_cursor(cursor)
+            created_at = datetime.fromisoformat(created_at)
+            last_id = uuid.UUID(last_id)
+        except (ValueError, TypeError):
+            raise InvalidCursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=last_id)
+        )
+
+    items = list(queryset[:limit + 1])
+    return _split_page(
+        items, limit,
+        lambda last: encode_cursor([last.created_at.isoformat(), str(last.id)])
+    )
+
+
+def paginate_by_distance(queryset, cursor, limit):
+    """
+    (distance, id) 오름차순 keyset 페이지네이션
+    queryset에는 Distance 'distance' 어노테이션이 있어야 함
+    """
+    queryset = queryset.order_by('distance', 'id')
+
+    if cursor:
+        try:
+            distance_m, last_id = decode_cursor(cursor)
+            distance = D(m=float(distance_m))
+            last_id = uuid.UUID(last_id)
+        except (ValueError, TypeError):
+            raise InvalidCursor(cursor)
+        queryset = queryset.filter(
+            Q(distance__gt=distance) | Q(distance=distance, id__gt=last_id)
+        )
+
+    items = list(queryset[:limit + 1])
+    return _split_page(
+        items, limit,
+        lambda last: encode_cursor([last.distance.m, str(last.id)])
+    )
+
+
+def paginate_distance_entries(entries, cursor, limit):
+    """
+    (distance_m, id 문자열) 오름차순으로 정렬된 목록에 대한 keyset 페이지네이션
+    paginate_by_distance와 같은 커서 형식을 사용 (캐시된 후보 목록용)
+    """
+    if cursor:
+        try:
+            distance_m, last_id = decode_cursor(cursor)
+            last_key = (float(distance_m), str(uuid.UUID(last_id)))
+        except (ValueError, TypeError):
+            raise InvalidCursor(cursor)
+        entries = [entry for entry in entries if entry > last_key]
+
+    return _split_page(
+        entries[:limit + 1], limit,
+        lambda last: encode_cursor([last[0], last[1]])
+    )
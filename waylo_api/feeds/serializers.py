@@ -1,6 +1,22 @@
+from django.db.models import Exists, OuterRef
 from rest_framework import serializers
 from .models import Feed, FeedLike, FeedBookmark, FeedComment, CommentLike
 
+
+def annotate_viewer_state(queryset, user):
+    """
+    목록 직렬화용 쿼리셋 준비
+    작성자를 JOIN으로 함께 가져오고, 요청 사용자의 좋아요/북마크 여부를 EXISTS 서브쿼리로 한 번에 계산
+    """
+    queryset = queryset.select_related('user')
+    if user is not None and user.is_authenticated:
+        queryset = queryset.annotate(
+            viewer_liked=Exists(FeedLike.objects.filter(feed=OuterRef('pk'), user=user)),
+            viewer_bookmarked=Exists(FeedBookmark.objects.filter(feed=OuterRef('pk'), user=user)),
+        )
+    return queryset
+
+
 # 피드 정보 직렬화
 class FeedSerializer(serializers.ModelSerializer):
     user_details = serializers.SerializerMethodField()  # 유저 정보 추가
@@ -11,6 +27,7 @@ class FeedSerializer(serializers.ModelSerializer):
     class Meta:
         model = Feed
         fields = '__all__'
+        read_only_fields = ['processing_status', 'processing_started_at', 'image_variants', 'image_width', 'image_height']
         
     def get_user_details(self, obj):
         """ 피드 작성자의 기본 정보 반환 """
@@ -22,6 +39,8 @@ class FeedSerializer(serializers.ModelSerializer):
     
     def get_is_liked(self, obj):
         """ 사용자가 피드에 좋아요를 눌렀는지 확인 """
+        if hasattr(obj, 'viewer_liked'):
+            return obj.viewer_liked
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return FeedLike.objects.filter(feed=obj, user=request.user).exists()
@@ -29,6 +48,8 @@ class FeedSerializer(serializers.ModelSerializer):
     
     def get_is_bookmarked(self, obj):
         """ 사용자가 피드를 북마크했는지 확인 """
+        if hasattr(obj, 'viewer_bookmarked'):
+            return obj.viewer_bookmarked
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return FeedBookmark.objects.filter(feed=obj, user=request.user).exists()
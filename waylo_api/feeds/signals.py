@@ -0,0 +1,122 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from friends.models import Friendship
+from users.models import UserStats
+from . import timeline
+from .models import Feed
+from .tasks import enqueue_timeline_update
+from .tile_cache import bump_tile_versions
+
+
+def _tracked_state(instance):
+    """
+    타일 캐시/타임라인에 영향을 주는 필드 값 (지연 로딩 필드는 조회하지 않음)
+    캐시된 지도 핀과 벡터 타일에 썸네일 URL이 포함되므로 thumbnail_url도 추적
+    """
+    data = instance.__dict__
+    return data.get('visibility'), data.get('latitude'), data.get('longitude'), data.get('thumbnail_url')
+
+
+def _public_points(*states):
+    """ 공개 상태인 피드 위치 목록 (경도, 위도) """
+    return [
+        (float(longitude), float(latitude))
+        for visibility, latitude, longitude, _ in states
+        if visibility == 'public' and latitude is not None and longitude is not None
+    ]
+
+
+@receiver(post_init, sender=Feed)
+def remember_feed_state(sender, instance, **kwargs):
+    """
+    피드를 불러올 때 위치/공개 여부/썸네일을 기억해 두어 저장 시 변경 여부를 판단
+    """
+    instance._tracked_state = _tracked_state(instance)
+
+
+@receiver(post_save, sender=Feed)
+def feed_saved(sender, instance, created, **kwargs):
+    """
+    피드가 생성되거나 위치/공개 여부/썸네일이 바뀌면
+    - 이전/현재 위치 타일의 주변 피드 캐시를 무효화
+    - 공개 여부에 따라 친구 타임라인에 추가/제거
+    - 새 피드는 작성자의 피드 수에 반영
+    """
+    previous = getattr(instance, '_tracked_state', (None, None, None, None))
+    current = _tracked_state(instance)
+    instance._tracked_state = current
+
+    if created:
+        UserStats.increment(instance.user_id, {'feeds_count': 1})
+        points = _public_points(current)
+    elif previous != current:
+        points = _public_points(previous, current)
+    else:
+        return
+
+    if points:
+        transaction.on_commit(lambda: bump_tile_versions(points))
+
+    feed_id = instance.id
+    was_public = not created and previous[0] == 'public'
+    is_public = current[0] == 'public'
+    if is_public and not was_public:
+        # 친구 수만큼 타임라인 항목을 저장하므로 워커 스레드에서 처리
+        enqueue_timeline_update(timeline.fan_out_feed, feed_id)
+    elif was_public and not is_public:
+        transaction.on_commit(lambda: timeline.remove_feed(feed_id))
+
+
+@receiver(post_delete, sender=Feed)
+def feed_deleted(sender, instance, **kwargs):
+    """
+    피드가 삭제되면 해당 위치 타일의 주변 피드 캐시를 무효화하고 작성자 통계에서 제외
+    (타임라인 항목은 외래 키 CASCADE로 함께 삭제됨)
+    """
+    UserStats.increment(
+        instance.user_id,
+        {'feeds_count': -1, 'received_likes_count': -(instance.likes_count or 0)},
+        create=False
+    )
+
+    points = _public_points(_tracked_state(instance))
+    if points:
+        transaction.on_commit(lambda: bump_tile_versions(points))
+
+
+@receiver(post_save, sender=Friendship)
+def friendship_created(sender, instance, created, **kwargs):
+    """
+    새 친구 관계가 생기면 서로의 공개 피드를 타임라인에 추가하고
+    친구 수가 기준을 넘은 사용자는 읽기 시점 병합 대상으로 전환 (워커 스레드에서 처리)
+    """
+    if not created:
+        return
+
+    friendship_id, user1_id, user2_id = instance.id, instance.user1_id, instance.user2_id
+
+    def update_timelines():
+        # 작업이 실행되기 전에 친구 관계가 삭제되었으면 건너뜀
+        if not Friendship.objects.filter(id=friendship_id).exists():
+            return
+        timeline.refresh_high_fanout(user1_id)
+        timeline.refresh_high_fanout(user2_id)
+        timeline.add_author_to_timeline(user1_id, user2_id)
+        timeline.add_author_to_timeline(user2_id, user1_id)
+
+    enqueue_timeline_update(update_timelines)
+
+
+@receiver(post_delete, sender=Friendship)
+def friendship_deleted(sender, instance, **kwargs):
+    """
+    친구 관계가 삭제되면 서로의 피드를 타임라인에서 제거
+    """
+    user1_id, user2_id = instance.user1_id, instance.user2_id
+
+    def update_timelines():
+        timeline.remove_author_from_timeline(user1_id, user2_id)
+        timeline.remove_author_from_timeline(user2_id, user1_id)
+
+    transaction.on_commit(update_timelines)
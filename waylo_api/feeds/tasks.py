@@ -0,0 +1,280 @@
+import logging
+import posixpath
+import queue
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from .images import (
+    delete_media_files,
+    derivative_name,
+    ingest_image,
+    media_url_to_name,
+    media_url_to_path,
+    save_media_file
+)
+from .models import Feed
+from .tile_cache import bump_tile_versions
+
+logger = logging.getLogger(__name__)
+
+# 프로세스 내 대기 작업 최대 수 (settings.FEED_TASK_QUEUE_SIZE로 변경 가능)
+# 큐가 가득 차면 이미지 작업은 pending 상태로 남겨 두어 복구 스레드가 나중에 처리하고
+# 타임라인 작업은 요청 스레드에서 바로 처리
+DEFAULT_QUEUE_SIZE = 100
+
+# 복구 스레드 실행 주기와 processing 상태로 멈춘 이미지 작업을 중단된 것으로 보는 시간 (초)
+DEFAULT_RECOVERY_SECONDS = 60
+DEFAULT_STALE_SECONDS = 600
+
+_queue = None
+_queued = Counter()  # 이 프로세스의 큐에 들어 있거나 처리 중인 이미지 작업의 피드 ID
+_lock = threading.Lock()
+_recovery_started = False
+
+
+def queue_backend():
+    """
+    FEED_TASK_QUEUE 설정
+    - 'thread': 트랜잭션 커밋 후 프로세스 내 워커 스레드에서 처리 (기본값)
+    - 'sync': 트랜잭션 커밋 후 요청 스레드에서 즉시 처리
+    """
+    return getattr(settings, 'FEED_TASK_QUEUE', 'thread')
+
+
+def _get_queue():
+    """ 프로세스 내 피드 작업 큐 (최초 사용 시 생성하고 워커 스레드 시작) """
+    global _queue
+    with _lock:
+        if _queue is None:
+            _queue = queue.Queue(maxsize=getattr(settings, 'FEED_TASK_QUEUE_SIZE', DEFAULT_QUEUE_SIZE))
+            for number in range(getattr(settings, 'FEED_TASK_WORKERS', 2)):
+                threading.Thread(
+                    target=_worker_loop, args=(_queue,), name=f'feed-task-{number}', daemon=True
+                ).start()
+        return _queue
+
+
+def _submit(job, args, feed_id=None):
+    """
+    큐에 작업 추가 (큐가 가득 차면 추가하지 않음). 반환: 추가 여부
+    feed_id: 이미지 작업의 피드 ID (복구 스레드가 이미 큐에 있는 작업을 다시 넣지 않도록 기록)
+    """
+    job_queue = _get_queue()
+    with _lock:
+        try:
+            job_queue.put_nowait((job, args, feed_id))
+        except queue.Full:
+            return False
+        if feed_id is not None:
+            _queued[feed_id] += 1
+    return True
+
+
+def enqueue_feed_image_processing(feed_id, extract_photo_date=True, image_url=None):
+    """
+    피드 이미지 후처리(EXIF 촬영 날짜 추출, 썸네일 및 해상도별 파생 이미지 생성) 작업을 큐에 등록
+    작업에는 피드 ID만 담고 워커가 저장된 원본 파일을 읽음
+
+    image_url을 넘기면 그 사이 이미지가 다시 교체된 경우 이 작업은 건너뜀 (새 이미지의 작업이 처리)
+    큐가 가득 찼거나 프로세스 재시작으로 유실된 작업은 Feed.processing_status에 남아 있으므로
+    복구 스레드(start_background_workers)가 다시 큐에 넣음
+    """
+    if queue_backend() == 'sync':
+        transaction.on_commit(lambda: process_feed_image(feed_id, extract_photo_date, image_url))
+        return
+
+    def submit():
+        if not _submit(process_feed_image, (feed_id, extract_photo_date, image_url), feed_id):
+            logger.warning(f"피드 작업 큐가 가득 참, 복구 스레드에서 이미지 처리: {feed_id}")
+
+    transaction.on_commit(submit)
+
+
+def enqueue_timeline_update(job, *args):
+    """
+    친구 타임라인 갱신 작업(fan-out 등)을 트랜잭션 커밋 후 워커 스레드에서 실행
+    친구가 많은 작성자의 타임라인 복사가 피드 작성/친구 수락 요청의 응답 시간에 포함되지 않도록 함
+    큐가 가득 차면 작업을 잃지 않도록 요청 스레드에서 바로 실행
+    """
+    def submit():
+        if queue_backend() == 'sync' or not _submit(job, args):
+            job(*args)
+
+    transaction.on_commit(submit)
+
+
+def _worker_loop(job_queue):
+    """ 워커 스레드: 큐의 작업을 하나씩 실행하고 DB 연결 정리 """
+    while True:
+        job, args, feed_id = job_queue.get()
+        try:
+            job(*args)
+        except Exception:
+            logger.exception(f"피드 작업 처리 중 오류: {getattr(job, '__name__', job)}{args}")
+        finally:
+            if feed_id is not None:
+                with _lock:
+                    _queued[feed_id] -= 1
+                    if _queued[feed_id] <= 0:
+                        del _queued[feed_id]
+            close_old_connections()
+
+
+def requeue_stale_jobs(stale_before):
+    """
+    워커 종료 등으로 중단된 작업을 다시 대기 상태로 되돌림
+    (작업을 가져간 시간 기준, 기록이 없는 이전 작업 포함)
+    반환: 되돌린 작업 수
+    """
+    return Feed.objects.filter(processing_status='processing').filter(
+        Q(processing_started_at__lt=stale_before) | Q(processing_started_at__isnull=True)
+    ).update(processing_status='pending')
+
+
+def pending_jobs(limit):
+    """ 오래된 순서로 대기 중인 작업 [(피드 ID, EXIF 촬영 날짜 추출 여부), ...] """
+    pending = Feed.objects.filter(processing_status='pending').order_by('created_at').values_list(
+        'id', 'photo_taken_at'
+    )[:limit]
+    return [(feed_id, photo_taken_at is None) for feed_id, photo_taken_at in pending]
+
+
+def recover_jobs():
+    """
+    중단된 작업을 되돌리고 이 프로세스의 큐에 없는 대기 작업을 큐의 빈 자리만큼 추가
+    반환: 큐에 추가한 작업 수
+    """
+    stale_seconds = getattr(settings, 'FEED_IMAGE_STALE_SECONDS', DEFAULT_STALE_SECONDS)
+    requeued = requeue_stale_jobs(timezone.now() - timedelta(seconds=stale_seconds))
+    if requeued:
+        logger.info(f"중단된 피드 이미지 처리 작업 복구: {requeued}개")
+
+    job_queue = _get_queue()
+    free = job_queue.maxsize - job_queue.qsize()
+    if free <= 0:
+        return 0
+
+    with _lock:
+        queued = set(_queued)
+    submitted = 0
+    for feed_id, extract_photo_date in pending_jobs(free + len(queued)):
+        if feed_id in queued:
+            continue
+        if not _submit(process_feed_image, (feed_id, extract_photo_date, None), feed_id):
+            break
+        submitted += 1
+    return submitted
+
+
+def _recovery_loop(interval):
+    """ 복구 스레드: 주기적으로 DB의 대기/중단 작업을 큐에 넣음 """
+    while True:
+        time.sleep(interval)
+        try:
+            recover_jobs()
+        except Exception:
+            logger.exception("피드 이미지 처리 작업 복구 중 오류")
+        finally:
+            close_old_connections()
+
+
+def start_background_workers():
+    """
+    워커 스레드와 이미지 작업 복구 스레드 시작 (서버 프로세스의 FeedsConfig.ready에서 호출)
+    큐에 들어가지 못했거나 재시작으로 유실된 작업도 DB 상태를 기준으로 계속 처리됨
+    """
+    global _recovery_started
+    if queue_backend() != 'thread':
+        return
+
+    _get_queue()
+    with _lock:
+        if _recovery_started:
+            return
+        _recovery_started = True
+    interval = getattr(settings, 'FEED_IMAGE_RECOVERY_SECONDS', DEFAULT_RECOVERY_SECONDS)
+    threading.Thread(target=_recovery_loop, args=(interval,), name='feed-image-recovery', daemon=True).start()
+
+
+def process_feed_image(feed_id, extract_photo_date=True, image_url=None):
+    """
+    대기 중인 피드 하나의 이미지를 처리하고 thumbnail_url / image_variants / image_width / image_height /
+    photo_taken_at / processing_status 갱신. 원본은 한 번만 디코딩하여 모든 결과물을 생성
+    원본은 저장된 파일에서 읽음
+    다른 워커가 이미 가져간 작업이거나 image_url과 현재 이미지가 다르면 아무것도 하지 않음
+
+    작업을 가져갈 때 (image_url, processing_started_at)을 기록하고, 결과는 그 값이 그대로일 때만 저장
+    처리 중에 이미지가 교체되었거나 중단된 작업으로 복구되어 다른 워커가 다시 가져간 경우
+    이 작업의 결과물은 버림
+    """
+    feed = Feed.objects.filter(id=feed_id, processing_status='pending').only('id', 'image_url').first()
+    if feed is None or (image_url is not None and feed.image_url != image_url):
+        return False
+
+    started_at = timezone.now()
+    claimed = Feed.objects.filter(
+        id=feed_id, processing_status='pending', image_url=feed.image_url
+    ).update(processing_status='processing', processing_started_at=started_at)
+    if not claimed:
+        return False
+
+    feed_folder, file_name = posixpath.split(media_url_to_name(feed.image_url))
+    saved_urls = []
+
+    try:
+        ingested = ingest_image(media_url_to_path(feed.image_url), extract_photo_date=extract_photo_date)
+
+        thumbnail_url = save_media_file(posixpath.join(feed_folder, f"thumb_{file_name}"), ingested['thumbnail'])
+        saved_urls.append(thumbnail_url)
+
+        variants = []
+        for derivative in ingested['derivatives']:
+            name = derivative_name(file_name, derivative['width'], derivative['format'])
+            url = save_media_file(posixpath.join(feed_folder, name), derivative['data'])
+            saved_urls.append(url)
+            variants.append({
+                'width': derivative['width'],
+                'height': derivative['height'],
+                'format': derivative['format'],
+                'url': url,
+            })
+    except Exception as e:
+        logger.error(f"피드 이미지 처리 실패: {feed_id}, {e}")
+        delete_media_files(saved_urls)
+        saved_urls = []
+        result = {'thumbnail_url': "", 'image_variants': [], 'processing_status': 'failed'}
+    else:
+        result = {
+            'thumbnail_url': thumbnail_url,
+            'image_variants': variants,
+            'image_width': ingested['width'],
+            'image_height': ingested['height'],
+            'processing_status': 'ready',
+        }
+        if ingested['photo_taken_at']:
+            result['photo_taken_at'] = ingested['photo_taken_at']
+
+    written = Feed.objects.filter(
+        id=feed_id,
+        processing_status='processing',
+        image_url=feed.image_url,
+        processing_started_at=started_at
+    ).update(**result)
+
+    if not written:
+        # 처리 중에 이미지가 교체되었거나 다른 워커가 작업을 다시 가져감
+        logger.info(f"피드 이미지 처리 결과 폐기 (작업이 교체됨): {feed_id}")
+        delete_media_files(saved_urls)
+        return True
+
+    # QuerySet.update는 post_save 시그널을 보내지 않으므로, 썸네일이 포함된 지도 핀/벡터 타일 캐시를 직접 무효화
+    location = Feed.objects.filter(id=feed_id, visibility='public').values_list('longitude', 'latitude').first()
+    if location:
+        bump_tile_versions([(float(location[0]), float(location[1]))])
+
+    return True
@@ -1,3 +1,108 @@
-from django.test import TestCase
+from decimal import Decimal
+from unittest import skipUnless
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from friends.models import Friendship
+from users.models import User
+from .geo import geography_distance_available
+from .models import Feed, FeedBookmark, FeedLike
 
-# Create your tests here.
+# "많은 피드" 경우의 피드 수 (한 페이지에 모두 들어가도록 PAGE_LIMIT 이하)
+MANY_FEEDS = 15
+PAGE_LIMIT = 20
+
+
+# 타임라인 갱신 작업을 워커 스레드가 아닌 커밋 시점에 바로 실행
+@override_settings(FEED_TASK_QUEUE='sync')
+class FeedListQueryCountTests(TestCase):
+    """
+    피드 목록 API의 쿼리 수가 피드 수와 관계없이 일정한지 확인 (피드마다 작성자/좋아요/북마크를 따로 조회하지 않음)
+    각 API를 피드 1개일 때와 MANY_FEEDS개일 때 같은 쿼리 수로 호출
+    """
+
+    def setUp(self):
+        # 주변 피드 타일 캐시가 이전 테스트의 결과를 쓰지 않도록 초기화
+        cache.clear()
+
+        self.viewer = User.objects.create_user(email='viewer@example.com', username='viewer', password='password')
+        self.author = User.objects.create_user(email='author@example.com', username='author', password='password')
+        with self.captureOnCommitCallbacks(execute=True):
+            Friendship.objects.create(user1=self.viewer, user2=self.author)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def add_feeds(self, count):
+        """ 작성자의 공개 피드를 추가하고 조회하는 사용자가 모두 좋아요/북마크 (타임라인 반영 포함) """
+        start = Feed.objects.count()
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(start, start + count):
+                feed = Feed.objects.create(
+                    user=self.author,
+                    latitude=Decimal('37.500000') + Decimal(index) / 10000,
+                    longitude=Decimal('127.000000'),
+                    image_url=f'/media/{self.author.id}/feeds/{index}.jpg',
+                )
+                FeedLike.objects.create(user=self.viewer, feed=feed)
+                FeedBookmark.objects.create(user=self.viewer, feed=feed)
+
+    def assert_constant_queries(self, num_queries, url):
+        """ 피드 1개일 때와 MANY_FEEDS개일 때 모두 num_queries번의 쿼리로 전체 피드를 반환하는지 확인 """
+        for total in (1, MANY_FEEDS):
+            self.add_feeds(total - Feed.objects.count())
+
+            # 프로세스에서 한 번만 실행되는 조회(SRID 정보 등)는 세지 않도록 먼저 한 번 호출
+            self.client.get(url)
+            cache.clear()
+
+            with self.assertNumQueries(num_queries):
+                response = self.client.get(url)
+
+            self.assertEqual(response.status_code, 200)
+            feeds = response.data['feeds']
+            self.assertEqual(len(feeds), total)
+            self.assertTrue(all(feed['is_liked'] and feed['is_bookmarked'] for feed in feeds))
+            self.assertTrue(all(feed['user_details']['username'] == 'author' for feed in feeds))
+        return response
+
+    def test_feed_list(self):
+        self.assert_constant_queries(2, f'/api/feeds/?limit={PAGE_LIMIT}')
+
+    def test_feed_list_cursor(self):
+        self.assert_constant_queries(1, f'/api/feeds/?cursor=&limit={PAGE_LIMIT}')
+
+    def test_user_feeds(self):
+        self.assert_constant_queries(3, f'/api/feeds/user/{self.author.id}/?limit={PAGE_LIMIT}')
+
+    def test_user_feeds_cursor(self):
+        self.assert_constant_queries(2, f'/api/feeds/user/{self.author.id}/?cursor=&limit={PAGE_LIMIT}')
+
+    def test_bookmarked_feeds(self):
+        self.assert_constant_queries(2, f'/api/feeds/bookmarked/?limit={PAGE_LIMIT}')
+
+    def test_bookmarked_feeds_cursor(self):
+        self.assert_constant_queries(1, f'/api/feeds/bookmarked/?cursor=&limit={PAGE_LIMIT}')
+
+    @skipUnless(geography_distance_available(), 'geographiclib가 없으면 주변 피드를 캐시하지 않음')
+    def test_nearby_feeds(self):
+        # 타일 캐시 경로 (후보 조회 + 페이지 피드 조회)
+        response = self.assert_constant_queries(2, f'/api/feeds/nearby/?latitude=37.5&longitude=127.0&radius=10&limit={PAGE_LIMIT}')
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+    @skipUnless(geography_distance_available(), 'geographiclib가 없으면 주변 피드를 캐시하지 않음')
+    def test_nearby_feeds_cursor(self):
+        response = self.assert_constant_queries(2, f'/api/feeds/nearby/?latitude=37.5&longitude=127.0&radius=10&cursor=&limit={PAGE_LIMIT}')
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+    def test_nearby_feeds_without_cache(self):
+        # 반경이 넓어 캐시하지 않는 경로 (페이지 조회 + 전체 개수)
+        response = self.assert_constant_queries(2, f'/api/feeds/nearby/?latitude=37.5&longitude=127.0&radius=500&limit={PAGE_LIMIT}')
+        self.assertEqual(response['X-Cache'], 'BYPASS')
+
+    def test_friends_feeds(self):
+        # 읽기 시점 병합 대상 친구 조회 + 타임라인 페이지 + 피드 조회 + 전체 개수(타임라인 개수, 병합 대상 친구 조회)
+        self.assert_constant_queries(5, f'/api/feeds/friends/?limit={PAGE_LIMIT}')
+
+    def test_friends_feeds_cursor(self):
+        self.assert_constant_queries(3, f'/api/feeds/friends/?cursor=&limit={PAGE_LIMIT}')
@@ -0,0 +1,169 @@
+import hashlib
+import logging
+import math
+import os
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from .geo import MAX_ZOOM, geography_distance_m, lnglat_to_tile, tile_bounds, tiles_covering
+
+logger = logging.getLogger(__name__)
+
+# 주변 피드 조회 좌표 양자화 줌 (z16 타일: 적도 기준 약 600m)
+QUANTIZE_ZOOM = 16
+
+# 무효화 단위 줌 (z10 타일: 적도 기준 약 39km)
+# 피드가 생성/수정/삭제되면 해당 타일의 버전을 올려 그 타일을 포함하는 캐시 항목을 모두 무효화
+INVALIDATION_ZOOM = 10
+
+# 한 캐시 항목이 의존할 수 있는 최대 무효화 타일 수 (넘으면 캐시하지 않음)
+MAX_INVALIDATION_TILES = 16
+
+# 캐시 항목 기본 유지 시간 (초, settings.FEED_TILE_CACHE_TIMEOUT으로 변경 가능)
+DEFAULT_TIMEOUT = 300
+
+KEY_PREFIX = 'feeds:tile'
+CACHE_OUTCOMES = ('HIT', 'MISS', 'BYPASS')
+
+
+def _version_key(x, y):
+    return f"{KEY_PREFIX}:v:{INVALIDATION_ZOOM}:{x}:{y}"
+
+
+def _stats_key(name):
+    return f"{KEY_PREFIX}:stats:{name}"
+
+
+def _incr(key, delta=1):
+    """ 만료되지 않는 정수 카운터 증가 """
+    cache.add(key, 0, None)
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        # add와 incr 사이에 키가 제거된 경우
+        cache.set(key, delta, None)
+        return delta
+
+
+def quantize_point(lng, lat):
+    """
+    좌표를 QUANTIZE_ZOOM 타일로 양자화
+    반환: (tile_x, tile_y, 타일 중심 경도, 타일 중심 위도, 타일 중심에서 가장 먼 모서리까지 측지선 거리(m))
+    """
+    tile_x, tile_y = lnglat_to_tile(lng, lat, QUANTIZE_ZOOM)
+    min_lng, min_lat, max_lng, max_lat = tile_bounds(QUANTIZE_ZOOM, tile_x, tile_y)
+    center_lng = (min_lng + max_lng) / 2
+    center_lat = (min_lat + max_lat) / 2
+    tile_radius_m = max(
+        geography_distance_m(center_lng, center_lat, corner_lng, corner_lat)
+        for corner_lng in (min_lng, max_lng) for corner_lat in (min_lat, max_lat)
+    )
+    return tile_x, tile_y, center_lng, center_lat, tile_radius_m
+
+
+def quantize_bbox(bbox):
+    """
+    지도 뷰포트 bbox를 한 변이 최대 2개 타일이 되는 줌 레벨의 타일 경계로 확장
+    반환: ((zoom, min_x, min_y, max_x, max_y), 확장된 bbox)
+    """
+    min_lng, min_lat, max_lng, max_lat = bbox
+    zoom = int(math.floor(math.log2(360.0 / (max_lng - min_lng))))
+    zoom = max(0, min(zoom, MAX_ZOOM))
+
+    min_x, min_y, max_x, max_y = tiles_covering(bbox, zoom)
+    west, _, _, north = tile_bounds(zoom, min_x, min_y)
+    _, south, east, _ = tile_bounds(zoom, max_x, max_y)
+    snapped = (west, south, east, north)
+    return (zoom, min_x, min_y, max_x, max_y), snapped
+
+
+def _region_version(region_bbox):
+    """
+    영역을 덮는 무효화 타일들의 현재 버전을 하나의 문자열로 요약
+    덮는 타일이 너무 많으면 None
+    """
+    min_x, min_y, max_x, max_y = tiles_covering(region_bbox, INVALIDATION_ZOOM)
+    if (max_x - min_x + 1) * (max_y - min_y + 1) > MAX_INVALIDATION_TILES:
+        return None
+
+    keys = [_version_key(x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)]
+    versions = cache.get_many(keys)
+    summary = ','.join(f"{key}={versions.get(key, 0)}" for key in keys)
+    return hashlib.md5(summary.encode()).hexdigest()
+
+
+def cached_region(kind, parts, region_bbox, loader):
+    """
+    region_bbox 영역에 의존하는 조회 결과를 캐시에서 가져오거나 loader()로 생성하여 저장
+    키에 영역을 덮는 무효화 타일 버전이 포함되므로, 해당 타일의 피드가 바뀌면 자동으로 새 키를 사용
+
+    반환: (결과, 'HIT' | 'MISS' | 'BYPASS')
+    영역이 너무 넓어 캐시하지 않는 경우 (None, 'BYPASS')
+    """
+    version = _region_version(region_bbox)
+    if version is None:
+        return None, 'BYPASS'
+
+    key = f"{KEY_PREFIX}:{kind}:{':'.join(str(part) for part in parts)}:{version}"
+    value = cache.get(key)
+    if value is not None:
+        return value, 'HIT'
+
+    value = loader()
+    cache.set(key, value, getattr(settings, 'FEED_TILE_CACHE_TIMEOUT', DEFAULT_TIMEOUT))
+    return value, 'MISS'
+
+
+def bump_tile_versions(points):
+    """
+    (경도, 위도) 좌표들이 속한 무효화 타일의 버전을 올려 관련 캐시 항목을 무효화
+    """
+    tiles = {lnglat_to_tile(lng, lat, INVALIDATION_ZOOM) for lng, lat in points}
+    for x, y in tiles:
+        _incr(_version_key(x, y))
+
+
+def record_cache_result(outcome, elapsed_ms):
+    """
+    캐시 결과별 요청 수와 누적 응답 시간(ms) 기록
+    """
+    _incr(_stats_key(outcome.lower()))
+    _incr(_stats_key(f"{outcome.lower()}_ms"), max(0, int(round(elapsed_ms))))
+    logger.debug(f"피드 타일 캐시 {outcome}: {elapsed_ms:.1f}ms")
+
+
+def stats_scope():
+    """
+    통계 카운터가 저장되는 범위
+    'process': 프로세스 메모리 캐시라 이 워커 프로세스의 요청만 집계됨
+    'shared': 여러 프로세스가 함께 쓰는 캐시(Redis, Memcached, DB 등)라 전체 요청이 집계됨
+    """
+    backend = caches[DEFAULT_CACHE_ALIAS]
+    return 'process' if isinstance(backend, (LocMemCache, DummyCache)) else 'shared'
+
+
+def get_cache_stats():
+    """
+    캐시 적중률과 결과별 평균 응답 시간
+    프로세스 메모리 캐시를 쓰는 경우 이 프로세스의 통계이므로 scope='process'와 pid를 함께 반환
+    """
+    names = [outcome.lower() for outcome in CACHE_OUTCOMES]
+    keys = [_stats_key(name) for name in names] + [_stats_key(f"{name}_ms") for name in names]
+    values = cache.get_many(keys)
+
+    stats = {}
+    for name in names:
+        count = values.get(_stats_key(name), 0)
+        total_ms = values.get(_stats_key(f"{name}_ms"), 0)
+        stats[name] = {
+            'count': count,
+            'avg_ms': round(total_ms / count, 1) if count else None
+        }
+
+    lookups = stats['hit']['count'] + stats['miss']['count']
+    stats['hit_ratio'] = round(stats['hit']['count'] / lookups, 4) if lookups else None
+    stats['scope'] = stats_scope()
+    if stats['scope'] == 'process':
+        stats['pid'] = os.getpid()
+    return stats
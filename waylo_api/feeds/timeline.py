@@ -0,0 +1,176 @@
+import logging
+from datetime import datetime
+import uuid
+from django.conf import settings
+from django.db.models import Q
+from friends.models import Friendship
+from .models import Feed, HighFanoutAuthor, TimelineEntry
+from .pagination import InvalidCursor, decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+# 친구 수가 이 값 이상인 작성자는 쓰기 시점에 타임라인으로 복사하지 않고 읽기 시점에 병합
+# (settings.FEED_TIMELINE_FANOUT_LIMIT으로 변경 가능)
+DEFAULT_FANOUT_LIMIT = 1000
+
+# 타임라인 일괄 생성 배치 크기
+BATCH_SIZE = 1000
+
+
+def fanout_limit():
+    return getattr(settings, 'FEED_TIMELINE_FANOUT_LIMIT', DEFAULT_FANOUT_LIMIT)
+
+
+def is_high_fanout(user_id):
+    return HighFanoutAuthor.objects.filter(user_id=user_id).exists()
+
+
+def _bulk_insert(entries):
+    """ 타임라인 항목 일괄 저장 (이미 있는 항목은 무시) """
+    batch = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= BATCH_SIZE:
+            TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def fan_out_feed(feed_id):
+    """
+    공개 피드를 작성자의 모든 친구 타임라인에 추가 (fan-out-on-write)
+    친구가 많은 작성자는 읽기 시점에 병합하므로 건너뜀
+    """
+    feed = Feed.objects.filter(id=feed_id, visibility='public').values('user_id', 'created_at').first()
+    if feed is None or is_high_fanout(feed['user_id']):
+        return
+
+    _bulk_insert(
+        TimelineEntry(owner_id=friend_id, feed_id=feed_id, author_id=feed['user_id'], created_at=feed['created_at'])
+        for friend_id in Friendship.friend_ids(feed['user_id'])
+    )
+
+
+def remove_feed(feed_id):
+    """
+    피드를 모든 타임라인에서 제거 (비공개 전환 시)
+    """
+    TimelineEntry.objects.filter(feed_id=feed_id).delete()
+
+
+def add_author_to_timeline(owner_id, author_id):
+    """
+    작성자의 기존 공개 피드를 owner의 타임라인에 추가 (새 친구 관계)
+    """
+    if is_high_fanout(author_id):
+        return
+
+    feeds = Feed.objects.filter(user_id=author_id, visibility='public').values_list('id', 'created_at')
+    _bulk_insert(
+        TimelineEntry(owner_id=owner_id, feed_id=feed_id, author_id=author_id, created_at=created_at)
+        for feed_id, created_at in feeds.iterator()
+    )
+
+
+def remove_author_from_timeline(owner_id, author_id):
+    """
+    작성자의 피드를 owner의 타임라인에서 제거 (친구 관계 삭제)
+    """
+    TimelineEntry.objects.filter(owner_id=owner_id, author_id=author_id).delete()
+
+
+def refresh_high_fanout(user_id):
+    """
+    친구 수가 기준을 넘은 작성자를 읽기 시점 병합 대상으로 전환하고
+    이미 복사된 타임라인 항목을 제거 (병합 시 중복 방지)
+    """
+    if Friendship.count_friends(user_id) < fanout_limit():
+        return False
+
+    _, created = HighFanoutAuthor.objects.get_or_create(user_id=user_id)
+    if created:
+        deleted, _ = TimelineEntry.objects.filter(author_id=user_id).delete()
+        logger.info(f"읽기 시점 병합 작성자로 전환: {user_id}, 타임라인 항목 {deleted}개 제거")
+    return True
+
+
+def rebuild_timeline(user_id):
+    """
+    사용자의 타임라인을 친구들의 공개 피드로 다시 생성
+    """
+    TimelineEntry.objects.filter(owner_id=user_id).delete()
+
+    hot_ids = set(HighFanoutAuthor.objects.values_list('user_id', flat=True))
+    author_ids = [friend_id for friend_id in Friendship.friend_ids(user_id) if friend_id not in hot_ids]
+    if not author_ids:
+        return 0
+
+    feeds = Feed.objects.filter(user_id__in=author_ids, visibility='public').values_list('id', 'user_id', 'created_at')
+    count = 0
+
+    def entries():
+        nonlocal count
+        for feed_id, author_id, created_at in feeds.iterator():
+            count += 1
+            yield TimelineEntry(owner_id=user_id, feed_id=feed_id, author_id=author_id, created_at=created_at)
+
+    _bulk_insert(entries())
+    return count
+
+
+def _keyset_filter(cursor, created_field, id_field):
+    """ (created_at, id) 내림차순 커서 이후 조건 """
+    try:
+        created_at, last_id = decode_cursor(cursor)
+        created_at = datetime.fromisoformat(created_at)
+        last_id = uuid.UUID(last_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    return Q(**{f'{created_field}__lt': created_at}) | Q(**{created_field: created_at, f'{id_field}__lt': last_id})
+
+
+def timeline_page(user, cursor=None, limit=10, offset=0):
+    """
+    친구 피드 타임라인 한 페이지 조회
+    타임라인 테이블의 (owner, created_at, feed) 인덱스 범위 조회 결과에
+    친구 중 읽기 시점 병합 대상 작성자의 최신 피드를 합쳐 (created_at, id) 내림차순으로 반환
+
+    반환: ([(created_at, feed_id), ...], next_cursor)
+    """
+    entries = TimelineEntry.objects.filter(owner=user).order_by('-created_at', '-feed_id')
+    if cursor:
+        entries = entries.filter(_keyset_filter(cursor, 'created_at', 'feed_id'))
+
+    hot_ids = Friendship.friend_ids_among(user.id, HighFanoutAuthor.objects.values_list('user_id', flat=True))
+
+    if not hot_ids:
+        rows = list(entries.values_list('created_at', 'feed_id')[offset:offset + limit + 1])
+    else:
+        pulled = Feed.objects.filter(user_id__in=hot_ids, visibility='public').order_by('-created_at', '-id')
+        if cursor:
+            pulled = pulled.filter(_keyset_filter(cursor, 'created_at', 'id'))
+
+        window = offset + limit + 1
+        rows = sorted(
+            set(entries.values_list('created_at', 'feed_id')[:window]) |
+            set(pulled.values_list('created_at', 'id')[:window]),
+            reverse=True
+        )[offset:window]
+
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    created_at, feed_id = rows[-1]
+    return rows, encode_cursor([created_at.isoformat(), str(feed_id)])
+
+
+def timeline_total(user):
+    """
+    친구 피드 타임라인 전체 개수
+    """
+    total = TimelineEntry.objects.filter(owner=user).count()
+    hot_ids = Friendship.friend_ids_among(user.id, HighFanoutAuthor.objects.values_list('user_id', flat=True))
+    if hot_ids:
+        total += Feed.objects.filter(user_id__in=hot_ids, visibility='public').count()
+    return total
@@ -2,6 +2,7 @@ from django.urls import path
 from .views import (
     feed_list, 
     feed_detail, 
+    feed_processing_status,
     create_feed, 
     update_feed,
     delete_feed,
@@ -17,13 +18,17 @@ from .views import (
     nearby_feeds,
     user_feeds,
     bookmarked_feeds,
-    friends_feeds  # 새로 추가된 import
+    friends_feeds,  # 새로 추가된 import
+    feed_clusters,
+    feed_cache_stats,
+    feed_tile
 )
 
 urlpatterns = [
     # 피드 기본 CRUD
     path('', feed_list, name='feed-list'),
     path('<uuid:feed_id>/', feed_detail, name='feed-detail'),
+    path('<uuid:feed_id>/status/', feed_processing_status, name='feed-processing-status'),
     path('create/', create_feed, name='create-feed'),
     path('<uuid:feed_id>/update/', update_feed, name='update-feed'),
     path('<uuid:feed_id>/delete/', delete_feed, name='delete-feed'),
@@ -46,4 +51,9 @@ urlpatterns = [
     path('user/<uuid:user_id>/', user_feeds, name='user-feeds'),
     path('bookmarked/', bookmarked_feeds, name='bookmarked-feeds'),
     path('friends/', friends_feeds, name='friends-feeds'),  # 새로 추가된 URL
+
+    # 지도
+    path('clusters/', feed_clusters, name='feed-clusters'),
+    path('cache/stats/', feed_cache_stats, name='feed-cache-stats'),
+    path('tiles/<int:z>/<int:x>/<int:y>.mvt', feed_tile, name='feed-tile'),
 ]
\ No newline at end of file
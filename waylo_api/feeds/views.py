@@ -1,65 +1,106 @@
-from PIL import Image, ImageOps, ExifTags
+import hashlib
 import logging
-import io
-import os
 import posixpath
+import time
 from decimal import Decimal
-from django.conf import settings
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
+from django.db import connection
+from django.http import HttpResponse
 from django.db.models import F, Q
 from django.utils import timezone
 from rest_framework.decorators import api_view, authentication_classes, permission_classes, parser_classes
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from users.authentication import CustomTokenAuthentication
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
-from users.models import User
+from users.models import User, UserStats
+from friends.models import Friendship
 from .models import Feed, FeedLike, FeedBookmark, FeedComment, CommentLike
 from .serializers import (
     FeedSerializer, 
     FeedCommentSerializer, 
     FeedLikeSerializer, 
     FeedBookmarkSerializer, 
-    CommentLikeSerializer
+    CommentLikeSerializer,
+    annotate_viewer_state
 )
-from django.contrib.gis.geos import Point
+from .images import delete_media_files, save_media_file, verify_image
+from .tasks import enqueue_feed_image_processing
+from .timeline import timeline_page, timeline_total
+from .geo import (
+    MAX_ZOOM,
+    MIN_ZOOM,
+    InvalidBoundingBox,
+    geography_distance_available,
+    geography_distance_m,
+    grid_size_for_zoom,
+    parse_bbox,
+    parse_zoom,
+    radius_bbox,
+    tile_bounds
+)
+from .tile_cache import cached_region, get_cache_stats, quantize_bbox, quantize_point, record_cache_result
+from .pagination import (
+    InvalidCursor,
+    parse_cursor_limit,
+    paginate_by_created_at,
+    paginate_by_distance,
+    paginate_distance_entries
+)
+from django.contrib.gis.geos import Point, Polygon
 from django.contrib.gis.db.models.functions import Distance
 from django.contrib.gis.measure import D
 from datetime import datetime
+from PIL import UnidentifiedImageError
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
-# EXIF 데이터에서 촬영 날짜 추출 유틸리티 함수
-def extract_photo_date_from_exif(image_file):
+# 지도 클러스터링 설정
+CLUSTER_CELLS_PER_TILE = 4  # 타일 하나를 4x4 격자로 묶음 (256px 타일 기준 약 64px 셀)
+CLUSTER_POINT_ZOOM = 16  # 이 줌 레벨 이상에서는 개별 피드 좌표를 반환
+CLUSTER_MAX_POINTS = 500  # 개별 좌표 모드 최대 반환 개수
+VIEWPORT_DEFAULT_LIMIT = 300  # 지도 뷰포트(bbox) 모드 기본 핀 개수
+VIEWPORT_MAX_LIMIT = 1000  # 지도 뷰포트(bbox) 모드 최대 핀 개수
+NEARBY_CACHE_MAX_CANDIDATES = 5000  # 주변 피드 타일 캐시에 저장할 최대 후보 수 (넘으면 캐시하지 않음)
+
+# 벡터 타일(MVT) 설정
+MVT_CONTENT_TYPE = 'application/vnd.mapbox-vector-tile'
+MVT_EXTENT = 4096  # 타일 내부 좌표 해상도
+MVT_BUFFER = 64  # 타일 경계 바깥 여유 영역 (타일 좌표 단위)
+MVT_MAX_FEATURES = 20000  # 타일 하나에 담을 최대 피드 수
+MVT_PUBLIC_MAX_AGE = 300  # 공개 타일 HTTP 캐시 시간 (초)
+MVT_PRIVATE_MAX_AGE = 60  # 친구 필터 타일 HTTP 캐시 시간 (초)
+
+# 피드에 연결된 미디어 파일 URL 목록 유틸리티 함수
+def feed_media_urls(feed):
     """
-    EXIF 데이터에서 촬영 날짜 추출
+    원본, 썸네일, 파생 이미지 URL 목록 반환
     """
-    try:
-        img = Image.open(image_file)
-        exif_data = img._getexif()
-        
-        if exif_data is not None:
-            for tag_id, value in exif_data.items():
-                tag_name = ExifTags.TAGS.get(tag_id, tag_id)
-                
-                # 날짜 정보 추출
-                if tag_name == 'DateTimeOriginal' or tag_name == 'DateTime':
-                    try:
-                        date_str = value
-                        photo_date = datetime.strptime(date_str, '%Y:%m:%d %H:%M:%S')
-                        return photo_date
-                    except Exception:
-                        pass
-        
-        img.close()
-    except Exception:
-        pass
-    
-    return None
+    return [feed.image_url, feed.thumbnail_url] + [
+        variant.get('url') for variant in (feed.image_variants or [])
+    ]
+
+
+# 커서 페이지네이션 응답 생성 유틸리티 함수
+def cursor_page_data(request, feeds, paginate):
+    """
+    cursor 파라미터가 있는 요청에 대한 keyset 페이지 응답 데이터 생성
+    전체 개수(total)는 include_total=true 일 때만 계산
+    """
+    limit = parse_cursor_limit(request)
+    page_feeds, next_cursor = paginate(feeds, request.query_params.get('cursor'), limit)
+
+    serializer = FeedSerializer(page_feeds, many=True, context={'request': request})
+    data = {
+        'feeds': serializer.data,
+        'next_cursor': next_cursor,
+        'limit': limit
+    }
+    if request.query_params.get('include_total', '').lower() in ('1', 'true'):
+        data['total'] = feeds.count()
+    return data
 
 
 # 피드 목록 조회 (공개 피드만)
@@ -70,6 +111,11 @@ def feed_list(request):
     """
     try:
         feeds = Feed.objects.filter(visibility='public').order_by('-created_at')
+        feeds = annotate_viewer_state(feeds, request.user)
+
+        # 커서 기반 페이지네이션
+        if 'cursor' in request.query_params:
+            return Response(cursor_page_data(request, feeds, paginate_by_created_at), status=status.HTTP_200_OK)
 
         # 페이지네이션 적용
         page = int(request.query_params.get('page', 1))
@@ -90,6 +136,8 @@ def feed_list(request):
             'limit': limit
         }, status=status.HTTP_200_OK)
     
+    except InvalidCursor:
+        return Response({'error': '잘못된 커서입니다.'}, status=status.HTTP_400_BAD_REQUEST)
     except Exception:
         return Response({'error': '서버 오류가 발생했습니다.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -124,6 +172,34 @@ def feed_detail(request, feed_id):
         return Response({'error': '서버 오류가 발생했습니다.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+# 피드 이미지 처리 상태 조회
+@api_view(['GET'])
+def feed_processing_status(request, feed_id):
+    """
+    피드 이미지 후처리(썸네일, 촬영 날짜) 진행 상태를 조회하는 API
+    """
+    try:
+        feed = Feed.objects.only(
+            'id', 'user_id', 'visibility', 'processing_status', 'thumbnail_url', 'photo_taken_at'
+        ).get(id=feed_id)
+
+        # 비공개 피드 권한 체크
+        if feed.visibility == 'private' and (not request.user.is_authenticated or feed.user_id != request.user.id):
+            return Response({'error': '이 피드를 볼 수 있는 권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
+
+        return Response({
+            'id': str(feed.id),
+            'processing_status': feed.processing_status,
+            'thumbnail_url': feed.thumbnail_url,
+            'photo_taken_at': feed.photo_taken_at
+        }, status=status.HTTP_200_OK)
+
+    except Feed.DoesNotExist:
+        return Response({'error': '피드를 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+    except Exception:
+        return Response({'error': '서버 오류가 발생했습니다.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 # 피드 생성
 @api_view(['POST'])
 @authentication_classes([CustomTokenAuthentication])
@@ -155,25 +231,21 @@ def create_feed(request):
 
         image_file = request.FILES['image']
         user_id = request.user.id
-        feed_folder = os.path.join(settings.MEDIA_ROOT, str(user_id), 'feeds')
-        os.makedirs(feed_folder, exist_ok=True)
 
         timestamp = timezone.now().strftime('%Y%m%d%H%M%S')
         file_name = f"{timestamp}_{image_file.name}"
-        file_path = os.path.join(feed_folder, file_name)
+
+        # 업로드는 한 번만 읽고 같은 바이트로 검증과 원본 저장 (이미지 처리 큐는 저장된 원본을 읽음)
+        image_data = image_file.read()
+
+        # 이미지가 아니거나 손상된 파일은 저장하기 전에 거절
+        verify_image(image_data)
 
         try:
-            image_data = image_file.read()
-            default_storage.save(file_path, ContentFile(image_data))
+            image_url = save_media_file(posixpath.join(str(user_id), 'feeds', file_name), image_data)
         except Exception:
             return Response({'error': '이미지 저장 실패'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-        image_url = posixpath.join(settings.MEDIA_URL, str(user_id), 'feeds', file_name).replace("\\", "/")
-
-        thumbnail_size = (200, 200)
-        thumbnail_name = f"thumb_{file_name}"
-        thumbnail_path = os.path.join(feed_folder, thumbnail_name)
-
         photo_taken_at = None
 
         if 'photo_taken_at' in request.data and request.data.get('photo_taken_at'):
@@ -182,43 +254,8 @@ def create_feed(request):
             except Exception:
                 pass
 
-        if photo_taken_at is None:
-            try:
-                with open(file_path, 'rb') as reopened_image:
-                    photo_taken_at = extract_photo_date_from_exif(reopened_image)
-            except Exception:
-                pass
-
-        try:
-            with Image.open(file_path) as img:
-                from PIL import ImageOps
-                img = ImageOps.exif_transpose(img)
-
-                width, height = img.size
-
-                if width > height:
-                    left = (width - height) // 2
-                    top = 0
-                    right = left + height
-                    bottom = height
-                else:
-                    top = (height - width) // 2
-                    left = 0
-                    bottom = top + width
-                    right = width
-
-                img_cropped = img.crop((left, top, right, bottom))
-                img_resized = img_cropped.resize(thumbnail_size, Image.LANCZOS)
-
-                thumb_io = io.BytesIO()
-                img_resized.save(thumb_io, format='JPEG', quality=85)
-                thumb_io.seek(0)
-
-                default_storage.save(thumbnail_path, ContentFile(thumb_io.getvalue()))
-        except Exception:
-            thumbnail_url = ""
-        else:
-            thumbnail_url = posixpath.join(settings.MEDIA_URL, str(user_id), 'feeds', thumbnail_name).replace("\\", "/")
+        # EXIF 추출과 썸네일 생성은 이미지 처리 큐에서 비동기로 수행
+        thumbnail_url = ""
 
         feed_data = {
             'user': request.user.id,
@@ -241,17 +278,21 @@ def create_feed(request):
         serializer = FeedSerializer(data=feed_data)
         if serializer.is_valid():
             try:
-                feed = serializer.save()
+                feed = serializer.save(processing_status='pending')
+                enqueue_feed_image_processing(
+                    feed.id,
+                    extract_photo_date=photo_taken_at is None,
+                    image_url=feed.image_url
+                )
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
             except Exception:
                 return Response({'error': '피드 저장 실패'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         else:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            if os.path.exists(thumbnail_path):
-                os.remove(thumbnail_path)
+            delete_media_files([image_url])
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    except UnidentifiedImageError:
+        return Response({'error': '올바른 이미지 파일이 아닙니다.'}, status=status.HTTP_400_BAD_REQUEST)
     except Exception:
         return Response({'error': '서버 오류가 발생했습니다.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -304,37 +345,36 @@ def update_feed(request, feed_id):
         if 'image' in request.FILES:
             image_file = request.FILES['image']
             user_id = request.user.id
-            feed_folder = os.path.join(settings.MEDIA_ROOT, str(user_id), 'feeds')
-            os.makedirs(feed_folder, exist_ok=True)
 
-            # 이전 이미지 삭제
-            old_image_path = os.path.join(settings.MEDIA_ROOT, feed.image_url.lstrip('/media/'))
-            if os.path.exists(old_image_path):
-                os.remove(old_image_path)
+            # 업로드는 한 번만 읽고 같은 바이트로 검증과 원본 저장
+            # 이미지가 아니거나 손상된 파일은 이전 이미지를 지우기 전에 거절
+            image_data = image_file.read()
+            verify_image(image_data)
+
+            # 이전 이미지, 썸네일 및 파생 이미지 삭제
+            delete_media_files(feed_media_urls(feed))
 
             # 새 이미지 저장
             timestamp = timezone.now().strftime('%Y%m%d%H%M%S')
             file_name = f"{timestamp}_{image_file.name}"
-            file_path = os.path.join(feed_folder, file_name)
-            default_storage.save(file_path, ContentFile(image_file.read()))
-
-            # 이미지 URL 업데이트
-            feed_data['image_url'] = posixpath.join(settings.MEDIA_URL, str(user_id), 'feeds', file_name).replace("\\", "/")
-
-            # 새 이미지에서 EXIF 촬영 날짜 추출
-            if 'photo_taken_at' not in feed_data:
-                try:
-                    with open(file_path, 'rb') as reopened_image:
-                        photo_taken_at = extract_photo_date_from_exif(reopened_image)
-                        if photo_taken_at:
-                            feed_data['photo_taken_at'] = photo_taken_at
-                except Exception:
-                    pass
+
+            # 이미지 URL 업데이트 (썸네일, 파생 이미지 및 EXIF 촬영 날짜는 이미지 처리 큐에서 갱신)
+            feed_data['image_url'] = save_media_file(posixpath.join(str(user_id), 'feeds', file_name), image_data)
+            feed_data['thumbnail_url'] = ""
+            feed.image_variants = []
 
         # 피드 업데이트
         serializer = FeedSerializer(feed, data=feed_data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            if 'image_url' in feed_data:
+                serializer.save(processing_status='pending')
+                enqueue_feed_image_processing(
+                    feed.id,
+                    extract_photo_date='photo_taken_at' not in feed_data,
+                    image_url=feed_data['image_url']
+                )
+            else:
+                serializer.save()
             return Response(serializer.data, status=status.HTTP_200_OK)
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -342,6 +382,9 @@ def update_feed(request, feed_id):
     except Feed.DoesNotExist:
         return Response({'error': '피드를 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
 
+    except UnidentifiedImageError:
+        return Response({'error': '올바른 이미지 파일이 아닙니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
     except Exception as e:
         import traceback
         print(f"피드 업데이트 중 상세 오류: {e}")
@@ -364,10 +407,8 @@ def delete_feed(request, feed_id):
         if feed.user != request.user:
             return Response({'error': '피드를 삭제할 권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
 
-        # 이미지 파일 삭제
-        image_path = os.path.join(settings.MEDIA_ROOT, feed.image_url.lstrip('/media/'))
-        if os.path.exists(image_path):
-            os.remove(image_path)
+        # 이미지, 썸네일 및 파생 이미지 파일 삭제
+        delete_media_files(feed_media_urls(feed))
 
         # 피드 삭제
         feed.delete()
@@ -400,6 +441,9 @@ def like_feed(request, feed_id):
             feed.save(update_fields=['likes_count'])
             feed.refresh_from_db()
 
+            # 작성자의 받은 좋아요 수 갱신
+            UserStats.increment(feed.user_id, {'received_likes_count': 1})
+
             return Response({
                 'message': '피드에 좋아요를 표시했습니다.',
                 'likes_count': feed.likes_count
@@ -437,6 +481,9 @@ def unlike_feed(request, feed_id):
                 feed.save(update_fields=['likes_count'])
                 feed.refresh_from_db()
 
+            # 작성자의 받은 좋아요 수 갱신
+            UserStats.increment(feed.user_id, {'received_likes_count': -1})
+
             return Response({
                 'message': '피드 좋아요를 취소했습니다.',
                 'likes_count': feed.likes_count
@@ -728,8 +775,33 @@ def unlike_comment(request, comment_id):
 def nearby_feeds(request):
     """
     사용자의 현재 위치를 기준으로 반경 내 공개된 피드를 조회하는 API
+    bbox=minx,miny,maxx,maxy 파라미터가 있으면 지도 뷰포트 내 핀 목록(id, 좌표, 썸네일)만 반환
+    조회 결과는 위치 타일 단위로 캐시되며, 캐시 결과는 X-Cache 헤더(HIT/MISS/BYPASS)로 확인
     """
     try:
+        started = time.perf_counter()
+
+        # 지도 뷰포트 모드 (사각형 영역, 거리 계산/정렬 없음)
+        if 'bbox' in request.query_params:
+            try:
+                bbox = parse_bbox(request.query_params.get('bbox'))
+            except InvalidBoundingBox:
+                return Response({'error': 'bbox(minx,miny,maxx,maxy) 파라미터가 올바르지 않습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+            try:
+                limit = int(request.query_params.get('limit', VIEWPORT_DEFAULT_LIMIT))
+            except ValueError:
+                limit = VIEWPORT_DEFAULT_LIMIT
+            limit = max(1, min(limit, VIEWPORT_MAX_LIMIT))
+
+            pins, truncated, outcome = cached_viewport_pins(bbox, limit)
+            response = Response({
+                'feeds': pins,
+                'limit': limit,
+                'truncated': truncated
+            }, status=status.HTTP_200_OK)
+            return with_cache_result(response, outcome, started)
+
         latitude = request.query_params.get('latitude')
         longitude = request.query_params.get('longitude')
 
@@ -738,14 +810,56 @@ def nearby_feeds(request):
 
         radius = float(request.query_params.get('radius', 10.0))
 
+        # 타일 캐시에서 거리순 후보 목록 조회
+        entries, outcome = cached_nearby_entries(float(longitude), float(latitude), radius * 1000)
+        if entries is not None:
+            if 'cursor' in request.query_params:
+                limit = parse_cursor_limit(request)
+                page_entries, next_cursor = paginate_distance_entries(entries, request.query_params.get('cursor'), limit)
+                data = {
+                    'feeds': FeedSerializer(hydrate_distance_entries(page_entries, request.user), many=True, context={'request': request}).data,
+                    'next_cursor': next_cursor,
+                    'limit': limit
+                }
+                if request.query_params.get('include_total', '').lower() in ('1', 'true'):
+                    data['total'] = len(entries)
+                return with_cache_result(Response(data, status=status.HTTP_200_OK), outcome, started)
+
+            page = int(request.query_params.get('page', 1))
+            limit = int(request.query_params.get('limit', 10))
+            start = (page - 1) * limit
+            end = page * limit
+
+            serializer = FeedSerializer(
+                hydrate_distance_entries(entries[start:end], request.user),
+                many=True,
+                context={'request': request}
+            )
+            response = Response({
+                'feeds': serializer.data,
+                'total': len(entries),
+                'page': page,
+                'limit': limit
+            }, status=status.HTTP_200_OK)
+            return with_cache_result(response, outcome, started)
+
+        # 공간 인덱스(ST_DWithin)로 후보를 추리고 geography 거리(Distance)로 반경/정렬/커서를 계산
         user_location = Point(float(longitude), float(latitude))
 
         feeds = Feed.objects.filter(
             visibility='public',
-            location__distance_lte=(user_location, D(km=radius))
+            location__dwithin=(user_location, D(km=radius))
         ).annotate(
             distance=Distance('location', user_location)
+        ).filter(
+            distance__lte=D(km=radius)
         ).order_by('distance')
+        feeds = annotate_viewer_state(feeds, request.user)
+
+        # 커서 기반 페이지네이션 (거리순)
+        if 'cursor' in request.query_params:
+            response = Response(cursor_page_data(request, feeds, paginate_by_distance), status=status.HTTP_200_OK)
+            return with_cache_result(response, outcome, started)
 
         # 페이지네이션 적용
         page = int(request.query_params.get('page', 1))
@@ -759,17 +873,127 @@ def nearby_feeds(request):
             context={'request': request}
         )
 
-        return Response({
+        response = Response({
             'feeds': serializer.data,
             'total': feeds.count(),
             'page': page,
             'limit': limit
         }, status=status.HTTP_200_OK)
+        return with_cache_result(response, outcome, started)
 
+    except InvalidCursor:
+        return Response({'error': '잘못된 커서입니다.'}, status=status.HTTP_400_BAD_REQUEST)
     except Exception:
         return Response({'error': '서버 오류가 발생했습니다.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def with_cache_result(response, outcome, started):
+    """
+    응답에 타일 캐시 결과 헤더를 붙이고 결과별 요청 수/응답 시간 기록
+    """
+    record_cache_result(outcome, (time.perf_counter() - started) * 1000)
+    response['X-Cache'] = outcome
+    return response
+
+
+def cached_nearby_entries(longitude, latitude, radius_m):
+    """
+    반경 내 공개 피드의 (거리(m), id) 목록을 거리순으로 반환
+    조회 좌표를 타일 중심으로 양자화하고, 타일 안 어느 위치에서도 결과가 포함되도록 반경을 넓힌
+    후보 목록(id, 위도, 경도)을 캐시한 뒤 실제 조회 좌표 기준으로 거리를 다시 계산
+    거리는 캐시를 거치지 않는 조회의 geography 거리(Distance)와 같은 측지선 거리(geography_distance_m)이므로
+    반경/정렬/커서 값이 두 경로에서 같음
+
+    후보가 너무 많거나 영역이 넓어 캐시할 수 없거나, 측지선 거리를 계산할 수 없으면 (None, 'BYPASS')
+    """
+    if not geography_distance_available():
+        return None, 'BYPASS'
+
+    tile_x, tile_y, center_lng, center_lat, tile_radius_m = quantize_point(longitude, latitude)
+    search_m = radius_m + tile_radius_m
+
+    def load():
+        rows = list(
+            Feed.objects.filter(
+                visibility='public',
+                location__dwithin=(Point(center_lng, center_lat, srid=4326), D(m=search_m))
+            ).values_list('id', 'latitude', 'longitude')[:NEARBY_CACHE_MAX_CANDIDATES + 1]
+        )
+        if len(rows) > NEARBY_CACHE_MAX_CANDIDATES:
+            return {'candidates': None}
+        return {'candidates': [(str(feed_id), float(lat), float(lng)) for feed_id, lat, lng in rows]}
+
+    cached, outcome = cached_region(
+        'nearby', [tile_x, tile_y, int(round(radius_m))],
+        radius_bbox(center_lng, center_lat, search_m), load
+    )
+    if cached is None or cached['candidates'] is None:
+        return None, 'BYPASS'
+
+    entries = []
+    for feed_id, lat, lng in cached['candidates']:
+        distance_m = geography_distance_m(lng, lat, longitude, latitude)
+        if distance_m <= radius_m:
+            entries.append((distance_m, feed_id))
+    entries.sort()
+    return entries, outcome
+
+
+def hydrate_distance_entries(entries, user):
+    """
+    (거리(m), id) 목록 순서대로 피드를 조회하고 distance 값을 붙여 반환
+    """
+    feeds = annotate_viewer_state(
+        Feed.objects.filter(id__in=[feed_id for _, feed_id in entries], visibility='public'),
+        user
+    )
+    feeds_by_id = {str(feed.id): feed for feed in feeds}
+
+    result = []
+    for distance_m, feed_id in entries:
+        feed = feeds_by_id.get(feed_id)
+        if feed is not None:
+            feed.distance = D(m=distance_m)
+            result.append(feed)
+    return result
+
+
+def cached_viewport_pins(bbox, limit):
+    """
+    지도 뷰포트 핀 목록 조회
+    bbox를 타일 경계로 확장한 영역의 핀 목록을 캐시하고, 요청한 bbox로 다시 걸러서 반환
+    반환: (핀 목록, 잘림 여부, 캐시 결과)
+    """
+    parts, snapped = quantize_bbox(bbox)
+    cached, outcome = cached_region(
+        'pins', parts, snapped,
+        lambda: fetch_feed_points(snapped, VIEWPORT_MAX_LIMIT)
+    )
+    if cached is None:
+        pins, truncated = fetch_feed_points(bbox, limit)
+        return pins, truncated, outcome
+
+    snapped_pins, snapped_truncated = cached
+    min_lng, min_lat, max_lng, max_lat = bbox
+    pins = [
+        pin for pin in snapped_pins
+        if min_lng <= pin['longitude'] <= max_lng and min_lat <= pin['latitude'] <= max_lat
+    ]
+    return pins[:limit], snapped_truncated or len(pins) > limit, outcome
+
+
+# 타일 캐시 통계 (관리자)
+@api_view(['GET'])
+@authentication_classes([CustomTokenAuthentication])
+@permission_classes([IsAdminUser])
+def feed_cache_stats(request):
+    """
+    주변 피드/지도 핀 타일 캐시의 적중률과 결과별 평균 응답 시간을 조회하는 API
+    기본 캐시가 프로세스 메모리 캐시이면 요청을 처리한 워커 프로세스의 통계 (scope='process', pid)
+    """
+    return Response(get_cache_stats(), status=status.HTTP_200_OK)
+
+
 # 특정 사용자의 피드 목록
 @api_view(['GET'])
 def user_feeds(request, user_id):
@@ -788,6 +1012,14 @@ def user_feeds(request, user_id):
             feeds = Feed.objects.filter(user=user).order_by('-created_at')
         else:
             feeds = Feed.objects.filter(user=user, visibility='public').order_by('-created_at')
+        feeds = annotate_viewer_state(feeds, request.user)
+
+        # 커서 기반 페이지네이션
+        if 'cursor' in request.query_params:
+            data = cursor_page_data(request, feeds, paginate_by_created_at)
+            data['username'] = user.username
+            data['profile_image'] = user.profile_image
+            return Response(data, status=status.HTTP_200_OK)
 
         # 페이지네이션 적용
         page = int(request.query_params.get('page', 1))
@@ -813,6 +1045,9 @@ def user_feeds(request, user_id):
     except User.DoesNotExist:
         return Response({'error': '사용자를 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
 
+    except InvalidCursor:
+        return Response({'error': '잘못된 커서입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
     except Exception:
         return Response({'error': '서버 오류가 발생했습니다.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -835,6 +1070,11 @@ def bookmarked_feeds(request):
         feeds = Feed.objects.filter(
             id__in=bookmarked_feed_ids
         ).order_by('-created_at')
+        feeds = annotate_viewer_state(feeds, request.user)
+
+        # 커서 기반 페이지네이션
+        if 'cursor' in request.query_params:
+            return Response(cursor_page_data(request, feeds, paginate_by_created_at), status=status.HTTP_200_OK)
 
         # 페이지네이션 적용
         page = int(request.query_params.get('page', 1))
@@ -855,6 +1095,8 @@ def bookmarked_feeds(request):
             'limit': limit
         }, status=status.HTTP_200_OK)
 
+    except InvalidCursor:
+        return Response({'error': '잘못된 커서입니다.'}, status=status.HTTP_400_BAD_REQUEST)
     except Exception:
         return Response({'error': '서버 오류가 발생했습니다.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
@@ -865,61 +1107,226 @@ def bookmarked_feeds(request):
 def friends_feeds(request):
     """
     현재 사용자의 친구들이 올린 피드 목록을 조회하는 API
+    친구 피드 타임라인 테이블의 (owner, created_at) 인덱스 범위 조회로 페이지를 구성
     """
     try:
-        from friends.models import Friendship
-        from django.db.models import Q
-        
-        current_user = request.user
-        
-        # 현재 사용자의 친구들 찾기
-        friendships = Friendship.objects.filter(
-            Q(user1=current_user) | Q(user2=current_user)
-        )
-        
-        # 친구 ID 목록 추출
-        friend_ids = []
-        for friendship in friendships:
-            if friendship.user1.id == current_user.id:
-                friend_ids.append(friendship.user2.id)
-            else:
-                friend_ids.append(friendship.user1.id)
-        
-        # 친구가 없는 경우
-        if not friend_ids:
-            return Response({
-                'feeds': [],
-                'total': 0,
-                'page': 1,
-                'limit': 10
-            }, status=status.HTTP_200_OK)
-        
-        # 친구들의 공개 피드만 조회
-        feeds = Feed.objects.filter(
-            user__id__in=friend_ids,
-            visibility='public'
-        ).order_by('-created_at')
+        # 커서 기반 페이지네이션
+        if 'cursor' in request.query_params:
+            limit = parse_cursor_limit(request)
+            rows, next_cursor = timeline_page(request.user, cursor=request.query_params.get('cursor'), limit=limit)
+            data = {
+                'feeds': FeedSerializer(hydrate_timeline_rows(rows, request.user), many=True, context={'request': request}).data,
+                'next_cursor': next_cursor,
+                'limit': limit
+            }
+            if request.query_params.get('include_total', '').lower() in ('1', 'true'):
+                data['total'] = timeline_total(request.user)
+            return Response(data, status=status.HTTP_200_OK)
         
         # 페이지네이션 적용
         page = int(request.query_params.get('page', 1))
         limit = int(request.query_params.get('limit', 10))
         start = (page - 1) * limit
-        end = page * limit
+
+        rows, _ = timeline_page(request.user, limit=limit, offset=start)
         
         serializer = FeedSerializer(
-            feeds[start:end], 
+            hydrate_timeline_rows(rows, request.user), 
             many=True, 
             context={'request': request}
         )
         
         return Response({
             'feeds': serializer.data,
-            'total': feeds.count(),
+            'total': timeline_total(request.user),
             'page': page,
             'limit': limit
         }, status=status.HTTP_200_OK)
         
+    except InvalidCursor:
+        return Response({'error': '잘못된 커서입니다.'}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         logger.error(f"친구 피드 조회 중 오류: {e}")
         return Response({'error': '서버 오류가 발생했습니다.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+def hydrate_timeline_rows(rows, user):
+    """
+    타임라인 (created_at, feed_id) 목록 순서대로 피드 조회
+    """
+    feeds = annotate_viewer_state(
+        Feed.objects.filter(id__in=[feed_id for _, feed_id in rows], visibility='public'),
+        user
+    )
+    feeds_by_id = {feed.id: feed for feed in feeds}
+    return [feeds_by_id[feed_id] for _, feed_id in rows if feed_id in feeds_by_id]
+
+
+# 지도 클러스터 조회
+@api_view(['GET'])
+def feed_clusters(request):
+    """
+    지도 영역(bbox)과 줌 레벨에 맞춰 공개 피드를 격자 단위 클러스터로 집계하는 API
+    높은 줌 레벨에서는 개별 피드 좌표를 반환
+    """
+    try:
+        bbox = parse_bbox(request.query_params.get('bbox'))
+        zoom = parse_zoom(request.query_params.get('zoom'))
+    except (InvalidBoundingBox, ValueError):
+        return Response(
+            {'error': 'bbox(minx,miny,maxx,maxy)와 zoom 파라미터가 올바르지 않습니다.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        if zoom >= CLUSTER_POINT_ZOOM:
+            return Response({
+                'zoom': zoom,
+                'clusters': [],
+                'points': fetch_feed_points(bbox, CLUSTER_MAX_POINTS)[0]
+            }, status=status.HTTP_200_OK)
+
+        return Response({
+            'zoom': zoom,
+            'clusters': fetch_feed_clusters(bbox, grid_size_for_zoom(zoom, CLUSTER_CELLS_PER_TILE)),
+            'points': []
+        }, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        logger.error(f"피드 클러스터 조회 중 오류: {e}")
+        return Response({'error': '서버 오류가 발생했습니다.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def fetch_feed_clusters(bbox, grid_size):
+    """
+    PostGIS ST_SnapToGrid로 bbox 내 공개 피드를 격자 셀 단위로 묶어
+    셀별 개수, 중심 좌표, 최신 피드(대표 썸네일)를 반환
+    """
+    sql = """
+        SELECT
+            COUNT(*) AS feed_count,
+            ST_Y(ST_Centroid(ST_Collect(f.location::geometry))) AS latitude,
+            ST_X(ST_Centroid(ST_Collect(f.location::geometry))) AS longitude,
+            (ARRAY_AGG(f.id::text ORDER BY f.created_at DESC))[1] AS feed_id,
+            (ARRAY_AGG(f.thumbnail_url ORDER BY f.created_at DESC))[1] AS thumbnail_url
+        FROM feeds f
+        WHERE f.visibility = 'public'
+          AND f.location && ST_MakeEnvelope(%s, %s, %s, %s, 4326)::geography
+        GROUP BY ST_SnapToGrid(f.location::geometry, %s)
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*bbox, grid_size])
+        rows = cursor.fetchall()
+
+    return [{
+        'count': feed_count,
+        'latitude': latitude,
+        'longitude': longitude,
+        'feed_id': feed_id,
+        'thumbnail_url': thumbnail_url
+    } for feed_count, latitude, longitude, feed_id, thumbnail_url in rows]
+
+
+def fetch_feed_points(bbox, limit):
+    """
+    bbox 내 공개 피드의 지도 핀 목록(id, 좌표, 썸네일) 반환
+    location && envelope(GiST 인덱스) 필터만 사용하고 거리 계산/정렬은 하지 않음
+    limit + 1개를 조회하여 잘린 결과인지 함께 반환
+    """
+    viewport = Polygon.from_bbox(bbox)
+    viewport.srid = 4326
+
+    rows = list(
+        Feed.objects.filter(
+            visibility='public',
+            location__bboverlaps=viewport
+        ).values_list('id', 'latitude', 'longitude', 'thumbnail_url')[:limit + 1]
+    )
+    truncated = len(rows) > limit
+
+    return [{
+        'id': str(feed_id),
+        'latitude': float(latitude),
+        'longitude': float(longitude),
+        'thumbnail_url': thumbnail_url
+    } for feed_id, latitude, longitude, thumbnail_url in rows[:limit]], truncated
+
+
+# 지도 벡터 타일 (MVT)
+@api_view(['GET'])
+def feed_tile(request, z, x, y):
+    """
+    피드 위치를 Mapbox Vector Tile(feeds 레이어)로 반환하는 API
+    기본은 공개 피드, friends=1이면 로그인한 사용자의 친구들이 올린 공개 피드만 포함
+    공개 타일은 위치 타일 캐시와 HTTP 캐시(Cache-Control, ETag)를 함께 사용
+    """
+    if not (MIN_ZOOM <= z <= MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        return Response({'error': '잘못된 타일 좌표입니다.'}, status=status.HTTP_404_NOT_FOUND)
+
+    friends_only = request.query_params.get('friends', '').lower() in ('1', 'true')
+    if friends_only and not request.user.is_authenticated:
+        return Response({'error': '로그인이 필요합니다.'}, status=status.HTTP_401_UNAUTHORIZED)
+
+    try:
+        started = time.perf_counter()
+
+        if friends_only:
+            friend_ids = [str(friend_id) for friend_id in Friendship.friend_ids(request.user)]
+            tile = render_feed_tile(z, x, y, friend_ids) if friend_ids else b''
+            outcome = 'BYPASS'
+            cache_control = f'private, max-age={MVT_PRIVATE_MAX_AGE}'
+        else:
+            tile, outcome = cached_region('mvt', [z, x, y], tile_bounds(z, x, y), lambda: render_feed_tile(z, x, y))
+            if tile is None:
+                tile = render_feed_tile(z, x, y)
+            cache_control = f'public, max-age={MVT_PUBLIC_MAX_AGE}'
+
+        etag = '"%s"' % hashlib.md5(tile).hexdigest()
+        if request.headers.get('If-None-Match') == etag:
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = HttpResponse(tile, content_type=MVT_CONTENT_TYPE)
+        response['Cache-Control'] = cache_control
+        response['ETag'] = etag
+        return with_cache_result(response, outcome, started)
+
+    except Exception as e:
+        logger.error(f"피드 벡터 타일 생성 중 오류: {z}/{x}/{y}, {e}")
+        return Response({'error': '서버 오류가 발생했습니다.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def render_feed_tile(z, x, y, user_ids=None):
+    """
+    PostGIS ST_AsMVT로 z/x/y 타일 범위의 공개 피드를 MVT 바이트로 인코딩
+    user_ids가 있으면 해당 사용자들의 피드만 포함
+    """
+    user_filter = 'AND f.user_id = ANY(%s::uuid[])' if user_ids is not None else ''
+    sql = f"""
+        WITH bounds AS (
+            SELECT ST_TileEnvelope(%s, %s, %s) AS geom
+        )
+        SELECT ST_AsMVT(tile, 'feeds', {MVT_EXTENT}, 'geom')
+        FROM (
+            SELECT
+                f.id::text AS id,
+                f.thumbnail_url,
+                EXTRACT(EPOCH FROM f.created_at)::bigint AS created_at,
+                ST_AsMVTGeom(ST_Transform(f.location::geometry, 3857), bounds.geom, {MVT_EXTENT}, {MVT_BUFFER}, true) AS geom
+            FROM feeds f, bounds
+            WHERE f.visibility = 'public'
+              AND f.location && ST_Transform(bounds.geom, 4326)::geography
+              {user_filter}
+            LIMIT %s
+        ) AS tile
+    """
+    params = [z, x, y]
+    if user_ids is not None:
+        params.append(user_ids)
+    params.append(MVT_MAX_FEATURES)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+
+    return bytes(row[0]) if row and row[0] else b''
+
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from friends.models import FriendEdge, Friendship
+
+
+class Command(BaseCommand):
+    help = '인접 목록(FriendEdge)이 없는 친구 관계의 양방향 항목을 다시 생성합니다. (기존 데이터는 friends 0006 마이그레이션에서 생성)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='한 번에 저장할 친구 관계 수')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        friendships = Friendship.objects.filter(edges__isnull=True).values_list('id', 'user1_id', 'user2_id', 'created_at')
+
+        batch = []
+        total = 0
+        for friendship_id, user1_id, user2_id, created_at in friendships.iterator():
+            batch.append(FriendEdge(user_id=user1_id, friend_id=user2_id, friendship_id=friendship_id, created_at=created_at))
+            batch.append(FriendEdge(user_id=user2_id, friend_id=user1_id, friendship_id=friendship_id, created_at=created_at))
+            if len(batch) >= batch_size * 2:
+                FriendEdge.objects.bulk_create(batch, ignore_conflicts=True)
+                total += len(batch) // 2
+                batch = []
+
+        if batch:
+            FriendEdge.objects.bulk_create(batch, ignore_conflicts=True)
+            total += len(batch) // 2
+
+        self.stdout.write(self.style.SUCCESS(f"친구 관계 {total}개의 인접 목록 생성 완료"))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from friends.models import FriendEdge
+from friends.suggestions import SUGGESTIONS_PER_USER, compute_suggestions
+
+
+class Command(BaseCommand):
+    help = '친구의 친구를 함께 아는 친구 수 순으로 계산하여 사용자별 추천 목록을 다시 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', default=[], help='특정 사용자 ID만 계산 (여러 번 지정 가능)')
+        parser.add_argument('--limit', type=int, default=SUGGESTIONS_PER_USER, help='사용자별 최대 추천 수')
+
+    def handle(self, *args, **options):
+        if options['user']:
+            user_ids = options['user']
+        else:
+            user_ids = FriendEdge.objects.order_by('user_id').values_list('user_id', flat=True).distinct().iterator()
+
+        users = 0
+        suggestions = 0
+        for user_id in user_ids:
+            suggestions += compute_suggestions(user_id, options['limit'])
+            users += 1
+
+        self.stdout.write(self.style.SUCCESS(f"사용자 {users}명, 추천 {suggestions}개 생성 완료"))
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-17 14:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('friends', '0003_friendedge'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='friendedge',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='friend_edges_user_created_idx'),
+        ),
+    ]
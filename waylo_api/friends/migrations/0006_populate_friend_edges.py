@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-17 20:10
+
+from django.db import migrations
+
+
+def create_friend_edges(apps, schema_editor):
+    """
+    기존 친구 관계마다 양방향 인접 목록(FriendEdge) 두 행을 생성
+    (친구 목록/친구 여부 조회가 FriendEdge만 사용하므로 마이그레이션 직후부터 기존 친구가 보이도록)
+    """
+    Friendship = apps.get_model('friends', 'Friendship')
+    FriendEdge = apps.get_model('friends', 'FriendEdge')
+
+    friendships = Friendship.objects.filter(edges__isnull=True).values_list('id', 'user1_id', 'user2_id', 'created_at')
+
+    batch = []
+    for friendship_id, user1_id, user2_id, created_at in friendships.iterator():
+        batch.append(FriendEdge(user_id=user1_id, friend_id=user2_id, friendship_id=friendship_id, created_at=created_at))
+        batch.append(FriendEdge(user_id=user2_id, friend_id=user1_id, friendship_id=friendship_id, created_at=created_at))
+        if len(batch) >= 2000:
+            FriendEdge.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        FriendEdge.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('friends', '0005_friendsuggestion'),
+    ]
+
+    operations = [
+        # 역방향은 0003에서 테이블이 삭제되므로 아무 작업도 하지 않음
+        migrations.RunPython(create_friend_edges, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,7 @@
 import uuid
 import logging
 from django.db import models, transaction
-from django.db.models import Q
-from users.models import User
+from users.models import User, UserStats
 
 logger = logging.getLogger(__name__)
 
@@ -88,6 +87,19 @@ class Friendship(models.Model):
             models.UniqueConstraint(fields=['user1', 'user2'], name='unique_friendship')
         ]
 
+    def save(self, *args, **kwargs):
+        """ 새 친구 관계는 양방향 FriendEdge, 친구 수 통계와 함께 같은 트랜잭션에서 저장 """
+        creating = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if creating:
+                FriendEdge.objects.bulk_create([
+                    FriendEdge(user_id=self.user1_id, friend_id=self.user2_id, friendship=self, created_at=self.created_at),
+                    FriendEdge(user_id=self.user2_id, friend_id=self.user1_id, friendship=self, created_at=self.created_at),
+                ], ignore_conflicts=True)
+                UserStats.increment(self.user1_id, {'friends_count': 1})
+                UserStats.increment(self.user2_id, {'friends_count': 1})
+
     @classmethod
     def create_friendship(cls, from_user, to_user):
         """
@@ -99,19 +111,96 @@ class Friendship(models.Model):
             logger.warning("자기 자신과 친구 관계를 생성할 수 없습니다.")
             return None, False
 
-        # 이미 친구 관계가 있는지 확인
-        if cls.objects.filter(Q(user1=from_user, user2=to_user) | Q(user1=to_user, user2=from_user)).exists():
-            logger.info(f"이미 존재하는 친구 관계: {from_user} <-> {to_user}")
-            return None, False
+        with transaction.atomic():
+            # 이미 친구 관계가 있는지 확인
+            if cls.are_friends(from_user, to_user):
+                logger.info(f"이미 존재하는 친구 관계: {from_user} <-> {to_user}")
+                return None, False
+
+            # 새로운 친구 관계 생성 (FriendEdge 포함)
+            new_friendship = cls.objects.create(user1=from_user, user2=to_user)
 
-        # 새로운 친구 관계 생성
-        new_friendship = cls.objects.create(user1=from_user, user2=to_user)
         logger.info(f"새로운 친구 관계 생성됨: {from_user} <-> {to_user}")
         return new_friendship, True
 
+    @classmethod
+    def between(cls, user, other):
+        """
+        두 사용자 간 친구 관계 (없으면 None)
+        """
+        edge = FriendEdge.objects.filter(user=user, friend=other).select_related('friendship').first()
+        return edge.friendship if edge else None
+
+    @classmethod
+    def are_friends(cls, user, other):
+        """
+        두 사용자가 친구인지 확인 (user, friend) 인덱스 조회
+        """
+        return FriendEdge.objects.filter(user=user, friend=other).exists()
+
     @classmethod
     def count_friends(cls, user):
         """
         특정 사용자의 친구 수를 계산
         """
-        return cls.objects.filter(Q(user1=user) | Q(user2=user)).count()
+        return FriendEdge.objects.filter(user=user).count()
+
+    @classmethod
+    def friend_ids(cls, user):
+        """
+        특정 사용자의 친구 ID 목록 (ID만 조회하여 유저 객체 지연 로딩 방지)
+        """
+        return list(FriendEdge.objects.filter(user=user).values_list('friend_id', flat=True))
+
+    @classmethod
+    def friend_ids_among(cls, user, candidate_ids):
+        """
+        candidate_ids 중 특정 사용자의 친구인 ID 목록
+        """
+        return list(
+            FriendEdge.objects.filter(user=user, friend__in=candidate_ids).values_list('friend_id', flat=True)
+        )
+
+
+class FriendEdge(models.Model):
+    """
+    친구 관계의 방향별 인접 목록 (친구 관계 하나당 (A, B), (B, A) 두 행)
+    "X의 친구 목록", "X와 Y가 친구인지"를 (user, friend) 인덱스 하나로 조회
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="friend_edges")
+    friend = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    friendship = models.ForeignKey(Friendship, on_delete=models.CASCADE, related_name="edges")
+    created_at = models.DateTimeField()  # 친구 관계 생성 시간
+
+    class Meta:
+        db_table = 'friend_edges'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'friend'], name='unique_friend_edge')
+        ]
+        indexes = [
+            # 친구 목록 커서 페이지네이션용 (친구가 된 날짜순)
+            models.Index(fields=['user', 'created_at', 'id'], name='friend_edges_user_created_idx'),
+        ]
+
+
+class FriendSuggestion(models.Model):
+    """
+    알 수도 있는 사람 추천 (친구의 친구, 함께 아는 친구 수 순)
+    compute_friend_suggestions 명령으로 일괄 계산하고 새 친구 관계가 생기면 증분 갱신
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="friend_suggestions")
+    candidate = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    mutual_count = models.PositiveIntegerField(default=0)  # 함께 아는 친구 수
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'friend_suggestions'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'candidate'], name='unique_friend_suggestion')
+        ]
+        indexes = [
+            models.Index(fields=['user', '-mutual_count'], name='friend_suggestions_rank_idx'),
+        ]
+
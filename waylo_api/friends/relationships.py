@@ -0,0 +1,70 @@
+from .models import FriendEdge, FriendRequest
+
+# 조회한 사용자와 현재 사용자의 관계 (클라이언트 FriendStatus와 대응)
+FRIEND = 'friend'
+REQUEST_SENT = 'request_sent'
+REQUEST_RECEIVED = 'request_received'
+NOT_FRIEND = 'not_friend'
+SELF = 'self'
+
+
+def relationship_statuses(viewer, user_ids):
+    """
+    현재 사용자(viewer)와 user_ids 각 사용자의 관계를 한 번에 조회
+    사용자 수와 관계없이 친구/보낸 요청/받은 요청 세 번의 집합 조회로 처리
+
+    반환: {user_id 문자열: 'friend' | 'request_sent' | 'request_received' | 'not_friend' | 'self'}
+    """
+    user_ids = [str(user_id) for user_id in user_ids]
+    if not user_ids or not viewer.is_authenticated:
+        return {user_id: NOT_FRIEND for user_id in user_ids}
+
+    friend_ids = {
+        str(friend_id) for friend_id in
+        FriendEdge.objects.filter(user=viewer, friend_id__in=user_ids).values_list('friend_id', flat=True)
+    }
+    sent_ids = {
+        str(to_user_id) for to_user_id in
+        FriendRequest.objects.filter(
+            from_user=viewer, to_user_id__in=user_ids, status='pending'
+        ).values_list('to_user_id', flat=True)
+    }
+    received_ids = {
+        str(from_user_id) for from_user_id in
+        FriendRequest.objects.filter(
+            to_user=viewer, from_user_id__in=user_ids, status='pending'
+        ).values_list('from_user_id', flat=True)
+    }
+
+    viewer_id = str(viewer.id)
+    statuses = {}
+    for user_id in user_ids:
+        if user_id == viewer_id:
+            statuses[user_id] = SELF
+        elif user_id in friend_ids:
+            statuses[user_id] = FRIEND
+        elif user_id in sent_ids:
+            statuses[user_id] = REQUEST_SENT
+        elif user_id in received_ids:
+            statuses[user_id] = REQUEST_RECEIVED
+        else:
+            statuses[user_id] = NOT_FRIEND
+    return statuses
+
+
+def wants_relationship(request):
+    """ include_relationship=true 요청 여부 """
+    return request.query_params.get('include_relationship', '').lower() in ('1', 'true')
+
+
+def attach_relationships(request, items, id_key='id'):
+    """
+    include_relationship=true 요청이면 목록 항목마다 현재 사용자와의 관계(relationship)를 추가
+    """
+    if not wants_relationship(request):
+        return items
+
+    statuses = relationship_statuses(request.user, [item[id_key] for item in items])
+    for item in items:
+        item['relationship'] = statuses[str(item[id_key])]
+    return items
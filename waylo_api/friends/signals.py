@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from users.models import UserStats
+from .models import Friendship
+from .suggestions import apply_new_friendship
+
+
+@receiver(post_delete, sender=Friendship)
+def decrement_friend_counts(sender, instance, **kwargs):
+    """
+    친구 관계가 삭제되면 두 사용자의 친구 수 통계를 감소
+    """
+    UserStats.increment(instance.user1_id, {'friends_count': -1}, create=False)
+    UserStats.increment(instance.user2_id, {'friends_count': -1}, create=False)
+
+
+@receiver(post_save, sender=Friendship)
+def update_friend_suggestions(sender, instance, created, **kwargs):
+    """
+    새 친구 관계를 친구 추천 목록에 증분 반영 (커밋 후)
+    """
+    if created:
+        user1_id, user2_id = instance.user1_id, instance.user2_id
+        transaction.on_commit(lambda: apply_new_friendship(user1_id, user2_id))
+
@@ -0,0 +1,88 @@
+import logging
+import uuid
+from django.db import connection, transaction
+from .models import FriendSuggestion, Friendship
+
+logger = logging.getLogger(__name__)
+
+# 사용자별로 저장할 최대 추천 수
+SUGGESTIONS_PER_USER = 50
+
+# 친구 수가 이 값 이상인 사용자의 새 친구 관계는 증분 갱신하지 않고 일괄 계산에 맡김
+INCREMENTAL_FRIEND_LIMIT = 1000
+
+# 증분 갱신 시 한 번에 저장할 행 수
+BATCH_SIZE = 500
+
+
+def compute_suggestions(user_id, limit=SUGGESTIONS_PER_USER):
+    """
+    친구의 친구 중 아직 친구가 아닌 사용자를 함께 아는 친구 수 순으로 계산하여 저장
+    """
+    sql = """
+        SELECT e2.friend_id, COUNT(*) AS mutual_count
+        FROM friend_edges e1
+        JOIN friend_edges e2 ON e2.user_id = e1.friend_id
+        WHERE e1.user_id = %s
+          AND e2.friend_id <> e1.user_id
+          AND NOT EXISTS (
+              SELECT 1 FROM friend_edges e3
+              WHERE e3.user_id = e1.user_id AND e3.friend_id = e2.friend_id
+          )
+        GROUP BY e2.friend_id
+        ORDER BY mutual_count DESC, e2.friend_id
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [user_id, limit])
+        rows = cursor.fetchall()
+
+    with transaction.atomic():
+        FriendSuggestion.objects.filter(user_id=user_id).delete()
+        FriendSuggestion.objects.bulk_create([
+            FriendSuggestion(user_id=user_id, candidate_id=candidate_id, mutual_count=mutual_count)
+            for candidate_id, mutual_count in rows
+        ])
+    return len(rows)
+
+
+def _add_mutuals(pairs):
+    """ (user_id, candidate_id) 쌍의 함께 아는 친구 수를 1씩 증가 (없으면 생성) """
+    pairs = list(pairs)
+    for start in range(0, len(pairs), BATCH_SIZE):
+        batch = pairs[start:start + BATCH_SIZE]
+        values = ', '.join(['(%s, %s, %s, 1, now())'] * len(batch))
+        params = []
+        for user_id, candidate_id in batch:
+            params.extend([uuid.uuid4(), user_id, candidate_id])
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                INSERT INTO friend_suggestions (id, user_id, candidate_id, mutual_count, updated_at)
+                VALUES {values}
+                ON CONFLICT (user_id, candidate_id)
+                DO UPDATE SET mutual_count = friend_suggestions.mutual_count + 1, updated_at = now()
+            """, params)
+
+
+def apply_new_friendship(user1_id, user2_id):
+    """
+    새 친구 관계(A, B)를 추천 목록에 증분 반영
+    - A, B 사이의 추천은 삭제
+    - A의 다른 친구 X와 B (또는 B의 친구와 A)가 아직 친구가 아니면 서로의 함께 아는 친구 수 +1
+    """
+    FriendSuggestion.objects.filter(user_id=user1_id, candidate_id=user2_id).delete()
+    FriendSuggestion.objects.filter(user_id=user2_id, candidate_id=user1_id).delete()
+
+    friends1 = set(Friendship.friend_ids(user1_id))
+    friends2 = set(Friendship.friend_ids(user2_id))
+    if len(friends1) >= INCREMENTAL_FRIEND_LIMIT or len(friends2) >= INCREMENTAL_FRIEND_LIMIT:
+        logger.info(f"친구 추천 증분 갱신 생략 (친구 수 초과): {user1_id} <-> {user2_id}")
+        return
+
+    pairs = []
+    for friend_id in friends1 - friends2 - {user2_id}:
+        pairs.extend([(friend_id, user2_id), (user2_id, friend_id)])
+    for friend_id in friends2 - friends1 - {user1_id}:
+        pairs.extend([(friend_id, user1_id), (user1_id, friend_id)])
+    _add_mutuals(pairs)
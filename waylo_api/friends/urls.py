@@ -5,7 +5,8 @@ from .views import (
     get_sent_friend_requests_view,
     accept_friend_request_view,
     reject_friend_request_view,
-    get_friends_info
+    get_friends_info,
+    get_friend_suggestions_view
 )
 
 urlpatterns = [
@@ -16,6 +17,9 @@ urlpatterns = [
     path('accept/', accept_friend_request_view, name='accept_friend_request'),
     path('reject/', reject_friend_request_view, name='reject_friend_request'),
 
+    # 친구 추천
+    path('suggestions/', get_friend_suggestions_view, name='get_friend_suggestions'),
+
     # 친구 목록 조회
     path('<uuid:user_id>/', get_friends_info, name='get_friends_info'),
 ]
@@ -5,8 +5,12 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
-from .models import FriendRequest, Friendship
+from django.db import transaction
+from feeds.pagination import InvalidCursor, paginate_by_created_at, parse_cursor_limit
+from users.models import UserStats
+from .models import FriendEdge, FriendRequest, FriendSuggestion, Friendship
+from .relationships import attach_relationships
+from .suggestions import SUGGESTIONS_PER_USER
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -42,9 +46,7 @@ def send_friend_request_view(request):
             return Response({"error": "자기 자신에게는 친구 요청을 보낼 수 없습니다."}, status=status.HTTP_400_BAD_REQUEST)
 
         # 이미 친구인지 확인
-        if Friendship.objects.filter(
-            Q(user1=from_user, user2=to_user) | Q(user1=to_user, user2=from_user)
-        ).exists():
+        if Friendship.are_friends(from_user, to_user):
             return Response({"error": "이미 친구 관계입니다."}, status=status.HTTP_400_BAD_REQUEST)
 
         # 기존 친구 요청 확인
@@ -142,10 +144,7 @@ def accept_friend_request_view(request):
             return Response({"error": f"요청을 처리할 수 없습니다 (상태: {friend_request.status})"}, status=status.HTTP_400_BAD_REQUEST)
         
         # 기존 친구 관계 확인
-        existing_friendship = Friendship.objects.filter(
-            Q(user1=friend_request.from_user, user2=friend_request.to_user) | 
-            Q(user1=friend_request.to_user, user2=friend_request.from_user)
-        ).first()
+        existing_friendship = Friendship.between(friend_request.from_user, friend_request.to_user)
         
         if existing_friendship:
             logger.error(f"이미 친구 관계 존재: {existing_friendship.id}")
@@ -159,16 +158,16 @@ def accept_friend_request_view(request):
         
         # 직접 처리하여 오류 가능성 줄이기
         try:
-            # 요청 상태 변경
-            friend_request.status = 'accepted'
-            friend_request.save()
-            logger.error(f"요청 상태 변경 성공: {friend_request.status}")
-            
-            # 친구 관계 생성
-            friendship = Friendship.objects.create(
-                user1=friend_request.from_user,
-                user2=friend_request.to_user
-            )
+            with transaction.atomic():
+                # 요청 상태 변경
+                friend_request.status = 'accepted'
+                friend_request.save()
+                logger.error(f"요청 상태 변경 성공: {friend_request.status}")
+                
+                # 친구 관계 생성 (양방향 FriendEdge 포함)
+                friendship, _ = Friendship.create_friendship(friend_request.from_user, friend_request.to_user)
+                if friendship is None:
+                    friendship = Friendship.between(friend_request.from_user, friend_request.to_user)
             logger.error(f"친구 관계 생성 성공: {friendship.id}")
             
             return Response({
@@ -216,32 +215,77 @@ def reject_friend_request_view(request):
 def get_friends_info(request, user_id):
     """
     특정 사용자의 친구 목록을 조회하는 API
+    - cursor: 친구가 된 날짜 내림차순 커서 페이지네이션 (첫 페이지는 빈 값)
+      friend_count는 전체 친구 수 (q가 있으면 검색 결과 수를 따로 세지 않으므로 생략), 없는 사용자면 404
+    - q: 사용자 이름 접두사 필터
+    - ids_only=true: 친구 ID 목록만 반환 (친구 여부 확인용)
+    - include_relationship=true: 각 친구와 현재 사용자의 관계(relationship)를 함께 반환
     """
     try:
         if not request.user.is_authenticated:
             return Response({"error": "인증된 사용자가 아닙니다."}, status=status.HTTP_401_UNAUTHORIZED)
 
-        friendships = Friendship.objects.filter(
-            Q(user1_id=user_id) | Q(user2_id=user_id)
-        ).select_related('user1', 'user2')
+        ids_only = request.query_params.get('ids_only', '').lower() in ('1', 'true')
+        query = request.query_params.get('q', '').strip()
+
+        edges = FriendEdge.objects.filter(user_id=user_id).order_by('-created_at', '-id')
+        if query:
+            edges = edges.filter(friend__username__istartswith=query)
+        if ids_only:
+            edges = edges.only('id', 'friend_id', 'created_at')
+        else:
+            edges = edges.select_related('friend')
+
+        # 커서 기반 페이지네이션
+        if 'cursor' in request.query_params:
+            if not User.objects.filter(id=user_id).exists():
+                return Response({"error": "해당 사용자를 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+
+            limit = parse_cursor_limit(request)
+            page_edges, next_cursor = paginate_by_created_at(edges, request.query_params.get('cursor'), limit)
+            data = {
+                'next_cursor': next_cursor,
+                'limit': limit
+            }
+            if not query:
+                data['friend_count'] = UserStats.for_user(user_id).friends_count
+            if ids_only:
+                data['friend_ids'] = [str(edge.friend_id) for edge in page_edges]
+            else:
+                data['friends'] = attach_relationships(request, [friend_info(edge) for edge in page_edges])
+            return Response(data, status=status.HTTP_200_OK)
+
+        if ids_only:
+            friend_ids = [str(friend_id) for friend_id in edges.values_list('friend_id', flat=True)]
+            return Response({
+                'friend_count': len(friend_ids),
+                'friend_ids': friend_ids
+            }, status=status.HTTP_200_OK)
 
-        friends_list = [{
-            'id': str(friend.id),
-            'username': friend.username,
-            'profile_image': friend.profile_image,
-            'friendship_date': friendship.created_at
-        } for friendship in friendships for friend in [friendship.user2 if str(friendship.user1.id) == str(user_id) else friendship.user1]]
+        friends_list = attach_relationships(request, [friend_info(edge) for edge in edges])
 
         return Response({
             'friend_count': len(friends_list),
             'friends': friends_list
         }, status=status.HTTP_200_OK)
 
+    except InvalidCursor:
+        return Response({"error": "잘못된 커서입니다."}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         logger.error(f"친구 목록 조회 오류: {e}")
         return Response({"error": "서버 오류"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def friend_info(edge):
+    """ 친구 목록 응답 항목 """
+    return {
+        'id': str(edge.friend.id),
+        'username': edge.friend.username,
+        'profile_image': edge.friend.profile_image,
+        'friendship_date': edge.created_at
+    }
+
+
 @api_view(['GET'])
 def get_sent_friend_requests_view(request):
     """
@@ -267,4 +311,43 @@ def get_sent_friend_requests_view(request):
 
     except Exception as e:
         logger.error(f"보낸 친구 요청 조회 오류: {e}")
-        return Response({"error": "서버 오류"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        return Response({"error": "서버 오류"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+def get_friend_suggestions_view(request):
+    """
+    알 수도 있는 사람(친구의 친구) 추천 목록을 조회하는 API
+    미리 계산된 추천 목록에서 그 사이 친구가 되었거나 친구 요청을 보낸 사용자는 제외
+    """
+    try:
+        if not request.user.is_authenticated:
+            return Response({"error": "인증된 사용자가 아닙니다."}, status=status.HTTP_401_UNAUTHORIZED)
+
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            limit = 20
+        limit = max(1, min(limit, SUGGESTIONS_PER_USER))
+
+        suggestions = FriendSuggestion.objects.filter(
+            user=request.user
+        ).exclude(
+            candidate__in=FriendEdge.objects.filter(user=request.user).values('friend_id')
+        ).exclude(
+            candidate__in=FriendRequest.objects.filter(from_user=request.user, status='pending').values('to_user_id')
+        ).select_related('candidate').order_by('-mutual_count', 'candidate_id')[:limit]
+
+        suggestions_data = [{
+            'id': str(suggestion.candidate.id),
+            'username': suggestion.candidate.username,
+            'profile_image': suggestion.candidate.profile_image,
+            'mutual_count': suggestion.mutual_count
+        } for suggestion in suggestions]
+        attach_relationships(request, suggestions_data)
+
+        return Response({'suggestions': suggestions_data}, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        logger.error(f"친구 추천 조회 오류: {e}")
+        return Response({"error": "서버 오류"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
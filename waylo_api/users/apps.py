@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        import users.signals
+        from waylo_api.background import is_server_process
+
+        # 서버 프로세스에서만 사용자명 자동완성 인덱스를 백그라운드 스레드에서 생성/재생성 (관리 명령 제외)
+        if is_server_process():
+            from users.autocomplete import start_background_refresh
+            start_background_refresh()
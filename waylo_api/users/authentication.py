@@ -2,6 +2,7 @@
 from rest_framework.authentication import BaseAuthentication, get_authorization_header
 from django.utils.translation import gettext_lazy as _
 from rest_framework import exceptions
+from . import token_cache
 from .models import CustomToken
 
 class CustomTokenAuthentication(BaseAuthentication):
@@ -26,16 +27,30 @@ class CustomTokenAuthentication(BaseAuthentication):
 
         return self.authenticate_credentials(token)
 
-    def authenticate_credentials(self, key):
-        try:
-            token = self.model.objects.select_related('user').get(key=key)
-        except self.model.DoesNotExist:
-            raise exceptions.AuthenticationFailed(_('Invalid token.'))
-
-        if not token.user.is_active:
+    def authenticate_credentials(self, raw_key):
+        # 토큰은 해시로 저장되므로 요청의 토큰을 해시하여 key(unique 인덱스)로 조회
+        key = self.model.hash_key(raw_key)
+
+        # 최근 인증한 토큰은 캐시된 스냅샷으로 사용자/토큰을 복원하여 데이터베이스 조회 생략
+        # (토큰 삭제, 사용자 수정/삭제 시 users.signals에서 무효화)
+        snapshot = token_cache.lookup(key)
+        if snapshot is not None:
+            user, token = token_cache.restore(snapshot, self.model)
+        else:
+            try:
+                token = self.model.objects.select_related('user').get(key=key)
+            except self.model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            user = token.user
+            token_cache.store(key, token_cache.make_snapshot(token))
+
+        if token.is_expired:
+            raise exceptions.AuthenticationFailed(_('Token has expired.'))
+
+        if not user.is_active:
             raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
 
-        return (token.user, token)
+        return (user, token)
 
     def authenticate_header(self, request):
         return self.keyword
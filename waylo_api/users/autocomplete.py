@@ -0,0 +1,235 @@
+import bisect
+import logging
+import threading
+import time
+import uuid
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+# 자동완성 결과 기본/최대 개수
+DEFAULT_AUTOCOMPLETE_LIMIT = 10
+MAX_AUTOCOMPLETE_LIMIT = 20
+
+# 인덱스 전체 재생성 주기 (초, settings.USER_AUTOCOMPLETE_REFRESH_SECONDS로 변경 가능)
+# 시그널은 현재 프로세스의 인덱스만 갱신하므로 다른 워커 프로세스의 변경은 재생성 시 반영됨
+DEFAULT_REFRESH_SECONDS = 300
+
+# 인덱스 생성에 실패했을 때 다시 시도하기까지 대기 시간 (초)
+RETRY_SECONDS = 30
+
+# 키 구분자 (사용자명에 올 수 없고 어떤 문자보다 앞에 정렬됨)
+SEPARATOR = '\x00'
+
+
+def make_key(username, user_id):
+    """ '소문자 사용자명 \\0 사용자명 \\0 id' 형태의 정렬 키 """
+    return f"{username.lower()}{SEPARATOR}{username}{SEPARATOR}{uuid.UUID(str(user_id)).hex}"
+
+
+class UsernameIndex:
+    """
+    사용자명 접두사 검색용 메모리 인덱스
+    사용자마다 문자열 키 하나만 정렬된 리스트로 보관하고 이진 탐색으로 접두사 구간을 찾음
+    (소문자 사용자명이 같으면 구분자가 가장 앞에 정렬되므로 정확히 일치하는 사용자가 먼저 나옴)
+
+    생성 후 전체 키 리스트는 바꾸지 않고, 이후 추가/삭제된 키만 작은 정렬 리스트와 집합에 따로 보관
+    추가/삭제는 이 두 개를 새로 만들어 (키 리스트, 추가, 삭제) 묶음의 참조를 한 번에 바꾸므로(copy-on-write)
+    검색은 잠금 없이 항상 하나의 일관된 상태를 읽음 (100만 개 리스트를 변경마다 복사하지 않음)
+    추가/삭제 목록은 주기적인 인덱스 재생성 때 비워짐
+    """
+
+    def __init__(self, keys=()):
+        self._state = (sorted(keys), [], frozenset())
+        self._lock = threading.Lock()
+        self.built_at = time.monotonic()
+
+    def __len__(self):
+        keys, added, removed = self._state
+        return len(keys) + len(added) - len(removed)
+
+    @staticmethod
+    def _contains(keys, key):
+        position = bisect.bisect_left(keys, key)
+        return position < len(keys) and keys[position] == key
+
+    def add(self, username, user_id):
+        key = make_key(username, user_id)
+        with self._lock:
+            keys, added, removed = self._state
+            if key in removed:
+                removed = removed - {key}
+            elif not self._contains(keys, key) and not self._contains(added, key):
+                added = added.copy()
+                bisect.insort(added, key)
+            self._state = (keys, added, removed)
+
+    def remove(self, username, user_id):
+        key = make_key(username, user_id)
+        with self._lock:
+            keys, added, removed = self._state
+            if self._contains(added, key):
+                added = [k for k in added if k != key]
+            elif self._contains(keys, key):
+                removed = removed | {key}
+            self._state = (keys, added, removed)
+
+    @staticmethod
+    def _prefix_range(keys, prefix, limit, removed=frozenset()):
+        """ 정렬된 keys에서 prefix로 시작하는 키를 최대 limit개 (removed에 있는 키 제외) """
+        results = []
+        position = bisect.bisect_left(keys, prefix)
+        while position < len(keys) and len(results) < limit:
+            key = keys[position]
+            if not key.startswith(prefix):
+                break
+            if key not in removed:
+                results.append(key)
+            position += 1
+        return results
+
+    def search(self, prefix, limit=DEFAULT_AUTOCOMPLETE_LIMIT):
+        """
+        소문자 사용자명이 prefix로 시작하는 사용자 목록 [{'id', 'username'}, ...]
+        """
+        prefix = prefix.lower().replace(SEPARATOR, '')
+        if not prefix:
+            return []
+
+        keys, added, removed = self._state
+        matches = self._prefix_range(keys, prefix, limit, removed)
+        if added:
+            matches = sorted(matches + self._prefix_range(added, prefix, limit))[:limit]
+
+        results = []
+        for key in matches:
+            _, username, user_hex = key.split(SEPARATOR)
+            results.append({'id': str(uuid.UUID(user_hex)), 'username': username})
+        return results
+
+
+_index = None
+_lock = threading.Lock()
+_pending_changes = None  # 재생성 중 들어온 변경 (새 인덱스로 바꾸기 전에 다시 적용)
+_refresh_started = False
+
+
+def refresh_seconds():
+    return getattr(settings, 'USER_AUTOCOMPLETE_REFRESH_SECONDS', DEFAULT_REFRESH_SECONDS)
+
+
+def build_index():
+    """ 전체 사용자명으로 인덱스 생성 """
+    from .models import User
+
+    started = time.perf_counter()
+    users = User.objects.values_list('username', 'id').order_by()
+    index = UsernameIndex(make_key(username, user_id) for username, user_id in users.iterator(chunk_size=10000))
+    logger.info(f"사용자명 자동완성 인덱스 생성: {len(index)}명, {(time.perf_counter() - started) * 1000:.0f}ms")
+    return index
+
+
+def refresh_index():
+    """
+    인덱스를 새로 생성하고 현재 인덱스와 참조를 바꿈
+    생성하는 동안 들어온 사용자 생성/변경/삭제는 새 인덱스에 다시 적용한 뒤 바꾸므로 누락되지 않음
+    """
+    global _index, _pending_changes
+    with _lock:
+        _pending_changes = []
+    try:
+        index = build_index()
+    except Exception:
+        with _lock:
+            _pending_changes = None
+        raise
+
+    with _lock:
+        for change in _pending_changes:
+            _apply(index, *change)
+        _pending_changes = None
+        _index = index
+    return index
+
+
+def _refresh_loop():
+    """ 시작 직후 인덱스를 생성하고 재생성 주기마다 다시 생성 """
+    # ready()에서 시작되므로 다른 앱 초기화가 끝난 뒤 DB 조회
+    while not apps.ready:
+        time.sleep(0.1)
+
+    while True:
+        try:
+            refresh_index()
+            delay = refresh_seconds()
+        except Exception:
+            logger.exception("사용자명 자동완성 인덱스 생성 실패")
+            delay = RETRY_SECONDS
+        finally:
+            close_old_connections()
+        time.sleep(delay)
+
+
+def start_background_refresh():
+    """
+    백그라운드 스레드에서 인덱스를 생성하고 주기적으로 다시 생성 (서버 프로세스의 UsersConfig.ready에서 호출)
+    요청 스레드는 인덱스 생성을 기다리지 않음
+    """
+    global _refresh_started
+    with _lock:
+        if _refresh_started:
+            return
+        _refresh_started = True
+    threading.Thread(target=_refresh_loop, name='username-autocomplete', daemon=True).start()
+
+
+def _search_database(prefix, limit):
+    """ 인덱스가 아직 없을 때 사용자명 검색과 같은 (lower(username) COLLATE "C", id) 인덱스 범위 조회로 대신 검색 """
+    from .search import prefix_matches
+
+    prefix = prefix.lower().replace(SEPARATOR, '')
+    if not prefix:
+        return []
+    users = prefix_matches(prefix).values_list('id', 'username')[:limit]
+    return [{'id': str(user_id), 'username': username} for user_id, username in users]
+
+
+def autocomplete(prefix, limit=DEFAULT_AUTOCOMPLETE_LIMIT):
+    """
+    메모리 인덱스에서 접두사 검색
+    시작 직후 인덱스가 생성되기 전이거나 백그라운드 생성을 하지 않는 프로세스(관리 명령, 테스트)는 DB에서 조회
+    """
+    index = _index
+    if index is None:
+        return _search_database(prefix, limit)
+    return index.search(prefix, limit)
+
+
+def _apply(index, action, username, previous_username, user_id):
+    if action == 'delete':
+        index.remove(username, user_id)
+        return
+    if previous_username and previous_username != username:
+        index.remove(previous_username, user_id)
+    index.add(username, user_id)
+
+
+def _record(*change):
+    """ 현재 인덱스에 변경을 반영하고, 재생성 중이면 새 인덱스에 다시 적용하도록 기록 """
+    with _lock:
+        index = _index
+        if _pending_changes is not None:
+            _pending_changes.append(change)
+    if index is not None:
+        _apply(index, *change)
+
+
+def user_saved(username, previous_username, user_id):
+    """ 사용자 생성/사용자명 변경 반영 (인덱스가 아직 없으면 생성 시 반영되므로 무시) """
+    _record('save', username, previous_username, user_id)
+
+
+def user_deleted(username, user_id):
+    _record('delete', username, None, user_id)
@@ -0,0 +1,89 @@
+import random
+import statistics
+import string
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from users.search import search_users_ranked
+
+
+class Command(BaseCommand):
+    help = (
+        '합성 사용자(기본 100만 명)를 생성하여 사용자 검색(search_users_ranked)의 지연 시간을 측정합니다. '
+        '기본적으로 생성한 데이터는 트랜잭션 롤백으로 삭제됩니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1_000_000, help='생성할 합성 사용자 수')
+        parser.add_argument('--queries', type=int, default=2000, help='검색 유형별 실행 횟수')
+        parser.add_argument('--limit', type=int, default=20, help='검색 결과 개수')
+        parser.add_argument('--keep', action='store_true', help='생성한 합성 사용자를 삭제하지 않음')
+
+    def _seed(self, count):
+        """
+        임의 사용자명(소문자 + 숫자)을 가진 합성 사용자를 한 번의 INSERT ... SELECT로 생성
+        (16진수만 쓰면 trigram 종류가 4096개뿐이라 실제 사용자명보다 유사 검색 후보가 10배 이상 많아짐)
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO users (
+                    id, password, first_name, last_name, email, gender, username, provider,
+                    created_at, is_superuser, is_staff, is_active, date_joined, account_visibility
+                )
+                SELECT
+                    md5('bench-id-' || i)::uuid, '', '', '',
+                    'bench' || i || '@bench.invalid', 'other',
+                    substr(
+                        lower(translate(encode(sha256(('bench-name-' || i)::bytea), 'base64'), '+/=', '')),
+                        1, 6 + (i %% 8)
+                    ) || (i %% 1000),
+                    'bench', now(), false, false, true, now(), 'public'
+                FROM generate_series(1, %s) AS i
+                ON CONFLICT DO NOTHING
+            """, [count])
+            # 대량 삽입으로 쌓인 GIN 대기 목록을 인덱스에 반영 (운영에서는 autovacuum이 처리)
+            cursor.execute("SELECT gin_clean_pending_list('users_username_trgm_idx'::regclass)")
+            cursor.execute("ANALYZE users")
+
+    def _measure(self, label, queries, limit):
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            users, _ = search_users_ranked(query, limit=limit)
+            len(users)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        timings.sort()
+        p50 = statistics.median(timings)
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        self.stdout.write(f"{label:<24} p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  max {timings[-1]:7.2f} ms")
+        return p99
+
+    def handle(self, *args, **options):
+        alphabet = string.ascii_lowercase + string.digits
+        rng = random.Random(42)
+
+        def random_query(length):
+            return ''.join(rng.choice(alphabet) for _ in range(length))
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            self._seed(options['users'])
+            self.stdout.write(f"합성 사용자 {options['users']}명 생성: {time.perf_counter() - started:.1f}s")
+
+            count = options['queries']
+            limit = options['limit']
+            p99s = [
+                self._measure('prefix (1 char)', [random_query(1) for _ in range(count)], limit),
+                self._measure('prefix (3 chars)', [random_query(3) for _ in range(count)], limit),
+                self._measure('prefix (5 chars)', [random_query(5) for _ in range(count)], limit),
+                # 접두사 결과가 거의 없어 유사 검색까지 내려가는 경우 (MIN_FUZZY_LENGTH 이상)
+                self._measure('fuzzy fallback (6 chars)', [random_query(6) for _ in range(count)], limit),
+                self._measure('fuzzy fallback (8 chars)', [random_query(8) for _ in range(count)], limit),
+            ]
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+        style = self.style.SUCCESS if max(p99s) < 10 else self.style.WARNING
+        self.stdout.write(style(f"최대 p99 {max(p99s):.2f} ms (목표 10 ms 미만)"))
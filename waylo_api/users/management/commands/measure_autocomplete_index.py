@@ -0,0 +1,64 @@
+import random
+import statistics
+import string
+import time
+import tracemalloc
+import uuid
+from django.core.management.base import BaseCommand
+from users.autocomplete import UsernameIndex, build_index, make_key
+
+
+class Command(BaseCommand):
+    help = (
+        '사용자명 자동완성 메모리 인덱스의 메모리 사용량과 접두사 검색 지연 시간을 측정합니다. '
+        '기본적으로 합성 사용자명(100만 개)을 사용하며 --from-db를 지정하면 실제 사용자로 인덱스를 생성합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1_000_000, help='합성 사용자명 수')
+        parser.add_argument('--queries', type=int, default=10000, help='접두사 길이별 검색 횟수')
+        parser.add_argument('--from-db', action='store_true', help='데이터베이스의 실제 사용자로 측정')
+
+    def _synthetic_keys(self, count, rng):
+        alphabet = string.ascii_letters + string.digits + '_.'
+        for _ in range(count):
+            username = ''.join(rng.choice(alphabet) for _ in range(rng.randint(4, 16)))
+            yield make_key(username, uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        if options['from_db']:
+            index = build_index()
+        else:
+            index = UsernameIndex(self._synthetic_keys(options['users'], rng))
+        elapsed = time.perf_counter() - started
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        count = len(index)
+        if not count:
+            self.stdout.write('인덱스가 비어 있습니다.')
+            return
+
+        self.stdout.write(f"사용자명 {count}개, 생성 {elapsed:.1f}s")
+        self.stdout.write(
+            f"메모리 {current / 1024 / 1024:.1f} MiB "
+            f"(사용자당 {current / count:.0f} bytes, 100만 명 기준 {current / count * 1_000_000 / 1024 / 1024:.1f} MiB)"
+        )
+
+        alphabet = string.ascii_lowercase + string.digits
+        for length in (1, 2, 3, 5):
+            timings = []
+            for _ in range(options['queries']):
+                prefix = ''.join(rng.choice(alphabet) for _ in range(length))
+                started = time.perf_counter()
+                index.search(prefix)
+                timings.append((time.perf_counter() - started) * 1_000_000)
+
+            timings.sort()
+            p50 = statistics.median(timings)
+            p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+            self.stdout.write(f"접두사 {length}글자: p50 {p50:6.1f} us  p99 {p99:6.1f} us")
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from users.models import CustomToken
+
+
+class Command(BaseCommand):
+    help = '만료된 로그인 토큰을 삭제합니다. (cron 등으로 주기적으로 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='한 번에 삭제할 토큰 수')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        now = timezone.now()
+        deleted = 0
+
+        # expires_at 인덱스로 만료된 토큰만 조회하여 배치 단위로 삭제
+        while True:
+            # (캐시된 인증 결과는 삭제 시그널로 무효화됨)
+            ids = list(CustomToken.objects.filter(expires_at__lte=now).values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+
+            CustomToken.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
+
+        self.stdout.write(self.style.SUCCESS(f"만료된 토큰 {deleted}개 삭제"))
@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from feeds.models import Feed, FeedLike
+from friends.models import FriendEdge
+from users.models import User, UserStats
+
+
+class Command(BaseCommand):
+    help = (
+        '사용자 통계(친구 수, 피드 수, 받은 좋아요 수)를 원본 테이블 기준으로 다시 계산하여 보정합니다. '
+        '증감 갱신 중 누락된 값을 바로잡기 위해 cron 등으로 주기적으로 실행합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='한 번에 처리할 사용자 수')
+
+    def _reconcile(self, user_ids):
+        """ 사용자 묶음의 통계를 집계 쿼리로 계산하여 저장하고 값이 바뀐 사용자 수 반환 """
+        friends = dict(
+            FriendEdge.objects.filter(user_id__in=user_ids)
+            .values_list('user_id').annotate(count=Count('id'))
+        )
+        feeds = dict(
+            Feed.objects.filter(user_id__in=user_ids)
+            .values_list('user_id').annotate(count=Count('id'))
+        )
+        likes = dict(
+            FeedLike.objects.filter(feed__user_id__in=user_ids)
+            .values_list('feed__user_id').annotate(count=Count('id'))
+        )
+        current = {
+            stats.user_id: (stats.friends_count, stats.feeds_count, stats.received_likes_count)
+            for stats in UserStats.objects.filter(user_id__in=user_ids)
+        }
+
+        rows = []
+        changed = 0
+        for user_id in user_ids:
+            values = (friends.get(user_id, 0), feeds.get(user_id, 0), likes.get(user_id, 0))
+            if current.get(user_id) == values:
+                continue
+            changed += 1
+            rows.append(UserStats(
+                user_id=user_id,
+                friends_count=values[0],
+                feeds_count=values[1],
+                received_likes_count=values[2]
+            ))
+
+        UserStats.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=['friends_count', 'feeds_count', 'received_likes_count', 'updated_at']
+        )
+        return changed
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        total = 0
+        changed = 0
+
+        batch = []
+        for user_id in User.objects.order_by('id').values_list('id', flat=True).iterator():
+            batch.append(user_id)
+            if len(batch) >= batch_size:
+                changed += self._reconcile(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            changed += self._reconcile(batch)
+            total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"사용자 {total}명 중 {changed}명의 통계 보정 완료"))
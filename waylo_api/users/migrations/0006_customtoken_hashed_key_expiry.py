@@ -0,0 +1,55 @@
+# Generated by Django 5.2 on 2026-10-17 16:20
+
+import django.db.models.deletion
+import hashlib
+import users.models
+from datetime import timedelta
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def hash_existing_keys(apps, schema_editor):
+    """
+    기존 평문 토큰을 SHA-256 해시로 변환하고 지금부터 유효 기간을 부여
+    (클라이언트가 가진 토큰 원문은 그대로 사용 가능)
+    """
+    CustomToken = apps.get_model('users', 'CustomToken')
+    expires_at = timezone.now() + timedelta(days=getattr(settings, 'AUTH_TOKEN_TTL_DAYS', users.models.DEFAULT_TOKEN_TTL_DAYS))
+    for token in CustomToken.objects.all().iterator():
+        token.key = hashlib.sha256(token.key.encode()).hexdigest()
+        token.expires_at = expires_at
+        token.save(update_fields=['key', 'expires_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_user_username_search_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customtoken',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='auth_tokens', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='customtoken',
+            name='key',
+            field=models.CharField(max_length=64, unique=True),
+        ),
+        migrations.AddField(
+            model_name='customtoken',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True, null=True),
+        ),
+        # 해시는 되돌릴 수 없으므로 역방향은 아무 작업도 하지 않음
+        migrations.RunPython(hash_existing_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='customtoken',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True, default=users.models.default_token_expiry),
+        ),
+    ]
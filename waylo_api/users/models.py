@@ -1,5 +1,13 @@
+import hashlib
+import secrets
+from datetime import timedelta
+from django.conf import settings
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Collate, Greatest, Lower
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 import uuid
 
 class User(AbstractUser):
@@ -31,15 +39,108 @@ class User(AbstractUser):
 
     class Meta:
         db_table = 'users'
+        indexes = [
+            # 대소문자 무시 접두사 검색/정렬용 (lower(username) COLLATE "C" 범위 조회)
+            models.Index(Collate(Lower('username'), 'C'), name='users_username_lower_c_idx'),
+            # 유사 검색(오타 허용)용 trigram 인덱스
+            GinIndex(OpClass(Lower('username'), name='gin_trgm_ops'), name='users_username_trgm_idx'),
+        ]
+
+
+# 토큰 유효 기간(일)과 사용자당 최대 토큰 수 (settings.AUTH_TOKEN_TTL_DAYS, AUTH_TOKEN_MAX_PER_USER로 변경 가능)
+DEFAULT_TOKEN_TTL_DAYS = 30
+DEFAULT_TOKENS_PER_USER = 10
+
+
+def default_token_expiry():
+    return timezone.now() + timedelta(days=getattr(settings, 'AUTH_TOKEN_TTL_DAYS', DEFAULT_TOKEN_TTL_DAYS))
 
 
 class CustomToken(models.Model):
+    """
+    로그인 토큰 (기기마다 하나씩 발급)
+    key에는 토큰 원문이 아닌 SHA-256 해시를 저장하고, 인증 시 요청의 토큰을 해시하여 key로 조회
+    원문은 발급 직후 raw_key로만 확인 가능
+    """
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="custom_auth_token")
-    key = models.CharField(max_length=40, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="auth_tokens")
+    key = models.CharField(max_length=64, unique=True)
     created = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(default=default_token_expiry, db_index=True)
+
+    @staticmethod
+    def hash_key(raw_key):
+        return hashlib.sha256(raw_key.encode()).hexdigest()
+
+    @classmethod
+    def issue(cls, user):
+        """
+        새 토큰 발급 (사용자당 최대 AUTH_TOKEN_MAX_PER_USER개, 넘으면 오래된 토큰부터 삭제)
+        """
+        token = cls.objects.create(user=user)
+        max_tokens = getattr(settings, 'AUTH_TOKEN_MAX_PER_USER', DEFAULT_TOKENS_PER_USER)
+        # 캐시된 인증 결과가 시그널로 무효화되도록 개별 삭제
+        for stale in cls.objects.filter(user=user).order_by('-created')[max_tokens:]:
+            stale.delete()
+        return token
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
 
     def save(self, *args, **kwargs):
         if not self.key:
-            self.key = uuid.uuid4().hex  
+            self.raw_key = secrets.token_hex(20)
+            self.key = self.hash_key(self.raw_key)
         return super().save(*args, **kwargs)
+
+
+class UserStats(models.Model):
+    """
+    프로필 화면용 사용자 통계 (친구 수, 피드 수, 받은 좋아요 수)
+    친구 관계/피드/좋아요 변경 시 증감으로 갱신하고 reconcile_user_stats 명령으로 주기적으로 보정
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    friends_count = models.PositiveIntegerField(default=0)
+    feeds_count = models.PositiveIntegerField(default=0)
+    received_likes_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'user_stats'
+
+    @classmethod
+    def compute(cls, user_id):
+        """
+        원본 테이블에서 통계를 다시 계산
+        """
+        from feeds.models import Feed, FeedLike
+        from friends.models import FriendEdge
+
+        return {
+            'friends_count': FriendEdge.objects.filter(user_id=user_id).count(),
+            'feeds_count': Feed.objects.filter(user_id=user_id).count(),
+            'received_likes_count': FeedLike.objects.filter(feed__user_id=user_id).count(),
+        }
+
+    @classmethod
+    def for_user(cls, user_id):
+        """
+        사용자 통계 조회 (없으면 계산하여 생성)
+        """
+        stats = cls.objects.filter(user_id=user_id).first()
+        if stats is None:
+            stats, _ = cls.objects.update_or_create(user_id=user_id, defaults=cls.compute(user_id))
+        return stats
+
+    @classmethod
+    def increment(cls, user_id, deltas, create=True):
+        """
+        통계 값을 F() 식으로 증감 (0 미만으로 내려가지 않음)
+        행이 없고 create=True이면 원본 테이블에서 계산하여 생성 (변경이 이미 반영된 뒤 호출)
+        """
+        updated = cls.objects.filter(user_id=user_id).update(**{
+            field: Greatest(F(field) + delta, 0) for field, delta in deltas.items()
+        })
+        if not updated and create:
+            cls.for_user(user_id)
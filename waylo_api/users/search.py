@@ -0,0 +1,118 @@
+import sys
+import uuid
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import Q
+from django.db.models.functions import Collate, Lower
+from feeds.pagination import InvalidCursor, decode_cursor, encode_cursor
+from .models import User
+
+# 검색 결과 기본/최대 개수
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 50
+
+# 유사 검색(오타 허용) 최대 결과 수와 최소 검색어 길이
+# 5글자 이하 검색어는 trigram이 적어 GIN 인덱스 후보가 수백 개로 늘어나고(100만 명 기준 검색당 약 500행 재확인)
+# 유사도 기준(0.3)을 넘는 사용자도 거의 없으므로 접두사 검색만 사용
+MAX_FUZZY_RESULTS = 50
+MIN_FUZZY_LENGTH = 6
+
+
+def username_key():
+    """ users_username_lower_c_idx 인덱스와 같은 식 (소문자, C 정렬) """
+    return Collate(Lower('username'), 'C')
+
+
+def _prefix_upper_bound(prefix):
+    """
+    C 정렬(코드 포인트 순서)에서 prefix로 시작하는 모든 문자열보다 큰 가장 작은 문자열 (없으면 None)
+    마지막 문자의 코드 포인트를 1 올리되, U+10FFFF는 올릴 수 없으므로 떼어내고 앞 문자를 올림
+    (UTF-8로 저장할 수 없는 서로게이트 구간은 건너뜀)
+    """
+    while prefix:
+        code = ord(prefix[-1]) + 1
+        if code <= sys.maxunicode:
+            if 0xD800 <= code <= 0xDFFF:
+                code = 0xE000
+            return prefix[:-1] + chr(code)
+        prefix = prefix[:-1]
+    return None
+
+
+def prefix_matches(query, after=None):
+    """
+    소문자 사용자명이 검색어로 시작하는 사용자 (정확히 일치하는 사용자가 가장 먼저)
+    (lower(username) COLLATE "C", id) 인덱스 범위 조회
+    """
+    # LIKE 'query%' 대신 같은 의미의 범위 조건 사용 (C 정렬은 코드 포인트 순서)
+    users = User.objects.annotate(username_key=username_key()).filter(username_key__gte=query)
+    upper = _prefix_upper_bound(query)
+    if upper is not None:
+        users = users.filter(username_key__lt=upper)
+    if after:
+        last_key, last_id = after
+        users = users.filter(Q(username_key__gt=last_key) | Q(username_key=last_key, id__gt=last_id))
+    return users.order_by('username_key', 'id')
+
+
+def _fuzzy_matches(query):
+    """
+    검색어로 시작하지는 않지만 trigram 유사도가 높은 사용자 (유사도 내림차순)
+    lower(username) gin_trgm_ops 인덱스의 % 연산자 사용
+    """
+    return User.objects.annotate(
+        username_lower=Lower('username'),
+        similarity=TrigramSimilarity(Lower('username'), query)
+    ).filter(
+        username_lower__trigram_similar=query
+    ).exclude(
+        username_lower__startswith=query
+    ).order_by('-similarity', 'username_lower', 'id')
+
+
+def search_users_ranked(query, cursor=None, limit=DEFAULT_SEARCH_LIMIT):
+    """
+    사용자명 검색 (정확히 일치 > 접두사 일치 > 유사 일치 순)
+    접두사 구간은 keyset, 유사 구간은 최대 MAX_FUZZY_RESULTS개 안에서 offset으로 페이지를 나눔
+
+    반환: (사용자 목록, next_cursor)
+    """
+    query = query.lower()
+    tier, position = 'prefix', None
+
+    if cursor:
+        try:
+            values = decode_cursor(cursor)
+            tier = values[0]
+            if tier == 'prefix':
+                position = (values[1], uuid.UUID(values[2]))
+            elif tier == 'fuzzy':
+                position = int(values[1])
+            else:
+                raise ValueError(tier)
+        except (ValueError, TypeError, IndexError):
+            raise InvalidCursor(cursor)
+
+    results = []
+    if tier == 'prefix':
+        prefix_users = list(prefix_matches(query, position)[:limit + 1])
+        if len(prefix_users) > limit:
+            last = prefix_users[limit - 1]
+            return prefix_users[:limit], encode_cursor(['prefix', last.username_key, str(last.id)])
+        results = prefix_users
+        position = 0
+
+    if len(query) < MIN_FUZZY_LENGTH or position >= MAX_FUZZY_RESULTS:
+        return results, None
+
+    # 접두사 결과로 페이지가 찼으면 유사 검색은 다음 페이지에서 조회 (다음 페이지가 비어 있을 수 있음)
+    if len(results) >= limit:
+        return results, encode_cursor(['fuzzy', 0])
+
+    # 접두사 결과가 한 페이지를 채우지 못하면 유사 검색 결과로 이어서 채움
+    # (한 개를 더 조회하여 다음 페이지 여부 확인)
+    end = min(position + limit - len(results), MAX_FUZZY_RESULTS)
+
+    fuzzy_users = list(_fuzzy_matches(query)[position:end + 1])
+    results.extend(fuzzy_users[:end - position])
+    has_more = len(fuzzy_users) > end - position and end < MAX_FUZZY_RESULTS
+    return results, encode_cursor(['fuzzy', end]) if has_more else None
@@ -0,0 +1,82 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from . import autocomplete, token_cache
+from .models import CustomToken, User
+
+
+def _auth_state(instance):
+    """
+    캐시된 토큰 인증 결과를 무효화해야 하는 필드 값 (지연 로딩 필드는 조회하지 않음)
+    비활성화/비밀번호 변경은 인증 여부를, 사용자명 변경은 request.user 표시를 바꿈
+    """
+    data = instance.__dict__
+    return data.get('is_active'), data.get('password'), data.get('username')
+
+
+@receiver(post_init, sender=User)
+def remember_username(sender, instance, **kwargs):
+    """
+    사용자를 불러올 때 사용자명과 인증 관련 필드를 기억해 두어 저장 시 변경 여부를 판단 (지연 로딩 필드는 조회하지 않음)
+    """
+    instance._indexed_username = instance.__dict__.get('username')
+    instance._auth_state = _auth_state(instance)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    """
+    새 사용자나 사용자명 변경을 자동완성 인덱스에 반영 (트랜잭션 커밋 후)
+    """
+    if 'username' not in instance.__dict__:
+        return
+
+    previous = None if created else getattr(instance, '_indexed_username', None)
+    username = instance.username
+    instance._indexed_username = username
+    if previous == username:
+        return
+
+    user_id = instance.id
+    transaction.on_commit(lambda: autocomplete.user_saved(username, previous, user_id))
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    """
+    삭제된 사용자를 자동완성 인덱스에서 제거
+    """
+    username = getattr(instance, '_indexed_username', None) or instance.username
+    user_id = instance.id
+    transaction.on_commit(lambda: autocomplete.user_deleted(username, user_id))
+
+
+def _invalidate_user_tokens(user_id):
+    keys = list(CustomToken.objects.filter(user_id=user_id).values_list('key', flat=True))
+    token_cache.invalidate(*keys)
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, created, **kwargs):
+    """
+    활성 여부/비밀번호/사용자명이 바뀌면 캐시된 토큰 인증 결과를 무효화
+    (last_login 등 다른 필드만 바뀐 저장은 토큰을 조회하지 않음, 캐시 유지 시간이 지나면 반영됨)
+    """
+    previous = getattr(instance, '_auth_state', None)
+    current = _auth_state(instance)
+    instance._auth_state = current
+    if created or previous == current:
+        return
+
+    user_id = instance.id
+    transaction.on_commit(lambda: _invalidate_user_tokens(user_id))
+
+
+@receiver(post_save, sender=CustomToken)
+@receiver(post_delete, sender=CustomToken)
+def token_changed(sender, instance, **kwargs):
+    """
+    토큰이 변경/삭제되면 (사용자 삭제에 따른 CASCADE 포함) 캐시된 인증 결과를 무효화
+    """
+    key = instance.key
+    transaction.on_commit(lambda: token_cache.invalidate(key))
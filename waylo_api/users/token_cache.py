@@ -0,0 +1,139 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+# 토큰 인증 결과 캐시 유지 시간 (초, settings.AUTH_TOKEN_CACHE_TIMEOUT으로 변경 가능)
+# 다른 프로세스에서 일어난 변경은 공유 캐시를 쓰지 않으면 이 시간이 지나야 반영됨
+DEFAULT_TIMEOUT = 60
+
+# 프로세스 메모리에 보관할 최대 토큰 수 (settings.AUTH_TOKEN_CACHE_MAX_SIZE로 변경 가능)
+DEFAULT_MAX_SIZE = 10000
+
+KEY_PREFIX = 'users:token'
+
+# 공유 캐시에 저장하지 않을 사용자 필드
+EXCLUDED_USER_FIELDS = ('password',)
+
+
+def _timeout():
+    return getattr(settings, 'AUTH_TOKEN_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+
+
+def _shared_cache():
+    """ settings.AUTH_TOKEN_CACHE_ALIAS로 지정한 공유 캐시 (지정하지 않으면 None) """
+    alias = getattr(settings, 'AUTH_TOKEN_CACHE_ALIAS', None)
+    return caches[alias] if alias else None
+
+
+def _shared_key(key):
+    # 토큰 원문을 공유 캐시 키로 노출하지 않도록 해시 사용
+    return f"{KEY_PREFIX}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+class LocalTokenCache:
+    """
+    토큰 키 -> 인증 스냅샷을 보관하는 프로세스 메모리 LRU (항목별 만료 시간 포함)
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return snapshot
+
+    def set(self, key, snapshot, timeout):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + timeout, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+local_cache = LocalTokenCache(getattr(settings, 'AUTH_TOKEN_CACHE_MAX_SIZE', DEFAULT_MAX_SIZE))
+
+
+def make_snapshot(token):
+    """
+    토큰과 사용자의 필드 값 (모델 인스턴스 대신 값만 저장하여 요청 간에 인스턴스를 공유하지 않음)
+    """
+    user = token.user
+    user_values = {
+        field.attname: getattr(user, field.attname)
+        for field in user._meta.concrete_fields
+        if field.attname not in EXCLUDED_USER_FIELDS
+    }
+    token_values = {field.attname: getattr(token, field.attname) for field in token._meta.concrete_fields}
+    return user_values, token_values
+
+
+def restore(snapshot, token_model):
+    """
+    스냅샷으로 (사용자, 토큰) 인스턴스 생성
+    저장되지 않은 필드(password)는 지연 로딩 필드가 되어 접근할 때 조회됨
+    """
+    user_values, token_values = snapshot
+    user_model = token_model._meta.get_field('user').related_model
+
+    def from_values(model, values):
+        names = [field.attname for field in model._meta.concrete_fields if field.attname in values]
+        return model.from_db('default', names, [values[name] for name in names])
+
+    user = from_values(user_model, user_values)
+    token = from_values(token_model, token_values)
+    token.user = user
+    return user, token
+
+
+def lookup(key):
+    snapshot = local_cache.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    shared = _shared_cache()
+    if shared is not None:
+        snapshot = shared.get(_shared_key(key))
+        if snapshot is not None:
+            local_cache.set(key, snapshot, _timeout())
+    return snapshot
+
+
+def store(key, snapshot):
+    timeout = _timeout()
+    local_cache.set(key, snapshot, timeout)
+    shared = _shared_cache()
+    if shared is not None:
+        shared.set(_shared_key(key), snapshot, timeout)
+
+
+def invalidate(*keys):
+    """ 토큰 삭제/사용자 변경 시 캐시된 인증 결과 제거 """
+    for key in keys:
+        local_cache.delete(key)
+    shared = _shared_cache()
+    if shared is not None and keys:
+        shared.delete_many([_shared_key(key) for key in keys])
@@ -1,24 +1,44 @@
 import logging
 import os
 import posixpath
-from .models import User, CustomToken
+from PIL import UnidentifiedImageError
+from .models import User, CustomToken, UserStats
+from friends.relationships import attach_relationships
+from feeds.pagination import InvalidCursor
+from .search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, search_users_ranked
+from .autocomplete import DEFAULT_AUTOCOMPLETE_LIMIT, MAX_AUTOCOMPLETE_LIMIT, autocomplete
 from django.contrib.auth.hashers import check_password
 from django.contrib.auth import get_user_model
-from rest_framework.decorators import api_view, parser_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes
 from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from .serializers import UserSerializer
-from django.db import connection
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
+from django.db import connection, transaction
 from django.conf import settings
+from feeds.images import encode_jpeg, ingest_image, save_media_file
 from .models import User
 
 User = get_user_model()
 
 logger = logging.getLogger(__name__)
 
+
+def save_profile_image(user, image_file):
+    """
+    업로드된 프로필 이미지를 한 번만 디코딩하여 방향 보정 후 profile.jpg로 저장하고 URL 반환
+    """
+    ingested = ingest_image(image_file.read(), extract_photo_date=False, thumbnail=False, derivatives=False)
+
+    user_folder = os.path.join(settings.MEDIA_ROOT, str(user.id), "profile")
+    if os.path.exists(user_folder):
+        for file_name in os.listdir(user_folder):
+            os.remove(os.path.join(user_folder, file_name))
+
+    return save_media_file(posixpath.join(str(user.id), "profile", "profile.jpg"), encode_jpeg(ingested['image']))
+
+
 @api_view(['POST'])
 def user_create_view(request):
     """
@@ -48,10 +68,12 @@ def user_login_view(request):
 
         user = User.objects.get(email=email)
         if user.check_password(password):
-            token, _ = CustomToken.objects.get_or_create(user=user)
+            # 기기마다 새 토큰 발급 (원문은 이 응답에서만 확인 가능)
+            token = CustomToken.issue(user)
             return Response({
-                "auth_token": token.key,
-                "user_id": str(user.id)
+                "auth_token": token.raw_key,
+                "user_id": str(user.id),
+                "expires_at": token.expires_at
             }, status=status.HTTP_200_OK)
 
         return Response({"error": "Password does not match."}, status=status.HTTP_401_UNAUTHORIZED)
@@ -63,6 +85,27 @@ def user_login_view(request):
         return Response({'error': 'Server error occurred.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def rotate_token_view(request):
+    """
+    현재 토큰을 폐기하고 새 토큰을 발급하는 API (만료 전에 클라이언트가 주기적으로 호출)
+    """
+    try:
+        with transaction.atomic():
+            token = CustomToken.issue(request.user)
+            request.auth.delete()
+
+        return Response({
+            "auth_token": token.raw_key,
+            "user_id": str(request.user.id),
+            "expires_at": token.expires_at
+        }, status=status.HTTP_200_OK)
+
+    except Exception:
+        return Response({'error': 'Server error occurred.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 @api_view(['GET'])
 def get_user_info(request, user_id):
     """
@@ -70,6 +113,7 @@ def get_user_info(request, user_id):
     """
     try:
         user = User.objects.get(id=user_id)
+        stats = UserStats.for_user(user.id)
         return Response({
             'username': user.username,
             'profile_image': user.profile_image,
@@ -77,7 +121,10 @@ def get_user_info(request, user_id):
             'gender': user.gender,
             'phone_number': user.phone_number,
             'created_at': user.created_at,
-            'account_visibility': user.account_visibility
+            'account_visibility': user.account_visibility,
+            'friend_count': stats.friends_count,
+            'feed_count': stats.feeds_count,
+            'received_likes_count': stats.received_likes_count
         })
     except User.DoesNotExist:
         return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
@@ -101,19 +148,7 @@ def update_user_info(request, user_id):
                 setattr(user, field, value)
 
         if "image" in request.FILES:
-            image_file = request.FILES["image"]
-            user_folder = os.path.join(settings.MEDIA_ROOT, str(user.id), "profile")
-            file_path = os.path.join(user_folder, "profile.jpg")
-
-            if os.path.exists(user_folder):
-                for file_name in os.listdir(user_folder):
-                    os.remove(os.path.join(user_folder, file_name))
-
-            os.makedirs(user_folder, exist_ok=True)
-            default_storage.save(file_path, ContentFile(image_file.read()))
-
-            image_url = posixpath.join(settings.MEDIA_URL, str(user.id), "profile", "profile.jpg").replace("\\", "/")
-            user.profile_image = image_url
+            user.profile_image = save_profile_image(user, request.FILES["image"])
 
         user.save()
 
@@ -130,6 +165,8 @@ def update_user_info(request, user_id):
 
     except User.DoesNotExist:
         return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+    except UnidentifiedImageError:
+        return Response({"error": "Invalid image file"}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         import traceback
         print(f"Detailed error during user info update: {e}")
@@ -147,19 +184,7 @@ def update_profile_image(request, user_id):
         user = User.objects.get(id=user_id)
 
         if "image" in request.FILES:
-            image_file = request.FILES["image"]
-            user_folder = os.path.join(settings.MEDIA_ROOT, str(user.id), "profile")
-            file_path = os.path.join(user_folder, "profile.jpg")
-
-            if os.path.exists(user_folder):
-                for file_name in os.listdir(user_folder):
-                    os.remove(os.path.join(user_folder, file_name))
-
-            os.makedirs(user_folder, exist_ok=True)
-            default_storage.save(file_path, ContentFile(image_file.read()))
-
-            image_url = posixpath.join(settings.MEDIA_URL, str(user.id), "profile", "profile.jpg").replace("\\", "/")
-            user.profile_image = image_url
+            user.profile_image = save_profile_image(user, request.FILES["image"])
             user.save(update_fields=['profile_image'])
 
             return Response({
@@ -172,6 +197,8 @@ def update_profile_image(request, user_id):
 
     except User.DoesNotExist:
         return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+    except UnidentifiedImageError:
+        return Response({"error": "Invalid image file"}, status=status.HTTP_400_BAD_REQUEST)
     except Exception:
         return Response({"error": "Server error occurred."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -180,13 +207,25 @@ def update_profile_image(request, user_id):
 def search_users(request):
     """
     사용자명을 기반으로 사용자 검색 API
+    정확히 일치 > 접두사 일치 > 유사 일치(오타 허용) 순으로 정렬하고 limit개까지 반환
+    cursor 파라미터가 있으면 {users, next_cursor} 형태로 페이지 단위 반환 (첫 페이지는 빈 값)
+    include_relationship=true이면 각 사용자와 현재 사용자의 관계(relationship)를 함께 반환
     """
     prefix = request.query_params.get('prefix', '')
 
     if not prefix:
         return Response({"error": "Please enter search term."}, status=status.HTTP_400_BAD_REQUEST)
 
-    users = User.objects.filter(username__istartswith=prefix)
+    try:
+        limit = int(request.query_params.get('limit', DEFAULT_SEARCH_LIMIT))
+    except ValueError:
+        limit = DEFAULT_SEARCH_LIMIT
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+
+    try:
+        users, next_cursor = search_users_ranked(prefix, request.query_params.get('cursor'), limit)
+    except InvalidCursor:
+        return Response({"error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
 
     results = []
     for user in users:
@@ -197,4 +236,29 @@ def search_users(request):
             'account_visibility': user.account_visibility
         })
 
-    return Response(results, status=status.HTTP_200_OK)
\ No newline at end of file
+    attach_relationships(request, results)
+
+    if 'cursor' in request.query_params:
+        return Response({'users': results, 'next_cursor': next_cursor}, status=status.HTTP_200_OK)
+
+    return Response(results, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+def autocomplete_usernames(request):
+    """
+    검색창 자동완성용 사용자명 접두사 검색 API
+    데이터베이스를 조회하지 않고 프로세스 메모리의 사용자명 인덱스에서 id와 username만 반환
+    """
+    prefix = request.query_params.get('prefix', '')
+
+    if not prefix:
+        return Response({"error": "Please enter search term."}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        limit = int(request.query_params.get('limit', DEFAULT_AUTOCOMPLETE_LIMIT))
+    except ValueError:
+        limit = DEFAULT_AUTOCOMPLETE_LIMIT
+    limit = max(1, min(limit, MAX_AUTOCOMPLETE_LIMIT))
+
+    return Response(autocomplete(prefix, limit), status=status.HTTP_200_OK)
\ No newline at end of file
@@ -13,4 +13,18 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'waylo_api.settings')
 
-application = get_asgi_application()
+# 앱 모델을 사용하는 모듈을 불러오기 전에 Django 초기화
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from channels.security.websocket import AllowedHostsOriginValidator  # noqa: E402
+from chats.middleware import TokenAuthMiddleware  # noqa: E402
+from chats.routing import websocket_urlpatterns  # noqa: E402
+
+application = ProtocolTypeRouter({
+    'http': django_asgi_app,
+    # 채팅 실시간 메시지 (토큰 인증)
+    'websocket': AllowedHostsOriginValidator(
+        TokenAuthMiddleware(URLRouter(websocket_urlpatterns))
+    ),
+})
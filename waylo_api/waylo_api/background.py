@@ -0,0 +1,20 @@
+import os
+import sys
+
+# manage.py/django-admin으로 실행한 관리 명령 중 백그라운드 스레드를 시작하는 명령
+SERVER_COMMANDS = {'runserver'}
+
+
+def is_server_process():
+    """
+    요청을 처리하는 서버 프로세스인지 여부 (AppConfig.ready에서 백그라운드 스레드를 시작할지 판단)
+    migrate, test, shell 등 관리 명령과 runserver 자동 재시작 감시 프로세스는 제외
+    daphne/uvicorn/gunicorn 등 ASGI/WSGI 서버로 실행한 프로세스는 포함
+    """
+    program = os.path.basename(sys.argv[0]) if sys.argv else ''
+    if program not in ('manage.py', 'django-admin'):
+        return True
+    if not SERVER_COMMANDS.intersection(sys.argv[1:2]):
+        return False
+    # runserver는 자동 재시작을 위해 감시 프로세스와 실제 서버 프로세스(RUN_MAIN)로 나뉨
+    return '--noreload' in sys.argv or os.environ.get('RUN_MAIN') == 'true'
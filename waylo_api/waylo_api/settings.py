@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'rest_framework.authtoken',
+    'channels',
     'users',
     'albums',
     'widgets',
@@ -47,6 +48,7 @@ INSTALLED_APPS = [
     'friends',
     'chats',
     'django.contrib.gis',
+    'django.contrib.postgres',
 ]
 
 # REST_FRAMEWORK = {
@@ -109,6 +111,16 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'waylo_api.wsgi.application'
+ASGI_APPLICATION = 'waylo_api.asgi.application'
+
+# 채팅 WebSocket 채널 레이어
+# 단일 서버는 프로세스 메모리 레이어를 사용하고, 여러 서버/프로세스로 운영할 때는
+# channels_redis.core.RedisChannelLayer 등 공유 레이어로 교체
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+    }
+}
 
 
 # Database
@@ -176,6 +188,48 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# 피드 작업 큐 (이미지 후처리, 친구 타임라인 갱신)
+# ('thread': 프로세스 내 워커 스레드, 'sync': 요청 스레드에서 즉시 처리)
+FEED_TASK_QUEUE = 'thread'
+FEED_TASK_WORKERS = 2
+# 프로세스당 대기 작업 최대 수 (가득 차면 이미지 작업은 pending 상태로 두고 복구 스레드가 처리)
+FEED_TASK_QUEUE_SIZE = 100
+# 이미지 작업 복구 스레드 실행 주기와 processing 상태로 이 시간 이상 멈춘 작업을 다시 처리하는 기준 (초)
+FEED_IMAGE_RECOVERY_SECONDS = 60
+FEED_IMAGE_STALE_SECONDS = 600
+
+# 피드 파생 이미지 해상도(너비, px)와 포맷 (AVIF는 Pillow가 지원하는 경우에만 생성)
+FEED_IMAGE_WIDTHS = [200, 480, 1080]
+FEED_IMAGE_FORMATS = ['webp', 'avif']
+
+# 캐시 (기본: 프로세스 메모리. 여러 워커 프로세스로 운영할 때는 타일 캐시 무효화와
+# /api/feeds/cache/stats/ 통계가 공유되도록 django.core.cache.backends.redis.RedisCache 등 공유 캐시로 변경)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'waylo',
+    }
+}
+
+# 주변 피드/지도 핀 타일 캐시 유지 시간 (초)
+FEED_TILE_CACHE_TIMEOUT = 300
+
+# 친구 수가 이 값 이상인 작성자의 피드는 친구 타임라인에 복사하지 않고 조회 시점에 병합
+FEED_TIMELINE_FANOUT_LIMIT = 1000
+
+# 사용자명 자동완성 메모리 인덱스 전체 재생성 주기 (초)
+USER_AUTOCOMPLETE_REFRESH_SECONDS = 300
+
+# 토큰 인증 결과 캐시 (프로세스 메모리 LRU, 유지 시간(초)과 최대 항목 수)
+# AUTH_TOKEN_CACHE_ALIAS에 CACHES 별칭을 지정하면 여러 프로세스가 함께 쓰는 2차 캐시로 사용
+AUTH_TOKEN_CACHE_TIMEOUT = 60
+AUTH_TOKEN_CACHE_MAX_SIZE = 10000
+AUTH_TOKEN_CACHE_ALIAS = None
+
+# 로그인 토큰 유효 기간(일)과 사용자(기기)당 최대 토큰 수
+AUTH_TOKEN_TTL_DAYS = 30
+AUTH_TOKEN_MAX_PER_USER = 10
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
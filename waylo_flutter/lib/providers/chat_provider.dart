@@ -1,6 +1,11 @@
 import 'package:flutter/material.dart';
+import 'package:shared_preferences/shared_preferences.dart';
+import 'package:uuid/uuid.dart';
 import 'package:waylo_flutter/services/api/chat_api.dart';
 import 'dart:async';
+import 'dart:convert';
+import 'dart:io' show WebSocket;
+import 'dart:math' show min;
 import '../services/api/api_service.dart';
 
 class ChatRoom {
@@ -58,22 +63,27 @@ class ChatRoom {
 
 class ChatMessage {
   final String id;                        // 메시지의 고유 식별자
+  final String? clientId;                 // 보낸 기기에서 만든 메시지 ID (재전송 중복 방지)
   final String content;                   // 메시지 내용
   final DateTime createdAt;              // 생성 일시
   final bool isMine;                     // 내가 보낸 메시지 여부
   final bool isRead;                     // 읽음 여부
+  final bool isPending;                  // 전송 대기 중 여부 (아직 서버에 저장되지 않음)
 
   ChatMessage({
     required this.id,
+    this.clientId,
     required this.content,
     required this.createdAt,
     required this.isMine,
     required this.isRead,
+    this.isPending = false,
   });
 
   factory ChatMessage.fromJson(Map<String, dynamic> json) {
     return ChatMessage(
       id: json['id'] ?? '',
+      clientId: json['client_id'],
       content: json['content'] ?? '',
       createdAt: json['created_at'] != null
           ? DateTime.parse(json['created_at'])
@@ -84,23 +94,162 @@ class ChatMessage {
   }
 }
 
+/// 전송 대기 중인 메시지
+/// client_id는 처음 대기열에 넣을 때 한 번만 만들고 재전송할 때도 그대로 사용 (서버에서 한 번만 저장)
+class PendingMessage {
+  final String roomId;                    // 보낼 채팅방 ID
+  final String clientId;                  // 메시지 client_id
+  final String content;                   // 메시지 내용
+  final DateTime createdAt;              // 대기열에 넣은 시간
+
+  PendingMessage({
+    required this.roomId,
+    required this.clientId,
+    required this.content,
+    required this.createdAt,
+  });
+
+  factory PendingMessage.fromJson(Map<String, dynamic> json) {
+    return PendingMessage(
+      roomId: json['room_id'] ?? '',
+      clientId: json['client_id'] ?? '',
+      content: json['content'] ?? '',
+      createdAt: DateTime.tryParse(json['created_at'] ?? '') ?? DateTime.now(),
+    );
+  }
+
+  /// 기기에 저장할 형태
+  Map<String, String> toJson() {
+    return {
+      'room_id': roomId,
+      'client_id': clientId,
+      'content': content,
+      'created_at': createdAt.toIso8601String(),
+    };
+  }
+
+  /// 일괄 전송 요청 항목
+  Map<String, String> toRequest() {
+    return {
+      'room_id': roomId,
+      'client_id': clientId,
+      'content': content,
+    };
+  }
+
+  /// 전송 전까지 채팅방에 표시할 메시지
+  ChatMessage toChatMessage() {
+    return ChatMessage(
+      id: clientId,
+      clientId: clientId,
+      content: content,
+      createdAt: createdAt,
+      isMine: true,
+      isRead: false,
+      isPending: true,
+    );
+  }
+}
+
 /// 채팅방과 메시지를 관리하는 Provider
 class ChatProvider with ChangeNotifier {
+  static const String _outboxKey = 'chat_outbox';       // 전송 대기 메시지 저장 키
+  static const int _outboxBatchSize = 100;              // 한 번에 보낼 최대 메시지 수 (서버 제한)
+  static const int _maxReconnectDelaySeconds = 60;      // 실시간 연결 재시도 최대 간격 (초)
+  static const int _forbiddenCloseCode = 4403;          // 인증 실패/참여자가 아님 (재연결하지 않음)
+
   List<ChatRoom> _rooms = [];                           // 채팅방 목록
   Map<String, List<ChatMessage>> _messages = {};        // 채팅방별 메시지 목록
+  Map<String, ChatMessage> _syncCursors = {};           // 채팅방별 마지막으로 동기화한 메시지
+  Set<String> _loadedRooms = {};                        // 최근 메시지를 불러온 채팅방
+  Map<String, bool> _hasMoreHistory = {};               // 채팅방별 이전 메시지 존재 여부
   bool _isLoading = false;                              // 채팅방 목록 로딩 상태
   bool _isLoadingMessages = false;                      // 메시지 로딩 상태
   String _errorMessage = '';                            // 에러 메시지
-  Timer? _refreshTimer;                                 // 자동 새로고침 타이머
+  Timer? _refreshTimer;                                 // 실시간 연결이 없는 동안의 polling 타이머
+  Duration _pollInterval = const Duration(seconds: 10); // polling 간격
+  WebSocket? _socket;                                   // 열려 있는 채팅방의 실시간 연결
+  String? _liveRoomId;                                  // 실시간으로 받는 채팅방 ID
+  Timer? _reconnectTimer;                               // 연결이 끊긴 뒤 재연결 타이머
+  int _reconnectAttempts = 0;                           // 연속 재연결 시도 횟수
+  final Uuid _uuid = Uuid();                            // 메시지 client_id 생성기
+  List<PendingMessage> _outbox = [];                    // 전송 대기 중인 메시지 (보낸 순서)
+  Future<void>? _outboxLoading;                         // 저장된 대기열 불러오기
+  Future<void>? _flushing;                              // 진행 중인 대기열 전송
 
   List<ChatRoom> get rooms => _rooms;
   bool get isLoading => _isLoading;
   bool get isLoadingMessages => _isLoadingMessages;
   String get errorMessage => _errorMessage;
 
-  /// 특정 채팅방의 메시지 목록 반환
+  /// 특정 채팅방의 메시지 목록 반환 (전송 대기 중인 메시지는 맨 뒤에 포함)
   List<ChatMessage> getMessages(String roomId) {
-    return _messages[roomId] ?? [];
+    final pending = _outbox.where((message) => message.roomId == roomId);
+    if (pending.isEmpty) return _messages[roomId] ?? [];
+
+    return [
+      ...?_messages[roomId],
+      ...pending.map((message) => message.toChatMessage()),
+    ];
+  }
+
+  /// 특정 채팅방에 더 불러올 이전 메시지가 있는지 여부
+  bool hasMoreHistory(String roomId) {
+    return _hasMoreHistory[roomId] ?? false;
+  }
+
+  /// 상대방 읽음 위치(peer_last_read_at) 이전의 내 메시지를 읽음으로 표시 (바뀐 메시지가 있으면 true)
+  bool _applyPeerReadAt(String roomId, dynamic peerLastReadAt) {
+    if (peerLastReadAt == null) return false;
+
+    final readAt = DateTime.tryParse(peerLastReadAt);
+    final messages = _messages[roomId];
+    if (readAt == null || messages == null) return false;
+
+    bool updated = false;
+    _messages[roomId] = messages.map((message) {
+      if (!message.isMine || message.isRead || message.createdAt.isAfter(readAt)) {
+        return message;
+      }
+      updated = true;
+      return ChatMessage(
+        id: message.id,
+        clientId: message.clientId,
+        content: message.content,
+        createdAt: message.createdAt,
+        isMine: message.isMine,
+        isRead: true,
+      );
+    }).toList();
+    return updated;
+  }
+
+  /// 증분 동기화 기준 메시지가 서버에 없어 최근 메시지부터 다시 불러와야 하는 응답인지 여부
+  bool _requiresResync(Map<String, dynamic> response) {
+    try {
+      final body = jsonDecode(response['error']);
+      return body is Map && body['resync'] == true;
+    } catch (e) {
+      return false;
+    }
+  }
+
+  /// a가 b보다 나중 메시지인지 여부 (서버 정렬 기준: created_at, id)
+  bool _isAfter(ChatMessage a, ChatMessage b) {
+    final byTime = a.createdAt.compareTo(b.createdAt);
+    return byTime > 0 || (byTime == 0 && a.id.compareTo(b.id) > 0);
+  }
+
+  /// 새로 받은 메시지를 기존 목록에 합침 (중복 제거 후 시간순 정렬)
+  void _mergeMessages(String roomId, List<ChatMessage> received) {
+    final existing = _messages[roomId] ?? [];
+    final knownIds = existing.map((message) => message.id).toSet();
+    final merged = [
+      ...existing,
+      ...received.where((message) => !knownIds.contains(message.id)),
+    ];
+    merged.sort((a, b) => a.createdAt.compareTo(b.createdAt));
+    _messages[roomId] = merged;
   }
 
   /// 채팅방 목록 로드
@@ -111,6 +260,9 @@ class ChatProvider with ChangeNotifier {
     _errorMessage = '';
     notifyListeners();
 
+    // 이전에 보내지 못한 메시지 전송
+    flushOutbox();
+
     try {
       final response = await ChatApi.getChatRooms();
 
@@ -149,22 +301,103 @@ class ChatProvider with ChangeNotifier {
   }
 
   /// 채팅 메시지 로드
-  Future<void> loadMessages(String roomId) async {
+  /// 처음에는 최근 메시지를 불러오고, 이후에는 마지막으로 동기화한 메시지 이후의 새 메시지만 불러옴
+  /// overlap: 재연결 직후처럼 놓친 메시지가 있을 수 있을 때 기준 직전 메시지도 다시 받음 (ID로 중복 제거)
+  Future<void> loadMessages(String roomId, {bool overlap = false}) async {
     if (_isLoadingMessages) return;
 
     _isLoadingMessages = true;
-    notifyListeners();
+    final isInitialLoad = !_loadedRooms.contains(roomId);
+    if (isInitialLoad) {
+      notifyListeners();
+    }
 
+    bool changed = isInitialLoad;
     try {
-      final response = await ChatApi.getChatMessages(roomId: roomId);
+      bool hasMore = true;
+      while (hasMore) {
+        final after = _syncCursors[roomId]?.id;
+        final response = await ChatApi.getChatMessages(roomId: roomId, after: after, overlap: overlap);
+        overlap = false;  // 기준 직전 메시지는 첫 요청에서만 다시 받음
+
+        if (response.containsKey('error')) {
+          if (after != null && _requiresResync(response)) {
+            // 기준 메시지가 삭제됨: 최근 메시지부터 다시 동기화
+            _syncCursors.remove(roomId);
+            continue;
+          }
+          _errorMessage = response['error'] ?? '메시지를 불러오는데 실패했습니다';
+          changed = true;
+          break;
+        }
 
-      if (!response.containsKey('error')) {
         List<dynamic> messagesData = response['messages'] ?? [];
         List<ChatMessage> messages = messagesData
             .map((data) => ChatMessage.fromJson(data))
             .toList();
 
-        _messages[roomId] = messages;
+        if (after == null) {
+          // 최근 메시지 조회: has_more는 이전 메시지 존재 여부
+          // (불러오는 동안 실시간으로 받은 더 최근 메시지는 유지)
+          final live = (_messages[roomId] ?? []).where(
+            (message) => messages.isEmpty || _isAfter(message, messages.last),
+          );
+          _messages[roomId] = [...messages, ...live];
+          _hasMoreHistory[roomId] = response['has_more'] ?? false;
+          _loadedRooms.add(roomId);
+          hasMore = false;
+          changed = true;
+        } else {
+          // 증분 동기화: has_more는 아직 받지 못한 새 메시지 존재 여부
+          _mergeMessages(roomId, messages);
+          hasMore = response['has_more'] ?? false;
+        }
+
+        if (messages.isNotEmpty) {
+          // 이번에 받은 가장 최근 메시지가 기준보다 나중일 때만 기준 이동
+          // (다시 받은 기준 직전 메시지로 뒤로 가거나, 실시간으로 먼저 받은 메시지로 건너뛰지 않도록 목록 대신 응답 기준)
+          final newest = messages.last;
+          final cursor = _syncCursors[roomId];
+          if (cursor == null || _isAfter(newest, cursor)) {
+            _syncCursors[roomId] = newest;
+          }
+          changed = true;
+        }
+
+        if (_applyPeerReadAt(roomId, response['peer_last_read_at'])) {
+          changed = true;
+        }
+      }
+    } catch (e) {
+      _errorMessage = '메시지를 불러오는 중 오류가 발생했습니다';
+      changed = true;
+    } finally {
+      _isLoadingMessages = false;
+      if (changed) {
+        notifyListeners();
+      }
+    }
+  }
+
+  /// 이전 메시지 로드 (가장 오래된 메시지 이전 기록)
+  Future<void> loadOlderMessages(String roomId) async {
+    final existing = _messages[roomId] ?? [];
+    if (_isLoadingMessages || existing.isEmpty || !hasMoreHistory(roomId)) return;
+
+    _isLoadingMessages = true;
+    try {
+      final response = await ChatApi.getChatMessages(
+        roomId: roomId,
+        before: existing.first.id,
+      );
+
+      if (!response.containsKey('error')) {
+        List<dynamic> messagesData = response['messages'] ?? [];
+        _mergeMessages(
+          roomId,
+          messagesData.map((data) => ChatMessage.fromJson(data)).toList(),
+        );
+        _hasMoreHistory[roomId] = response['has_more'] ?? false;
       } else {
         _errorMessage = response['error'] ?? '메시지를 불러오는데 실패했습니다';
       }
@@ -176,56 +409,283 @@ class ChatProvider with ChangeNotifier {
     }
   }
 
+  /// 기기에 저장된 전송 대기열 불러오기 (처음 한 번만)
+  Future<void> _loadOutbox() {
+    return _outboxLoading ??= () async {
+      try {
+        final prefs = await SharedPreferences.getInstance();
+        final saved = prefs.getString(_outboxKey);
+        if (saved == null) return;
+
+        final List<dynamic> items = jsonDecode(saved);
+        _outbox = [
+          ...items.map((item) => PendingMessage.fromJson(Map<String, dynamic>.from(item))),
+          ..._outbox,
+        ];
+        notifyListeners();
+      } catch (e) {
+        // 저장된 대기열을 읽지 못하면 빈 대기열로 시작
+      }
+    }();
+  }
+
+  /// 전송 대기열을 기기에 저장 (앱이 종료되어도 다음 실행 때 같은 client_id로 다시 보냄)
+  Future<void> _saveOutbox() async {
+    final prefs = await SharedPreferences.getInstance();
+    await prefs.setString(
+      _outboxKey,
+      jsonEncode(_outbox.map((message) => message.toJson()).toList()),
+    );
+  }
+
+  /// 저장된 메시지를 전송 대기열에서 제거 (제거한 메시지가 있으면 true)
+  bool _removeFromOutbox(Set<String> clientIds) {
+    final count = _outbox.length;
+    _outbox.removeWhere((message) => clientIds.contains(message.clientId));
+    if (_outbox.length == count) return false;
+
+    _saveOutbox().catchError((e) {
+      _errorMessage = '메시지를 저장하는 중 오류가 발생했습니다';
+    });
+    return true;
+  }
+
   /// 메시지 전송
+  /// 메시지를 전송 대기열에 넣어 바로 표시한 뒤 실시간 연결로 보내거나 (연결이 없으면) 대기열을 일괄 전송
+  /// 전송에 실패하면 대기열에 남아 있다가 다음 전송 때 같은 client_id로 다시 보냄
   Future<bool> sendMessage(String roomId, String content) async {
     if (content.isEmpty) return false;
 
+    await _loadOutbox();
+    final pending = PendingMessage(
+      roomId: roomId,
+      clientId: _uuid.v4(),
+      content: content,
+      createdAt: DateTime.now(),
+    );
+    _outbox.add(pending);
+    notifyListeners();
+
     try {
-      final response = await ChatApi.sendMessage(
-        roomId: roomId,
-        content: content,
-      );
+      await _saveOutbox();
+    } catch (e) {
+      _errorMessage = '메시지를 저장하는 중 오류가 발생했습니다';
+      notifyListeners();
+    }
 
-      if (!response.containsKey('error')) {
-        final messageData = response['message'];
-        if (messageData != null) {
-          final newMessage = ChatMessage.fromJson(messageData);
+    final socket = _socket;
+    if (socket != null && _liveRoomId == roomId) {
+      // 저장된 메시지가 실시간으로 돌아오면 대기열에서 제거
+      socket.add(jsonEncode({
+        'type': 'message',
+        'content': pending.content,
+        'client_id': pending.clientId,
+      }));
+      return true;
+    }
 
-          if (!_messages.containsKey(roomId)) {
-            _messages[roomId] = [];
-          }
-          _messages[roomId]!.add(newMessage);
+    await flushOutbox();
+    return true;
+  }
 
-          notifyListeners();
-          return true;
-        }
-      } else {
+  /// 전송 대기 중인 메시지를 일괄 전송
+  /// 이미 전송 중이면 그 전송이 끝난 뒤 남은 메시지를 이어서 전송
+  Future<void> flushOutbox() async {
+    while (_flushing != null) {
+      await _flushing;
+    }
+
+    _flushing = _sendOutbox();
+    try {
+      await _flushing;
+    } finally {
+      _flushing = null;
+    }
+  }
+
+  /// 대기열 앞에서부터 최대 _outboxBatchSize개씩 전송
+  Future<void> _sendOutbox() async {
+    await _loadOutbox();
+
+    while (_outbox.isNotEmpty) {
+      final batch = _outbox.take(_outboxBatchSize).toList();
+
+      Map<String, dynamic> response;
+      try {
+        response = await ChatApi.sendMessagesBatch(
+          messages: batch.map((message) => message.toRequest()).toList(),
+        );
+      } catch (e) {
+        response = {'error': '메시지 전송 중 오류가 발생했습니다'};
+      }
+
+      if (response.containsKey('error')) {
+        // 네트워크 오류 등: 대기열에 남겨 두고 다음 전송 때 다시 보냄
         _errorMessage = response['error'] ?? '메시지 전송에 실패했습니다';
         notifyListeners();
+        return;
+      }
+
+      final done = <String>{};
+      for (final result in (response['results'] as List<dynamic>? ?? [])) {
+        final clientId = result['client_id']?.toString();
+        if (clientId == null) continue;
+        done.add(clientId);
+
+        if (result['status'] == 'error') {
+          // 다시 보내도 저장되지 않는 메시지 (권한 없음, client_id 충돌 등)는 대기열에서 제거
+          _errorMessage = result['error'] ?? '메시지 전송에 실패했습니다';
+        } else if (result['message'] != null) {
+          final messageData = Map<String, dynamic>.from(result['message']);
+          _mergeMessages(messageData['room_id'] ?? '', [ChatMessage.fromJson(messageData)]);
+        }
+      }
+
+      _outbox.removeWhere((message) => done.contains(message.clientId));
+      try {
+        await _saveOutbox();
+      } catch (e) {
+        _errorMessage = '메시지를 저장하는 중 오류가 발생했습니다';
       }
-    } catch (e) {
-      _errorMessage = '메시지 전송 중 오류가 발생했습니다';
       notifyListeners();
-    }
 
-    return false;
+      // 결과를 받지 못한 메시지가 있으면 다음 전송 때 다시 보냄
+      if (batch.any((message) => !done.contains(message.clientId))) return;
+    }
   }
 
-  /// 자동 메시지 새로고침 시작
+  /// 채팅방 실시간 수신 시작
+  /// WebSocket으로 새 메시지와 읽음 표시를 받고, 연결되지 않은 동안에만 duration 간격으로 polling
   void startAutoRefresh(String roomId, {Duration duration = const Duration(seconds: 10)}) {
     stopAutoRefresh();
 
-    _refreshTimer = Timer.periodic(duration, (timer) {
+    _liveRoomId = roomId;
+    _pollInterval = duration;
+    _startPolling(roomId);
+    _connectSocket(roomId);
+  }
+
+  /// 채팅방 실시간 수신 중지
+  void stopAutoRefresh() {
+    _liveRoomId = null;
+    _reconnectAttempts = 0;
+    _stopPolling();
+    _reconnectTimer?.cancel();
+    _reconnectTimer = null;
+
+    final socket = _socket;
+    _socket = null;
+    socket?.close();
+  }
+
+  /// polling 시작 (보내지 못한 메시지도 함께 다시 전송)
+  void _startPolling(String roomId) {
+    _refreshTimer ??= Timer.periodic(_pollInterval, (timer) {
+      flushOutbox();
       loadMessages(roomId);
     });
   }
 
-  /// 자동 메시지 새로고침 중지
-  void stopAutoRefresh() {
+  /// polling 중지
+  void _stopPolling() {
     _refreshTimer?.cancel();
     _refreshTimer = null;
   }
 
+  /// 채팅방 WebSocket 연결 (연결되면 polling을 멈추고 연결 전에 놓친 메시지를 한 번 동기화)
+  Future<void> _connectSocket(String roomId) async {
+    _reconnectTimer = null;
+
+    WebSocket socket;
+    try {
+      socket = await ChatApi.connectRoom(roomId: roomId);
+    } catch (e) {
+      _scheduleReconnect(roomId);
+      return;
+    }
+
+    if (_liveRoomId != roomId) {
+      // 연결하는 동안 채팅방을 나감
+      socket.close();
+      return;
+    }
+
+    _socket = socket;
+    _reconnectAttempts = 0;
+    _stopPolling();
+    socket.listen(
+      (data) => _handleSocketEvent(roomId, data),
+      onDone: () => _handleSocketClosed(roomId, socket),
+      onError: (error) => _handleSocketClosed(roomId, socket),
+      cancelOnError: true,
+    );
+
+    loadMessages(roomId, overlap: true);
+    flushOutbox();
+  }
+
+  /// 연결이 끊기면 polling으로 전환하고 재연결 예약
+  void _handleSocketClosed(String roomId, WebSocket socket) {
+    if (_socket != socket) return;
+    _socket = null;
+    if (_liveRoomId != roomId) return;
+
+    _startPolling(roomId);
+    if (socket.closeCode != _forbiddenCloseCode) {
+      _scheduleReconnect(roomId);
+    }
+  }
+
+  /// 재연결 예약 (2초부터 두 배씩, 최대 _maxReconnectDelaySeconds초)
+  void _scheduleReconnect(String roomId) {
+    if (_liveRoomId != roomId) return;
+
+    final seconds = min(_maxReconnectDelaySeconds, 2 << min(_reconnectAttempts, 5));
+    _reconnectAttempts++;
+    _reconnectTimer?.cancel();
+    _reconnectTimer = Timer(Duration(seconds: seconds), () => _connectSocket(roomId));
+  }
+
+  /// 실시간 이벤트 처리 (message, read, error)
+  void _handleSocketEvent(String roomId, dynamic data) {
+    Map<String, dynamic> event;
+    try {
+      event = Map<String, dynamic>.from(jsonDecode(data));
+    } catch (e) {
+      return;
+    }
+
+    switch (event['type']) {
+      case 'message':
+        if (event['message'] == null) return;
+        final message = ChatMessage.fromJson(Map<String, dynamic>.from(event['message']));
+        // 동기화 기준은 옮기지 않음 (연결 전 구간은 다음 동기화 때 받음)
+        _mergeMessages(roomId, [message]);
+        if (message.clientId != null) {
+          _removeFromOutbox({message.clientId!});
+        }
+        if (!message.isMine) {
+          // 채팅방을 보고 있으므로 바로 읽음 처리
+          _socket?.add(jsonEncode({'type': 'read'}));
+        }
+        notifyListeners();
+        break;
+      case 'read':
+        if (_applyPeerReadAt(roomId, event['last_read_at'])) {
+          notifyListeners();
+        }
+        break;
+      case 'error':
+        // client_id 충돌 등 다시 보내도 저장되지 않는 메시지는 대기열에서 제거
+        if (event['client_id'] != null) {
+          _removeFromOutbox({event['client_id'].toString()});
+        }
+        _errorMessage = event['error'] ?? '메시지 전송에 실패했습니다';
+        notifyListeners();
+        break;
+    }
+  }
+
   /// 에러 메시지 초기화
   void clearError() {
     _errorMessage = '';
@@ -32,6 +32,7 @@ class _ChatRoomScreenState extends State<ChatRoomScreen> {
   static const String _statusPrefix = 'Status: ';
   static const String _readStatus = 'Read';
   static const String _unreadStatus = 'Unread';
+  static const String _sendingStatus = 'Sending';
   static const String _okButtonText = 'OK';
 
   // 날짜 포맷 상수들
@@ -69,6 +70,7 @@ class _ChatRoomScreenState extends State<ChatRoomScreen> {
   static const int _scrollAnimationDuration = 300;
 
   // 투명도 상수들
+  static const double _pendingMessageOpacity = 0.6;
   static const double _darkShadowOpacity = 0.3;
   static const double _lightShadowOpacity = 0.5;
 
@@ -82,6 +84,7 @@ class _ChatRoomScreenState extends State<ChatRoomScreen> {
   @override
   void initState() {
     super.initState();
+    _scrollController.addListener(_onScroll);
     WidgetsBinding.instance.addPostFrameCallback((_) {
       final chatProvider = Provider.of<ChatProvider>(context, listen: false);
       chatProvider.loadMessages(widget.roomId);
@@ -90,6 +93,13 @@ class _ChatRoomScreenState extends State<ChatRoomScreen> {
     });
   }
 
+  /// 맨 위까지 스크롤하면 이전 메시지 로드
+  void _onScroll() {
+    if (_scrollController.position.pixels <= _scrollController.position.minScrollExtent) {
+      Provider.of<ChatProvider>(context, listen: false).loadOlderMessages(widget.roomId);
+    }
+  }
+
   /// 채팅 스크롤을 맨 아래로 이동
   void _scrollToBottom() {
     WidgetsBinding.instance.addPostFrameCallback((_) {
@@ -317,32 +327,36 @@ class _ChatRoomScreenState extends State<ChatRoomScreen> {
           alignment: message.isMine ? Alignment.centerRight : Alignment.centerLeft,
           child: GestureDetector(
             onLongPress: () => _showMessageInfo(message),
-            child: ConstrainedBox(
-              constraints: BoxConstraints(
-                maxWidth: MediaQuery.of(context).size.width * _messageMaxWidthRatio,
-              ),
-              child: Container(
-                margin: const EdgeInsets.symmetric(
-                  horizontal: _messageHorizontalMargin,
-                  vertical: _messageVerticalMargin,
-                ),
-                padding: const EdgeInsets.symmetric(
-                  horizontal: _messageHorizontalPadding,
-                  vertical: _messageVerticalPadding,
+            child: Opacity(
+              // 전송 대기 중인 메시지는 흐리게 표시
+              opacity: message.isPending ? _pendingMessageOpacity : 1,
+              child: ConstrainedBox(
+                constraints: BoxConstraints(
+                  maxWidth: MediaQuery.of(context).size.width * _messageMaxWidthRatio,
                 ),
-                decoration: BoxDecoration(
-                  color: message.isMine ? AppColors.primary : Colors.grey[200],
-                  borderRadius: BorderRadius.only(
-                    topLeft: const Radius.circular(_messageBorderRadius),
-                    topRight: const Radius.circular(_messageBorderRadius),
-                    bottomLeft: Radius.circular(message.isMine ? _messageBorderRadius : 0),
-                    bottomRight: Radius.circular(message.isMine ? 0 : _messageBorderRadius),
+                child: Container(
+                  margin: const EdgeInsets.symmetric(
+                    horizontal: _messageHorizontalMargin,
+                    vertical: _messageVerticalMargin,
                   ),
-                ),
-                child: Text(
-                  message.content,
-                  style: TextStyle(
-                    color: message.isMine ? Colors.white : Colors.black87,
+                  padding: const EdgeInsets.symmetric(
+                    horizontal: _messageHorizontalPadding,
+                    vertical: _messageVerticalPadding,
+                  ),
+                  decoration: BoxDecoration(
+                    color: message.isMine ? AppColors.primary : Colors.grey[200],
+                    borderRadius: BorderRadius.only(
+                      topLeft: const Radius.circular(_messageBorderRadius),
+                      topRight: const Radius.circular(_messageBorderRadius),
+                      bottomLeft: Radius.circular(message.isMine ? _messageBorderRadius : 0),
+                      bottomRight: Radius.circular(message.isMine ? 0 : _messageBorderRadius),
+                    ),
+                  ),
+                  child: Text(
+                    message.content,
+                    style: TextStyle(
+                      color: message.isMine ? Colors.white : Colors.black87,
+                    ),
                   ),
                 ),
               ),
@@ -376,7 +390,7 @@ class _ChatRoomScreenState extends State<ChatRoomScreen> {
             ),
             if (message.isMine)
               Text(
-                '$_statusPrefix${message.isRead ? _readStatus : _unreadStatus}',
+                '$_statusPrefix${message.isPending ? _sendingStatus : message.isRead ? _readStatus : _unreadStatus}',
                 style: const TextStyle(fontSize: _messageInfoTextFontSize),
               ),
           ],
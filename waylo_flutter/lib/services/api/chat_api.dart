@@ -1,3 +1,4 @@
+import 'dart:io';
 import 'api_service.dart';
 
 class ChatApi {
@@ -21,13 +22,25 @@ class ChatApi {
   }
 
   /// 채팅 메시지 목록 조회
+  /// after: 이 메시지 이후의 새 메시지만 조회, before: 이 메시지 이전 기록 조회 (둘 다 없으면 최근 메시지)
+  /// overlap: after와 함께 사용, 늦게 저장된 메시지를 위해 기준 직전 메시지도 다시 조회 (재연결 직후 동기화용)
   static Future<Map<String, dynamic>> getChatMessages({
     required String roomId,
-    String? lastMessageId,
+    String? after,
+    String? before,
+    bool overlap = false,
+    int? limit,
   }) async {
+    final queryParams = <String, String>{
+      if (after != null) "after": after,
+      if (after != null && overlap) "overlap": "1",
+      if (before != null) "before": before,
+      if (limit != null) "limit": limit.toString(),
+    };
+
     String endpoint = "/api/chats/rooms/$roomId/messages/";
-    if (lastMessageId != null) {
-      endpoint += "?last_message_id=$lastMessageId";
+    if (queryParams.isNotEmpty) {
+      endpoint += "?${Uri(queryParameters: queryParams).query}";
     }
 
     return await ApiService.sendRequest(
@@ -37,14 +50,46 @@ class ChatApi {
   }
 
   /// 채팅 메시지 전송
+  /// clientId: 클라이언트가 생성한 메시지 ID (같은 값으로 다시 보내도 한 번만 저장됨)
   static Future<Map<String, dynamic>> sendMessage({
     required String roomId,
     required String content,
+    String? clientId,
   }) async {
     return await ApiService.sendRequest(
       endpoint: "/api/chats/rooms/$roomId/messages/",
       method: "POST",
-      body: {"content": content},
+      body: {
+        "content": content,
+        if (clientId != null) "client_id": clientId,
+      },
+    );
+  }
+
+  /// 채팅방 실시간 연결 (새 메시지, 읽음 표시 수신 및 메시지 전송)
+  static Future<WebSocket> connectRoom({
+    required String roomId,
+  }) async {
+    final authToken = await ApiService.getAuthToken();
+    final socketUrl = ApiService.baseUrl.replaceFirst('http', 'ws');
+
+    return await WebSocket.connect(
+      "$socketUrl/ws/chats/rooms/$roomId/",
+      headers: {
+        if (authToken != null && authToken.isNotEmpty) "Authorization": "Token $authToken",
+      },
+    ).timeout(const Duration(seconds: 10));
+  }
+
+  /// 쌓여 있는 메시지 일괄 전송 (여러 채팅방 가능)
+  /// messages: [{"room_id", "client_id", "content"}, ...] (보낸 순서대로)
+  static Future<Map<String, dynamic>> sendMessagesBatch({
+    required List<Map<String, String>> messages,
+  }) async {
+    return await ApiService.sendRequest(
+      endpoint: "/api/chats/messages/batch/",
+      method: "POST",
+      body: {"messages": messages},
     );
   }
 }
\ No newline at end of file